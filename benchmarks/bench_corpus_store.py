@@ -0,0 +1,87 @@
+"""Benchmark of load_page_spans from a pickle per doc and from the corpus store.
+
+Prints docs/sec of both, for loading the page spans of already tokenized docs.
+
+usage:
+    python benchmarks/bench_corpus_store.py
+"""
+# standard library
+import os
+import pickle
+import tempfile
+import time
+
+# non-standard library
+import spacy
+from spacy.tokens import Doc
+
+# custom code
+from pynder.custom_pipeline_components import LoadPageSpans
+from pynder.utils.corpus_store import CorpusStoreWriter
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+
+def save_corpus(folder, nlp, i_docs=5000, i_pages=20, i_words=50):
+    text = "\n".join(" ".join(["woord"] * i_words) for _ in range(i_pages))
+    doc = nlp(text)
+    i_tokens = len(doc) // i_pages
+    spans = [
+        {
+            "start": i * i_tokens,
+            "end": (i + 1) * i_tokens,
+            "label": "PAGES",
+            "start_char": doc[i * i_tokens].idx,
+            "end_char": doc[(i + 1) * i_tokens - 1].idx + len("woord"),
+        }
+        for i in range(i_pages)
+    ]
+    docs = []
+    with CorpusStoreWriter(os.path.join(folder, "store")) as writer:
+        for i_doc in range(i_docs):
+            contract_id, doc_id = str(1000 + i_doc // 10), f"doc{i_doc}"
+            os.makedirs(os.path.join(folder, "span", contract_id), exist_ok=True)
+            with open(
+                os.path.join(folder, "span", contract_id, f"{doc_id}.pickle"), "wb"
+            ) as f:
+                pickle.dump(spans, f)
+            writer.add(contract_id, doc_id, text, spans)
+            doc_copy = doc.copy()
+            doc_copy._.contract_id, doc_copy._.doc_id = contract_id, doc_id
+            docs.append(doc_copy)
+    return docs
+
+
+def docs_per_second(component, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        component(doc)
+    return len(docs) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    nlp = spacy.blank("nl")
+    with tempfile.TemporaryDirectory() as folder:
+        docs = save_corpus(folder, nlp)
+        dict_speed = {
+            "pickles": docs_per_second(
+                LoadPageSpans(
+                    nlp, "load_page_spans", os.path.join(folder, "span"), None
+                ),
+                docs,
+            ),
+            "store": docs_per_second(
+                LoadPageSpans(
+                    nlp, "load_page_spans", None, os.path.join(folder, "store")
+                ),
+                docs,
+            ),
+        }
+        print(
+            " | ".join(
+                f"{name}: {speed:10.2f} docs/sec ({speed / dict_speed['pickles']:4.1f}x)"
+                for name, speed in dict_speed.items()
+            )
+        )
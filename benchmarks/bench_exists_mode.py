@@ -0,0 +1,98 @@
+"""Benchmark of the exists modes of the regex questions: every match, the first match per doc, per contract.
+
+The questions are yes/no questions whose keywords occur on many pages of every doc, every contract has five docs.
+
+Prints docs/sec for every mode.
+
+usage:
+    python benchmarks/bench_exists_mode.py
+"""
+# standard library
+import random
+import time
+
+# non-standard library
+import spacy
+from spacy.tokens import Doc
+
+# custom code
+from pynder.matchers.base_class_matchers import BaseRegex
+from pynder.utils.page_docs import make_doc
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_WORDS = (
+    "de het een overeenkomst partij betaling tussen levering risico artikel lid zal worden door versie"
+).split()
+
+LIST_PATTERNS = [
+    r".{40}risico.{40}",
+    r"(partij)\s+(\w+)",
+    r"artikel\s+\w+\s+lid",
+    r"levering.{1,20}betaling",
+]
+
+DICT_MODES = {
+    "all": {},
+    "exists": {"bExists": True},
+    "contract": {"bExistsPerContract": True},
+}
+
+
+def make_docs(nlp, i_contracts=4, i_docs_per_contract=5, i_pages=20, i_words=300):
+    random.seed(0)
+    docs = []
+    for i_contract in range(i_contracts):
+        for i_doc in range(i_docs_per_contract):
+            list_pages = [
+                " ".join(random.choice(LIST_WORDS) for _ in range(i_words))
+                for _ in range(i_pages)
+            ]
+            doc = make_doc(
+                nlp, list_pages, f"doc{i_contract}_{i_doc}", f"contract{i_contract}"
+            )
+            docs.append(doc)
+    return docs
+
+
+def make_components(nlp, i_questions, str_mode):
+    return [
+        BaseRegex(
+            nlp,
+            f"q{i}",
+            [LIST_PATTERNS[i % len(LIST_PATTERNS)]],
+            **DICT_MODES[str_mode],
+        )
+        for i in range(i_questions)
+    ]
+
+
+def docs_per_second(components, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        doc._._dict_results = {}
+        for component in components:
+            component(doc)
+    return len(docs) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for i_questions in [4, 40]:
+        dict_speed = {}
+        for str_mode in DICT_MODES:
+            # a fresh nlp object per run gives a fresh engine
+            nlp = spacy.blank("nl")
+            docs = make_docs(nlp)
+            dict_speed[str_mode] = docs_per_second(
+                make_components(nlp, i_questions, str_mode), docs
+            )
+
+        print(
+            f"{i_questions:>3} questions | "
+            + " | ".join(
+                f"{str_mode}: {speed:8.2f} docs/sec ({speed / dict_speed['all']:4.1f}x)"
+                for str_mode, speed in dict_speed.items()
+            )
+        )
@@ -0,0 +1,109 @@
+"""Benchmark of build_pipeline with and without pruning the spacy model, for the regex questions of the P set.
+
+nl_core_news_lg is not needed: a model with the same components (tok2vec, morphologizer, tagger, parser, ner) is
+trained for a few steps on a handful of sentences and saved to a temporary folder. Its networks have the default
+sizes of spacy (untrained, but just as expensive to run), so the real model is slower to run than this one and the speedup on it is larger.
+
+Prints docs/sec of the whole model and of the pruned (tokenizer only) pipeline.
+
+usage:
+    python benchmarks/bench_model_pruning.py
+"""
+# standard library
+import os
+import pickle
+import random
+import tempfile
+import time
+
+# non-standard library
+import spacy
+from spacy.training import Example
+
+# custom code
+from pynder.utils.corpus_runner import build_pipeline
+
+LIST_WORDS = (
+    "de het een overeenkomst partij betaling tussen levering risico artikel lid zal worden door opzegtermijn exit "
+    "plan algemene inkoopvoorwaarden onbepaalde tijd"
+).split()
+
+LIST_QUESTIONS = ["q8", "q13", "q17", "q20", "q23", "q31", "q51"]
+
+
+def save_model(folder):
+    random.seed(0)
+    nlp = spacy.blank("nl")
+    for name in ["tok2vec", "morphologizer", "tagger", "parser", "ner"]:
+        nlp.add_pipe(name)
+    list_examples = []
+    for _ in range(20):
+        list_words = [random.choice(LIST_WORDS) for _ in range(8)]
+        list_examples.append(
+            Example.from_dict(
+                nlp.make_doc(" ".join(list_words)),
+                {
+                    "tags": ["N" if len(word) > 4 else "LID" for word in list_words],
+                    "pos": ["NOUN" if len(word) > 4 else "DET" for word in list_words],
+                    "heads": [0] * len(list_words),
+                    "deps": ["ROOT"] + ["dep"] * (len(list_words) - 1),
+                    "entities": ["O"] * len(list_words),
+                },
+            )
+        )
+    nlp.initialize(lambda: list_examples)
+    path = os.path.join(folder, "model")
+    nlp.to_disk(path)
+    return path
+
+
+def save_corpus(folder, i_docs=20, i_pages=10, i_words=300):
+    random.seed(0)
+    list_paths = []
+    for i_doc in range(i_docs):
+        list_pages = [
+            [random.choice(LIST_WORDS) for _ in range(i_words)] for _ in range(i_pages)
+        ]
+        path = os.path.join(folder, "text", "1001", f"doc{i_doc}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("\n".join(" ".join(page) for page in list_pages))
+        path_span = os.path.join(folder, "span", "1001", f"doc{i_doc}.pickle")
+        os.makedirs(os.path.dirname(path_span), exist_ok=True)
+        with open(path_span, "wb") as f:
+            # newline separated words: one token per word
+            pickle.dump(
+                [
+                    {"start": i * i_words, "end": (i + 1) * i_words, "label": "PAGES"}
+                    for i in range(i_pages)
+                ],
+                f,
+            )
+        list_paths.append(path)
+    return list_paths
+
+
+def docs_per_second(nlp, list_paths):
+    start = time.perf_counter()
+    for _ in nlp.pipe(list_paths):
+        pass
+    return len(list_paths) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        path_model = save_model(folder)
+        list_paths = save_corpus(folder)
+        folder_span = os.path.join(folder, "span")
+
+        dict_speed = {}
+        for str_mode, bPruneModel in [("whole model", False), ("pruned", True)]:
+            nlp = build_pipeline(path_model, folder_span, LIST_QUESTIONS, bPruneModel)
+            dict_speed[str_mode] = docs_per_second(nlp, list_paths)
+
+        print(
+            " | ".join(
+                f"{str_mode}: {speed:8.2f} docs/sec ({speed / dict_speed['whole model']:5.1f}x)"
+                for str_mode, speed in dict_speed.items()
+            )
+        )
@@ -0,0 +1,87 @@
+"""Benchmark of reading the texts ahead in CustomTokenizerWrapper, for text files on a slow (network) disk.
+
+The latency of the disk is simulated with a sleep per read, the pipeline runs the regex questions of the P set on
+a blank model.
+
+Prints docs/sec without and with prefetching.
+
+usage:
+    python benchmarks/bench_prefetch.py
+"""
+# standard library
+import os
+import random
+import tempfile
+import time
+
+# non-standard library
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+# custom code
+from pynder.custom_pipeline_components import CustomTokenizerWrapper
+from pynder.matchers import add_questions
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_WORDS = (
+    "de het een overeenkomst partij betaling tussen levering risico artikel lid zal worden door opzegtermijn exit "
+    "plan algemene inkoopvoorwaarden onbepaalde tijd"
+).split()
+
+LIST_QUESTIONS = ["q8", "q13", "q17", "q20", "q23", "q31", "q51"]
+
+F_LATENCY = 0.02  # seconds per read
+
+
+@Language.component("bench_one_page")
+def set_one_page(doc):
+    doc.spans["PAGES"] = [Span(doc, 0, len(doc), label="PAGES")]
+    return doc
+
+
+class SlowDiskTokenizerWrapper(CustomTokenizerWrapper):
+    def read_text(self, _path):
+        time.sleep(F_LATENCY)
+        return super().read_text(_path)
+
+
+def save_corpus(folder, i_docs=100, i_words=2000):
+    random.seed(0)
+    list_paths = []
+    for i_doc in range(i_docs):
+        path = os.path.join(folder, "1001", f"doc{i_doc}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(" ".join(random.choice(LIST_WORDS) for _ in range(i_words)))
+        list_paths.append(path)
+    return list_paths
+
+
+def docs_per_second(i_prefetch, list_paths):
+    nlp = spacy.blank("nl")
+    nlp.tokenizer = SlowDiskTokenizerWrapper(nlp.tokenizer, i_prefetch=i_prefetch)
+    nlp.add_pipe("bench_one_page")
+    add_questions(nlp, LIST_QUESTIONS)
+    start = time.perf_counter()
+    for _ in nlp.pipe(nlp.tokenizer.prefetch(list_paths)):
+        pass
+    return len(list_paths) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        list_paths = save_corpus(folder)
+        dict_speed = {
+            i_prefetch: docs_per_second(i_prefetch, list_paths)
+            for i_prefetch in [0, 4, 16]
+        }
+        print(
+            " | ".join(
+                f"prefetch {i_prefetch:>2}: {speed:8.2f} docs/sec ({speed / dict_speed[0]:4.1f}x)"
+                for i_prefetch, speed in dict_speed.items()
+            )
+        )
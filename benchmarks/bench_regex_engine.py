@@ -0,0 +1,84 @@
+"""Benchmark of the shared RegexEngine against BaseRegex components that each scan the doc on their own.
+
+Prints docs/sec for a growing number of regex questions.
+
+usage:
+    python benchmarks/bench_regex_engine.py
+"""
+# standard library
+import random
+import time
+
+# non-standard library
+import spacy
+from spacy.tokens import Doc
+
+# custom code
+from pynder.matchers.base_class_matchers import BaseRegex
+from pynder.utils.page_docs import make_doc
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_WORDS = (
+    "de het een overeenkomst partij betaling termijn tussen levering factuur risico artikel lid zal "
+    "worden door opzegtermijn dossiernummer exit plan algemene inkoopvoorwaarden versie"
+).split()
+
+LIST_BASE_PATTERNS = [
+    r".{40}exit{i}.{1,5}plan.{40}",
+    r".{100}opzegtermijn{i}.{100}",
+    r"tussen\ *(?s)(.*?dossiernummer{i}\ *\d*)",
+    r"(versie\s{1,5}\w{4,10}\s{1,5}\d{4}).{1,100}?(algemene{i}.*?inkoopvoorwaarden)",
+]
+
+
+def make_docs(nlp, i_docs=5, i_pages=20, i_words_per_page=300):
+    random.seed(0)
+    docs = []
+    for i_doc in range(i_docs):
+        list_pages = [
+            " ".join(random.choice(LIST_WORDS) for _ in range(i_words_per_page))
+            for _ in range(i_pages)
+        ]
+        doc = make_doc(nlp, list_pages, f"doc{i_doc}")
+        docs.append(doc)
+    return docs
+
+
+def make_components(nlp, i_questions, bSharedEngine):
+    return [
+        BaseRegex(
+            nlp,
+            f"q{i}",
+            [LIST_BASE_PATTERNS[i % len(LIST_BASE_PATTERNS)].replace("{i}", str(i))],
+            bSharedEngine=bSharedEngine,
+        )
+        for i in range(i_questions)
+    ]
+
+
+def docs_per_second(components, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        for component in components:
+            component(doc)
+    return len(docs) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for i_questions in [10, 100, 1000]:
+        # a fresh nlp object per run gives a fresh engine
+        nlp = spacy.blank("nl")
+        docs = make_docs(nlp)
+        single = docs_per_second(make_components(nlp, i_questions, False), docs)
+
+        nlp = spacy.blank("nl")
+        docs = make_docs(nlp)
+        shared = docs_per_second(make_components(nlp, i_questions, True), docs)
+
+        print(
+            f"{i_questions:>5} questions | per component: {single:8.2f} docs/sec | "
+            f"shared engine: {shared:8.2f} docs/sec | speedup: {shared / single:6.1f}x"
+        )
@@ -0,0 +1,87 @@
+"""Benchmark of the shared SpacyMatcherEngine against BaseSpacyMatcher components that each run their own Matcher.
+
+Prints the absolute cost per doc (ms/doc and docs/sec) for a growing number of token pattern questions, once for
+literal patterns, which the engine puts in a PhraseMatcher, and once for patterns with an operator, which stay in
+its Matcher.
+
+usage:
+    python benchmarks/bench_spacy_matcher_engine.py
+"""
+# standard library
+import random
+import time
+
+# non-standard library
+import spacy
+from spacy.tokens import Doc
+
+# custom code
+from pynder.matchers.base_class_matchers import BaseSpacyMatcher
+from pynder.utils.page_docs import make_doc
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+# a contract vocabulary of a few thousand words, so every token pattern only matches now and then
+LIST_WORDS = [f"woord{i}" for i in range(5000)]
+
+
+def make_docs(nlp, i_docs=5, i_pages=20, i_words_per_page=300):
+    random.seed(0)
+    docs = []
+    for i_doc in range(i_docs):
+        list_pages = [
+            " ".join(random.choice(LIST_WORDS) for _ in range(i_words_per_page))
+            for _ in range(i_pages)
+        ]
+        doc = make_doc(nlp, list_pages, f"doc{i_doc}")
+        docs.append(doc)
+    return docs
+
+
+def make_pattern(bOperator):
+    if bOperator:
+        return [{"LOWER": random.choice(LIST_WORDS)}, {"IS_DIGIT": True, "OP": "?"}]
+    return [{"LOWER": random.choice(LIST_WORDS)}, {"LOWER": random.choice(LIST_WORDS)}]
+
+
+def make_components(nlp, i_questions, bSharedEngine, bOperator):
+    random.seed(1)
+    return [
+        BaseSpacyMatcher(
+            nlp,
+            f"q{i}",
+            [make_pattern(bOperator), [{"LOWER": random.choice(LIST_WORDS)}]],
+            bSharedEngine=bSharedEngine,
+        )
+        for i in range(i_questions)
+    ]
+
+
+def seconds_per_doc(components, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        for component in components:
+            component(doc)
+    return (time.perf_counter() - start) / len(docs)
+
+
+if __name__ == "__main__":
+    for bOperator in [False, True]:
+        print("patterns with an operator" if bOperator else "literal patterns")
+        for i_questions in [10, 100, 1000]:
+            list_columns = []
+            for bSharedEngine in [False, True]:
+                # a fresh nlp object per run gives a fresh engine
+                nlp = spacy.blank("nl")
+                docs = make_docs(nlp)
+                components = make_components(nlp, i_questions, bSharedEngine, bOperator)
+                f_seconds = seconds_per_doc(components, docs)
+                list_columns.append(
+                    f"{f_seconds * 1000:9.1f} ms/doc {1 / f_seconds:8.2f} docs/sec"
+                )
+            print(
+                f"{i_questions:>5} questions | per component: {list_columns[0]} | "
+                f"shared engine: {list_columns[1]}"
+            )
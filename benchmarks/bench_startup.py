@@ -0,0 +1,92 @@
+"""Benchmark of the worker startup time: importing every question module against the lazy QuestionRegistry.
+
+Generates a package with a growing number of regex questions (100 per module) and times, in a fresh interpreter,
+how long it takes to get one question in the pipeline: eagerly importing all question modules first (the old
+`from .questions_P import *`) or resolving only the module of that question through the registry.
+
+usage:
+    python benchmarks/bench_startup.py
+"""
+# standard library
+import os
+import subprocess
+import sys
+import tempfile
+
+I_QUESTIONS_PER_MODULE = 100
+
+INIT = """
+import os
+from pynder.matchers.registry import QuestionRegistry
+
+registry = QuestionRegistry(__name__, os.path.dirname(__file__))
+"""
+
+QUESTION = """
+@Dutch.factory("bench_q{i}")
+class BenchQuestion{i}(BaseRegex):
+    def __init__(self, nlp: Language, name: str):
+        super().__init__(nlp, name, [r".{{40}}keyword{i}.{{1,5}}plan.{{40}}"])
+"""
+
+SCRIPT = """
+import time
+import spacy
+import pynder.matchers.base_class_matchers
+
+start = time.perf_counter()
+if "{mode}" == "eager":
+    import importlib
+    for i_module in range({i_modules}):
+        importlib.import_module(f"bench_questions.questions_{{i_module}}")
+    from bench_questions import registry
+else:
+    from bench_questions import registry
+    registry.ensure_factory("bench_q0")
+nlp = spacy.blank("nl")
+nlp.add_pipe("bench_q0")
+print(time.perf_counter() - start)
+"""
+
+
+def make_package(folder, i_questions):
+    package = os.path.join(folder, "bench_questions")
+    os.makedirs(package)
+    with open(os.path.join(package, "__init__.py"), "w") as f:
+        f.write(INIT)
+    for i_module, i_start in enumerate(range(0, i_questions, I_QUESTIONS_PER_MODULE)):
+        with open(os.path.join(package, f"questions_{i_module}.py"), "w") as f:
+            f.write("from spacy.language import Language\n")
+            f.write("from spacy.lang.nl import Dutch\n")
+            f.write("from pynder.matchers.base_class_matchers import BaseRegex\n")
+            for i in range(i_start, min(i_start + I_QUESTIONS_PER_MODULE, i_questions)):
+                f.write(QUESTION.format(i=i))
+    return i_module + 1
+
+
+def seconds_to_first_question(folder, mode, i_modules):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [folder, os.getcwd(), env.get("PYTHONPATH", "")]
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(mode=mode, i_modules=i_modules)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+if __name__ == "__main__":
+    for i_questions in [100, 1000, 5000]:
+        with tempfile.TemporaryDirectory() as folder:
+            i_modules = make_package(folder, i_questions)
+            eager = seconds_to_first_question(folder, "eager", i_modules)
+            lazy = seconds_to_first_question(folder, "lazy", i_modules)
+
+        print(
+            f"{i_questions:>5} questions | import all: {eager:8.3f} sec | "
+            f"lazy registry: {lazy:8.3f} sec | speedup: {eager / lazy:6.1f}x"
+        )
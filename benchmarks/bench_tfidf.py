@@ -0,0 +1,61 @@
+"""Benchmark of the fit-once TF-IDF path against refitting on the source texts for every target.
+
+Prints targets/sec of Vectorizer.get_similarity_score (old) and Vectorizer.get_fitted_similarity_score (new) for a
+growing number of source texts.
+
+usage:
+    python benchmarks/bench_tfidf.py
+"""
+# standard library
+import random
+import time
+
+# custom code
+from pynder.utils.similarity import Vectorizer
+
+LIST_WORDS = (
+    "de het een overeenkomst partij betaling termijn tussen levering factuur risico artikel lid zal "
+    "worden door opzegtermijn dossiernummer exit plan algemene inkoopvoorwaarden versie handelsregister "
+    "uittreksel kamer koophandel verwerker persoonsgegevens bijlage handtekening"
+).split()
+
+
+def make_texts(i_texts, i_words):
+    return [
+        " ".join(
+            random.choice(LIST_WORDS) + str(random.randint(0, 200))
+            for _ in range(i_words)
+        )
+        for _ in range(i_texts)
+    ]
+
+
+def targets_per_second(func, list_targets):
+    start = time.perf_counter()
+    for target_text in list_targets:
+        func(target_text)
+    return len(list_targets) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    list_targets = make_texts(100, 400)  # roughly one page each
+
+    for i_sources in [3, 30, 300]:
+        list_source_texts = make_texts(i_sources, 400)
+
+        vectorizer_old = Vectorizer()
+        old = targets_per_second(
+            lambda text: vectorizer_old.get_similarity_score(list_source_texts, text),
+            list_targets,
+        )
+
+        vectorizer_new = Vectorizer().fit(list_source_texts)
+        new = targets_per_second(
+            vectorizer_new.get_fitted_similarity_score, list_targets
+        )
+
+        print(
+            f"{i_sources:>4} source texts | refit per target: {old:8.1f} targets/sec | "
+            f"fit once: {new:8.1f} targets/sec | speedup: {new / old:6.1f}x"
+        )
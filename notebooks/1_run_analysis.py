@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from pynder.matchers import __all_init_P_questions__
 from pynder.custom_pipeline_components import LoadPageSpans, CustomTokenizerWrapper
 from pynder.enums import ResultMatch
+from pynder.utils.model_loading import prune_pipeline
 
 try:
     nlp = spacy.load("nl_core_news_lg")
@@ -62,6 +63,9 @@ nlp.add_pipe("load_page_spans", first=True, config={"basepath": folder_span})
 for question in __all_init_P_questions__:
     print(f"Info - adding step: {question} to the pipeline")
     nlp.add_pipe(question)
+
+# the parser and the ner are not used by any question
+prune_pipeline(nlp)
 # -
 
 docs = list(
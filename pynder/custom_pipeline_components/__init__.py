@@ -1,2 +1,3 @@
 from .load_page_spans import LoadPageSpans
 from .tokenizer import CustomTokenizerWrapper
+from .result_cache import ResultCacheReader, ResultCacheWriter
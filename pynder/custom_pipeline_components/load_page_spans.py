@@ -1,18 +1,44 @@
+from typing import Optional
 from spacy.language import Language
+from spacy.tokens import Span
+from pynder.utils.corpus_store import CorpusStore
 from pynder.utils.text_parsing.text_parsers import (
+    PAGE_LABEL,
     load_bare_spans_from_file,
     set_spans_to_doc,
 )
 import os
 
 
-@Language.factory("load_page_spans")
+@Language.factory("load_page_spans", default_config={"basepath": None, "store": None})
 class LoadPageSpans:
-    def __init__(self, nlp: Language, name: str, basepath: str):
+    """Class that puts the page spans of the doc on doc.spans["PAGES"].
+
+    The spans are read from <basepath>/<contract_id>/<doc_id>.pickle, or with store from a corpus store (see
+    pynder.utils.corpus_store), which is a slice of a memory mapped array instead of a file open and unpickle per doc.
+
+    example usage:
+
+    nlp.add_pipe("load_page_spans", first=True, config={"basepath": folder_span})
+    nlp.add_pipe("load_page_spans", first=True, config={"store": "corpus_store"})
+    """
+
+    def __init__(
+        self, nlp: Language, name: str, basepath: Optional[str], store: Optional[str]
+    ):
         self.name = name  # used to store result
         self.basepath = basepath
+        self.store = store
 
     def __call__(self, doc):
+        if self.store is not None:
+            list_offsets = CorpusStore.get(self.store).get_page_offsets(
+                doc._.contract_id, doc._.doc_id
+            )
+            doc.spans[PAGE_LABEL] = [
+                Span(doc, start, end, label=PAGE_LABEL) for start, end in list_offsets
+            ]
+            return doc
         path = os.path.join(self.basepath, doc._.contract_id, doc._.doc_id + ".pickle")
         spans = load_bare_spans_from_file(path)
         doc = set_spans_to_doc(doc, spans, "PAGES")
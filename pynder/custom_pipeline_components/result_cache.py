@@ -0,0 +1,96 @@
+from spacy.language import Language
+from spacy.util import minibatch
+from pynder.utils.result_cache import (
+    ResultCache,
+    USER_DATA_KEY,
+    USER_DATA_KEY_HASH,
+    get_definition_hashes,
+    get_doc_hash,
+)
+
+
+@Language.factory("pynder_cache_reader", default_config={"path": "results.sqlite"})
+class ResultCacheReader:
+    """Class that puts the cached results of the unchanged questions on the doc, so the questions skip the doc.
+
+    Add it after the components that prepare the doc (load_page_spans) and before the questions, and add
+    pynder_cache_writer at the end of the pipeline to store the new results. On a rerun only the questions whose
+    definition changed, and the docs whose text (or pages) changed, are analyzed.
+
+    example usage:
+
+    nlp.add_pipe("load_page_spans", first=True, config={"basepath": folder_span})
+    nlp.add_pipe("pynder_cache_reader", config={"path": "results.sqlite"})
+    for question in __all_init_P_questions__:
+        nlp.add_pipe(question)
+    nlp.add_pipe("pynder_cache_writer", config={"path": "results.sqlite"})
+    """
+
+    def __init__(self, nlp: Language, name: str, path: str):
+        self.nlp = nlp
+        self.name = name
+        self.path = path
+        self.dict_definition_hashes = (
+            None  # computed on the first doc, once all questions are added
+        )
+
+    def __call__(self, doc):
+        if self.dict_definition_hashes is None:
+            self.dict_definition_hashes = get_definition_hashes(self.nlp)
+        cache = ResultCache.get(self.path)
+
+        doc_hash = get_doc_hash(doc)
+        doc.user_data[USER_DATA_KEY_HASH] = doc_hash
+        dict_blobs = cache.get_results(doc_hash, self.dict_definition_hashes)
+        if dict_blobs:
+            dict_results = dict(
+                doc._._dict_results
+            )  # never the default shared by all docs
+            for question, blob in dict_blobs.items():
+                dict_results[question] = cache.load_result(blob, doc)
+            doc._._dict_results = dict_results
+        doc.user_data[USER_DATA_KEY] = set(dict_blobs)
+        return doc
+
+
+@Language.factory("pynder_cache_writer", default_config={"path": "results.sqlite"})
+class ResultCacheWriter:
+    """Class that stores the results of the questions that were analyzed on the doc, see pynder_cache_reader.
+
+    Results are committed once per batch of docs (nlp.pipe) or per doc (nlp(text)).
+    """
+
+    def __init__(self, nlp: Language, name: str, path: str):
+        self.nlp = nlp
+        self.name = name
+        self.path = path
+        self.dict_definition_hashes = None
+
+    def get_rows(self, doc):
+        """Function that returns the cache rows of the new results on the doc."""
+        if self.dict_definition_hashes is None:
+            self.dict_definition_hashes = get_definition_hashes(self.nlp)
+
+        doc_hash = doc.user_data.pop(USER_DATA_KEY_HASH, None) or get_doc_hash(doc)
+        set_cached = doc.user_data.pop(USER_DATA_KEY, set())
+        return [
+            (
+                doc_hash,
+                question,
+                self.dict_definition_hashes[question],
+                ResultCache.dump_result(result),
+            )
+            for question, result in doc._._dict_results.items()
+            if question in self.dict_definition_hashes and question not in set_cached
+        ]
+
+    def __call__(self, doc):
+        ResultCache.get(self.path).put_results(self.get_rows(doc))
+        return doc
+
+    def pipe(self, stream, batch_size: int = 128):
+        for docs in minibatch(stream, size=batch_size):
+            ResultCache.get(self.path).put_results(
+                [row for doc in docs for row in self.get_rows(doc)]
+            )
+            yield from docs
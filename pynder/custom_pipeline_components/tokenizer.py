@@ -1,4 +1,30 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import os
+import zipfile
+
+from pynder.utils.corpus_store import CorpusStore
+
+
+def get_ids_from_path(_path):
+    """Function that returns the contract id and doc id of a path: <folder>/<contract_id>/<doc_id>.txt"""
+    folder, file_name = os.path.split(os.path.splitext(_path)[0])
+    return os.path.basename(folder), file_name
+
+
+def write_corpus_file(paths, path_corpus):
+    """Function that bundles text files into one corpus file (zip), to read with CustomTokenizerWrapper.
+
+    Every text is stored as <contract_id>/<doc_id>.txt, so the paths of the text files still find their text.
+
+    Args:
+        paths: iterable of paths of text files, <folder>/<contract_id>/<doc_id>.txt
+        path_corpus: str
+    """
+    with zipfile.ZipFile(path_corpus, "w", zipfile.ZIP_DEFLATED) as corpus:
+        for _path in paths:
+            contract_id, doc_id = get_ids_from_path(_path)
+            corpus.write(_path, f"{contract_id}/{doc_id}.txt")
 
 
 class CustomTokenizerWrapper:
@@ -7,6 +33,11 @@ class CustomTokenizerWrapper:
     Essentially this class enables us to start creating a spacy pipeline from paths instead of text files and
     uses the path to set doc_id and contract id attributes. (set these in the main code!)
 
+    With path_corpus the texts are read from one corpus file (see write_corpus_file) or corpus store (see
+    pynder.utils.corpus_store) instead of a text file per doc.
+    With i_prefetch, prefetch(paths) reads the texts of the next i_prefetch paths in background threads, while the
+    current doc is tokenized and analyzed, so slow disks (or network shares) do not hold up the pipeline.
+
     example usage:
 
     import spacy
@@ -18,14 +49,83 @@ class CustomTokenizerWrapper:
 
     nlp = spacy.load("nl_core_news_lg")
     nlp.tokenizer = CustomTokenizer(nlp.tokenizer)
+
+    nlp.tokenizer = CustomTokenizerWrapper(nlp.tokenizer, path_corpus="corpus.zip", i_prefetch=16)
+    docs = nlp.pipe(nlp.tokenizer.prefetch(paths))
     """
 
-    def __init__(self, tokenizer):
+    def __init__(
+        self, tokenizer, path_corpus=None, i_prefetch: int = 0, i_threads: int = 4
+    ):
         self.tokenizer = tokenizer
+        self.path_corpus = path_corpus
+        self.i_prefetch = i_prefetch
+        self.i_threads = i_threads
+        self._corpus = None
+        self._executor = None
+        self._dict_futures = {}  # path -> futures of its prefetched text
+
+    def __getstate__(self):
+        # open files and threads stay in their process, e.g. with n_process > 1
+        state = self.__dict__.copy()
+        state.update(_corpus=None, _executor=None, _dict_futures={})
+        return state
+
+    def open_corpus(self):
+        """Function that returns the open corpus file (or store), both read thread safe."""
+        if self._corpus is None:
+            self._corpus = (
+                CorpusStore.get(self.path_corpus)
+                if os.path.isdir(self.path_corpus)
+                else zipfile.ZipFile(self.path_corpus)
+            )
+        return self._corpus
+
+    def read_text(self, _path):
+        """Function that returns the text of a path, from the corpus file if there is one."""
+        if self.path_corpus is None:
+            with open(_path, "r") as f:
+                return f.read()
+        corpus = self.open_corpus()
+        contract_id, doc_id = get_ids_from_path(_path)
+        if isinstance(corpus, CorpusStore):
+            return corpus.get_text(contract_id, doc_id)
+        return corpus.read(f"{contract_id}/{doc_id}.txt").decode("utf-8")
+
+    def prefetch(self, paths):
+        """Function that yields the paths, reading the texts of the next i_prefetch paths ahead.
+
+        Args:
+            paths: iterable of paths
+
+        Returns: generator of paths, to pass on to nlp.pipe
+        """
+        if not self.i_prefetch:
+            yield from paths
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.i_threads)
+        if self.path_corpus is not None:
+            self.open_corpus()  # once, before the threads read from it
+
+        queue_window = deque()
+        for _path in paths:
+            queue_window.append(_path)
+            self._dict_futures.setdefault(_path, deque()).append(
+                self._executor.submit(self.read_text, _path)
+            )
+            if len(queue_window) > self.i_prefetch:
+                yield queue_window.popleft()
+        yield from queue_window
 
     def __call__(self, _path):
-        with open(_path, "r") as f:
-            text = f.read()
+        queue_futures = self._dict_futures.get(_path)
+        if queue_futures:
+            text = queue_futures.popleft().result()
+            if not queue_futures:
+                del self._dict_futures[_path]
+        else:
+            text = self.read_text(_path)
         doc = self.tokenizer(text)
-        doc._.contract_id, doc._.doc_id = os.path.splitext(_path)[0].split("/")[-2:]
+        doc._.contract_id, doc._.doc_id = get_ids_from_path(_path)
         return doc
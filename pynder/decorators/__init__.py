@@ -1 +1,4 @@
-from .decorators import add_error_handling_for_class_method
+from .decorators import (
+    add_error_handling_for_class_method,
+    add_metrics_for_class_method,
+)
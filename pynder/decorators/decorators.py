@@ -1,3 +1,4 @@
+import time
 import traceback
 
 
@@ -20,3 +21,37 @@ def add_error_handling_for_class_method(func):
             return doc
 
     return wrapper
+
+
+def add_metrics_for_class_method(func):
+    """Decorator recording the latency and output of the __call__ class method in the metrics of the component.
+
+    Only runs when metrics are switched on (see BasePipelineComponent.enable_metrics), and then only for the
+    sampled fraction of the docs. Otherwise the overhead is a single attribute lookup. Components with a shared
+    engine are left out, the engine records the time of their question.
+
+    Args:
+        func: __call__ method
+
+    Returns: spacy.Doc
+
+    """
+
+    def wrapper(self, doc, *args, **kwargs):
+        if (
+            self.f_metrics_sample_rate is None
+            or getattr(self, "engine", None) is not None
+            or not self.is_sampled(doc)
+        ):
+            return func(self, doc, *args, **kwargs)
+
+        start = time.perf_counter()
+        doc = func(self, doc, *args, **kwargs)
+        self.get_metrics().record(
+            time.perf_counter() - start,
+            doc._._dict_results.get(self.name),
+            self.count_pages(doc),
+        )
+        return doc
+
+    return wrapper
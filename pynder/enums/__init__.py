@@ -1 +1 @@
-from .result_match import ResultMatch
+from .result_match import ResultMatch, ResultMatchBuilder, first_match
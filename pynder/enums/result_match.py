@@ -15,6 +15,7 @@ class ResultMatch:
     a1 = ResultMatch(True, ['test', 'test2', 'test3'], [1,5,9], ['doc1', 'doc1', 'doc1'])
     a2 = ResultMatch(True, ['test11', 'test2', 'test91'], [1,5, 10], ['doc2', 'doc2', 'doc2'])
     a3 = ResultMatch(False)
+    a4 = ResultMatch(False, tTimeouts=(('doc3', 7),))  # page 7 of doc3 could not be analyzed in time
 
     -> sum([a1,a2, a3])
     -> a1+a2
@@ -24,12 +25,14 @@ class ResultMatch:
     tMatches: tuple = ()
     tPage_nr: tuple = ()
     tDocIds: tuple = ()  # should be redundant but its easier for later merging in excel
+    tTimeouts: tuple = ()  # (doc id, page nr) of every page/doc that ran out of its time budget
 
     def __post_init__(self):
         assert isinstance(self.bResult, bool), f"type found: {type(self.bResult)}"
         assert isinstance(self.tMatches, tuple), f"type found: {type(self.tMatches)}"
         assert isinstance(self.tPage_nr, tuple), f"type found: {type(self.tPage_nr)}"
         assert isinstance(self.tDocIds, tuple), f"type found: {type(self.tDocIds)}"
+        assert isinstance(self.tTimeouts, tuple), f"type found: {type(self.tTimeouts)}"
 
         # if no match than these attributes cant be filled
         if not self.bResult:
@@ -56,6 +59,7 @@ class ResultMatch:
             tMatches=self.tMatches + other.tMatches,
             tPage_nr=self.tPage_nr + other.tPage_nr,
             tDocIds=self.tDocIds + other.tDocIds,
+            tTimeouts=self.tTimeouts + other.tTimeouts,
         )
 
     def __radd__(self, other):
@@ -63,3 +67,113 @@ class ResultMatch:
             return self
         else:
             return self.__add__(other)
+
+
+class ResultMatchBuilder:
+    """Class for accumulating many ResultMatch objects (or single matches) into one ResultMatch in linear time.
+
+    Summing n ResultMatch objects with sum() creates n intermediate dataclasses and copies the growing tuples every
+    time. The builder appends to lists instead and validates once, in build(). The result equals the sum().
+
+    Example usage:
+
+    builder = ResultMatchBuilder()
+    builder.add(ResultMatch(True, ('test',), (1,), ('doc1',)))
+    builder.append('test2', 5, 'doc1')
+    builder.add(ResultMatch(False))
+
+    -> builder.build()  # ResultMatch(True, ('test', 'test2'), (1, 5), ('doc1', 'doc1'))
+    """
+
+    __slots__ = (
+        "bResult",
+        "bEmpty",
+        "list_matches",
+        "list_page_nr",
+        "list_doc_ids",
+        "list_timeouts",
+    )
+
+    def __init__(self):
+        self.bResult = False
+        self.bEmpty = (
+            True  # nothing added yet, build() then returns 0 like sum([]) does
+        )
+        self.list_matches = []
+        self.list_page_nr = []
+        self.list_doc_ids = []
+        self.list_timeouts = []
+
+    def add(self, result):
+        """Function that adds all matches of a ResultMatch, 0 is ignored like in sum()."""
+        if isinstance(result, int) and result == 0:
+            return self
+        self.bEmpty = False
+        self.bResult = self.bResult or result.bResult
+        self.list_matches.extend(result.tMatches)
+        self.list_page_nr.extend(result.tPage_nr)
+        self.list_doc_ids.extend(result.tDocIds)
+        self.list_timeouts.extend(result.tTimeouts)
+        return self
+
+    def append(self, matches, i_page_nr, doc_id):
+        """Function that adds a single match, same as add(ResultMatch(True, (matches,), (i_page_nr,), (doc_id,)))."""
+        self.bEmpty = False
+        self.bResult = True
+        self.list_matches.append(matches)
+        self.list_page_nr.append(i_page_nr)
+        self.list_doc_ids.append(doc_id)
+        return self
+
+    def add_empty(self):
+        """Function that adds a ResultMatch(False) without creating one."""
+        self.bEmpty = False
+        return self
+
+    def build(self):
+        """Function that returns the accumulated ResultMatch, or 0 if nothing was added (like sum([]))."""
+        if self.bEmpty:
+            return 0
+        return ResultMatch(
+            bResult=self.bResult,
+            tMatches=tuple(self.list_matches),
+            tPage_nr=tuple(self.list_page_nr),
+            tDocIds=tuple(self.list_doc_ids),
+            tTimeouts=tuple(self.list_timeouts),
+        )
+
+    @staticmethod
+    def sum(iterable, bStopAtMatch: bool = False):
+        """Function that sums ResultMatch objects in linear time, drop-in for sum(iterable).
+
+        With bStopAtMatch the iterable is not consumed any further once a ResultMatch has a match.
+        """
+        builder = ResultMatchBuilder()
+        for result in iterable:
+            builder.add(result)
+            if bStopAtMatch and builder.bResult:
+                break
+        return builder.build()
+
+
+def first_match(result):
+    """Function that reduces a ResultMatch to its first match, the answer of a question in exists mode.
+
+    Args:
+        result: ResultMatch (or 0, the sum of a doc without pages)
+
+    Returns: ResultMatch with at most one match on one page, or result itself if it has no match
+    """
+    if not isinstance(result, ResultMatch) or not result.bResult:
+        return result
+
+    matches = result.tMatches[0]
+    if not isinstance(matches, str):  # BaseTFIDF returns the best matching text itself
+        matches = matches[:1]
+    return ResultMatch(
+        bResult=True,
+        tMatches=(matches,),
+        tPage_nr=result.tPage_nr[:1],
+        tDocIds=result.tDocIds[:1],
+        tTimeouts=result.tTimeouts,
+    )
@@ -1,9 +1,80 @@
-from .questions_P import *  # this actually initializes the matchers
-from .questions_P import __all_init_P_questions__
+# standard library
+import os
 
+# custom code
+from .registry import QuestionRegistry
+from pynder.utils.gating import sort_by_gates
 
-map_questions_to_matcher_class = {"q8": Question8, "q27": Question27, "q41": Question41}
+# the question modules (questions_*.py) are only imported once one of their questions is asked for
+registry = QuestionRegistry(__name__, os.path.dirname(__file__))
+
+map_questions_to_matcher_class = registry
 
 
 def get_matcher_class(str_question):
     return map_questions_to_matcher_class[str_question]
+
+
+def add_question(nlp, str_question, **kwargs):
+    """Function that adds a question to the pipeline, importing (and registering) only the module that defines it.
+
+    Args:
+        nlp: spacy.Language
+        str_question: str, e.g. "q8"
+        kwargs: passed on to nlp.add_pipe
+
+    Returns: the pipeline component
+    """
+    return registry.add_pipe(nlp, str_question, **kwargs)
+
+
+def add_questions(nlp, list_questions, **kwargs):
+    """Function that adds questions to the pipeline, every question after the questions that gate it.
+
+    Args:
+        nlp: spacy.Language
+        list_questions: list, e.g. __all_init_P_questions__
+        kwargs: passed on to nlp.add_pipe
+
+    Returns: list, the pipeline components in pipeline order
+    """
+    dict_gates = {
+        str_question: registry.get_gates(str_question)
+        for str_question in list_questions
+    }
+    for str_question, list_gates in dict_gates.items():
+        for gate in list_gates:
+            if gate not in dict_gates and gate not in nlp.pipe_names:
+                print(
+                    f"Warning - {gate} gates {str_question}, but is not in the pipeline: {str_question} runs on every doc"
+                )
+    return [
+        add_question(nlp, str_question, **kwargs)
+        for str_question in sort_by_gates(dict_gates)
+    ]
+
+
+def get_question_annotations(list_questions, lang: str = "nl"):
+    """Function that returns the token annotations the questions need from the spacy model, before it is loaded.
+
+    example usage:
+
+    load_model("nl_core_news_lg", get_question_annotations(__all_init_P_questions__))  # {"LEMMA"}, for q27 and q28
+
+    Args:
+        list_questions: list, e.g. __all_init_P_questions__
+        lang: str, language of the blank model a question is created on if its class does not tell
+
+    Returns: set
+    """
+    return set().union(
+        *(
+            registry.get_annotations(str_question, lang)
+            for str_question in list_questions
+        )
+    )
+
+
+def __getattr__(name):
+    # e.g. from pynder.matchers import Question8, __all_init_P_questions__
+    return registry.get_module_attribute(name)
@@ -1,41 +1,422 @@
 # standard library
+import random
+import time
 
 # non-standard library
 from spacy.language import Language
 from spacy.matcher import Matcher
-import re
+from spacy.tokens import Doc
+from spacy.util import minibatch
+import regex as re
 
 # custom code
+from pynder.matchers.engines import (
+    NormalizedCounterEngine,
+    RegexEngine,
+    SpacyMatcherEngine,
+)
+from pynder.utils.literals import get_required_literals
 from pynder.utils.similarity import Vectorizer
-from pynder.utils.occurance import calc_normalized_count
-from pynder.enums import ResultMatch
-from pynder.decorators import add_error_handling_for_class_method
+from pynder.utils.occurance import (
+    calc_normalized_count,
+    calc_normalized_count_per_page,
+    calc_normalized_counts,
+)
+from pynder.utils.page_bucketing import get_page_offsets, bucket_matches
+from pynder.utils.gating import is_gate_closed
+from pynder.utils.page_scope import PageScope
+from pynder.utils.result_cache import USER_DATA_KEY as CACHED_USER_DATA_KEY
+from pynder.enums import ResultMatch, ResultMatchBuilder, first_match
+from pynder.decorators import (
+    add_error_handling_for_class_method,
+    add_metrics_for_class_method,
+)
+from pynder.utils.metrics import ComponentMetrics, is_sampled
+from pynder.utils.model_loading import get_pattern_annotations
 
 
 class BasePipelineComponent:
     """Main parent class of all subsequent BaseClasses.
 
     Allowing for a centralized __call__ function used as default in all other classes.
+
+    With bDocLevelMatching the component matches once over the whole doc and assigns every match to its page,
+    instead of analyzing every page span on its own. The per page ResultMatch output stays the same. BaseRegex does
+    not offer it: its RegexEngine already slices every page out of a single doc.text.
+
+    nlp.pipe hands the docs to pipe() in batches. By default a batch is analyzed doc by doc, classes that can share
+    work over a batch override analyze_batch.
+
+    BasePipelineComponent.enable_metrics() switches on the latency and match metrics of all components, for every
+    doc or a sampled fraction of them. dump_metrics(nlp) in pynder.utils.metrics collects them after a run. A
+    component with a shared engine gets the time of its own question from the engine, see BaseSharedEngine.
+
+    A PageScope (pynder.utils.page_scope) restricts a component to some of the pages, e.g. the first three. The other
+    pages are not analyzed at all.
+
+    For yes/no questions bExists stops at the first match in a doc, the ResultMatch then holds only that match.
+    bExistsPerContract goes one step further: once the question is answered for a contract, the remaining docs of
+    that contract are skipped and get no result for the question. The docs of a contract are expected to follow
+    each other, as they do when a contract is read doc by doc.
+
+    list_gates names the questions that gate this one: only when all of them found a match on the doc, this question
+    is analyzed. Otherwise it gets ResultMatch(False) without any work, so the questions it gates in turn are
+    skipped as well. A gate has to match on every doc the gated question matches on, otherwise gating changes the
+    answer. A question class can set list_gates as class attribute, add_questions in pynder.matchers then puts the
+    gates before it in the pipeline. get_skipped_work in pynder.utils.gating reports the skipped work.
+
+    Questions whose result on the doc came from the result cache (see pynder_cache_reader) skip the doc.
+    get_definition returns everything that determines the result of a question, a change in it invalidates the
+    cached results.
     """
 
-    def __init__(self, bLoopOverSpans: bool = True):
+    # fraction of the docs to record metrics for, None when metrics are switched off
+    f_metrics_sample_rate = None
+
+    # names of the questions that have to match on a doc before this question is analyzed
+    list_gates = ()
+
+    # the question matches on tokens and their annotations, which depend on the spacy model (see ResultCache)
+    bTokenLevel = False
+
+    # number of answered contracts remembered by a bExistsPerContract component
+    I_ANSWERED_CONTRACTS = 1024
+
+    def __init__(
+        self,
+        bLoopOverSpans: bool = True,
+        bDocLevelMatching: bool = False,
+        page_scope: PageScope = None,
+        bExists: bool = False,
+        bExistsPerContract: bool = False,
+        list_gates: list = None,
+    ):
         self.bLoopOverSpans = bLoopOverSpans
+        self.bDocLevelMatching = bDocLevelMatching
+        self.page_scope = page_scope
+        self.bExists = bExists or bExistsPerContract
+        self.bExistsPerContract = bExistsPerContract
+        # insertion ordered, the oldest is dropped first
+        self.dict_answered_contracts = {}
+        if list_gates is not None:
+            self.list_gates = list(list_gates)
+        self.i_gated_docs = 0
+        self.i_gated_pages = 0
 
+        engine = getattr(self, "engine", None)
+        if engine is not None:
+            engine.set_exists(
+                self.name,
+                self.bExists,
+                self.is_answered if bExistsPerContract else None,
+            )
+            engine.set_gates(self.name, self.list_gates)
+            engine.add_component(self)
+
+    @add_metrics_for_class_method
     @add_error_handling_for_class_method
     def __call__(self, doc):
-        if self.bLoopOverSpans:
-
-            # analyze_text returns a ResultMatch which we can sum due to __radd__.
-            doc._._dict_results[self.name] = sum(
-                [
-                    self.analyze_doc(span, doc._.doc_id, i_page_number)
-                    for i_page_number, span in enumerate(doc.spans["PAGES"])
-                ]
+        if self.is_cached(doc):
+            self.set_answered(doc, doc._._dict_results[self.name])
+            return doc
+
+        if self.is_answered(doc):
+            if getattr(self, "engine", None) is not None:
+                self.engine.discard(doc, self.name)
+            return doc
+
+        if self.is_gated(doc):
+            self.get_doc_results(doc)[self.name] = self.skip_gated(doc)
+            return doc
+
+        result = self.analyze(doc)
+        self.get_doc_results(doc)[self.name] = result
+        self.set_answered(doc, result)
+        return doc
+
+    def is_cached(self, doc):
+        """Function that returns True if the result of the question on the doc came from the result cache."""
+        return self.name in doc.user_data.get(CACHED_USER_DATA_KEY, ())
+
+    def get_definition(self):
+        """Function that returns everything that determines the results of the question, see ResultCache.
+
+        Returns: dict
+        """
+        return {
+            "bLoopOverSpans": self.bLoopOverSpans,
+            "page_scope": None
+            if self.page_scope is None
+            else self.page_scope.to_dict(),
+            "bExists": self.bExists,
+            "bExistsPerContract": self.bExistsPerContract,
+            "list_gates": list(self.list_gates),
+        }
+
+    def get_required_annotations(self):
+        """Function that returns the token annotations (e.g. LEMMA) the question needs from the spacy model.
+
+        The regex, tfidf and counter questions only look at the text of the pages, so they need nothing but the
+        tokenizer, see pynder.utils.model_loading.
+
+        Returns: set
+        """
+        return set()
+
+    @classmethod
+    def get_class_annotations(cls):
+        """Function that returns the token annotations the question class needs, without creating the question.
+
+        Lets pynder.matchers.get_question_annotations decide which parts of the spacy model to load before the
+        model is loaded, see pynder.utils.corpus_runner.build_pipeline.
+
+        Returns: set, None if only the created question knows (see get_required_annotations)
+        """
+        if cls.get_required_annotations is not (
+            BasePipelineComponent.get_required_annotations
+        ):
+            return None
+        return set()
+
+    @staticmethod
+    def get_doc_results(doc):
+        """Function that returns the dict with the results of the questions on the doc.
+
+        The default of the _dict_results extension is one dict that all docs share, so every doc gets its own dict
+        before the first result is stored on it. Otherwise a gate would see the result of another doc.
+        """
+        dict_results = doc._._dict_results
+        if dict_results is Doc.get_extension("_dict_results")[0]:
+            dict_results = doc._._dict_results = {}
+        return dict_results
+
+    def is_answered(self, doc):
+        """Function that returns True if the question is already answered for the contract of the doc.
+
+        Args:
+            doc: Spacy.Doc
+
+        Returns: bool, always False without bExistsPerContract or a contract id
+        """
+        return bool(doc._.contract_id) and (
+            doc._.contract_id in self.dict_answered_contracts
+        )
+
+    def is_gated(self, doc):
+        """Function that returns True if one of the gates of the question is closed on the doc."""
+        return any(
+            is_gate_closed(doc._._dict_results.get(gate)) for gate in self.list_gates
+        )
+
+    def skip_gated(self, doc):
+        """Function that skips a doc whose gate is closed and returns its result, counting the skipped work."""
+        if getattr(self, "engine", None) is not None:
+            self.engine.discard(doc, self.name)
+        self.i_gated_docs += 1
+        self.i_gated_pages += self.count_pages(doc)
+        return ResultMatch(False)
+
+    def set_answered(self, doc, result):
+        """Function that marks the question as answered for the contract of the doc, if result has a match."""
+        if not self.bExistsPerContract or not doc._.contract_id:
+            return
+        if not (isinstance(result, ResultMatch) and result.bResult):
+            return
+        self.dict_answered_contracts[doc._.contract_id] = True
+        if len(self.dict_answered_contracts) > self.I_ANSWERED_CONTRACTS:
+            del self.dict_answered_contracts[next(iter(self.dict_answered_contracts))]
+
+    @classmethod
+    def enable_metrics(cls, f_sample_rate: float = 1.0):
+        """Function that switches on the metrics of all components of this class, for a fraction of the docs.
+
+        BasePipelineComponent.enable_metrics() covers all components, BaseRegex.enable_metrics() only the regexes.
+
+        Args:
+            f_sample_rate: float, e.g. 0.01 to time one doc in a hundred during production runs
+        """
+        cls.f_metrics_sample_rate = f_sample_rate
+
+    @classmethod
+    def disable_metrics(cls):
+        cls.f_metrics_sample_rate = None
+
+    def is_sampled(self, doc):
+        """Function that returns True if the metrics of this component are recorded for the doc."""
+        return is_sampled(doc, self.f_metrics_sample_rate)
+
+    def get_metrics(self):
+        """Function that returns the ComponentMetrics of this component, created on first use."""
+        if getattr(self, "metrics", None) is None:
+            self.metrics = ComponentMetrics()
+        return self.metrics
+
+    def count_pages(self, doc):
+        """Helper function that returns the number of texts the component analyzes in the doc."""
+        if not self.bLoopOverSpans:
+            return 1
+        return len(self.get_pages(doc)) if "PAGES" in doc.spans else 0
+
+    def get_pages(self, doc):
+        """Helper function that returns the pages in the page scope of the component.
+
+        Args:
+            doc: Spacy.Doc
+
+        Returns: list of (page number, page span)
+        """
+        pages = doc.spans["PAGES"]
+        if self.page_scope is None:
+            return list(enumerate(pages))
+        return [
+            (i_page_number, pages[i_page_number])
+            for i_page_number in self.page_scope.get_page_numbers(len(pages))
+        ]
+
+    def pipe(self, stream, batch_size: int = 128):
+        """Function implementing the spacy pipe protocol, used by nlp.pipe instead of calling __call__ per doc.
+
+        If a batch fails, its docs are analyzed one by one with __call__, so the error handling stays per doc.
+
+        Args:
+            stream: iterable of Spacy.Doc
+            batch_size: int
+
+        Returns: generator of Spacy.Doc
+        """
+        if self.bExistsPerContract:
+            # whether a doc is skipped depends on the docs before it, so go doc by doc
+            yield from (self(doc) for doc in stream)
+            return
+
+        for docs in minibatch(stream, size=batch_size):
+            # the gates ran on the whole batch already, so the closed ones are known up front
+            dict_skipped = {}
+            for i_doc, doc in enumerate(docs):
+                if self.is_cached(doc):
+                    dict_skipped[i_doc] = doc._._dict_results[self.name]
+                elif self.list_gates and self.is_gated(doc):
+                    dict_skipped[i_doc] = self.skip_gated(doc)
+            list_docs = [
+                doc for i_doc, doc in enumerate(docs) if i_doc not in dict_skipped
+            ]
+
+            f_sample_rate = self.f_metrics_sample_rate
+            # the shared engine records the time of the question itself
+            bRecord = (
+                f_sample_rate is not None
+                and getattr(self, "engine", None) is None
+                and random.random() < f_sample_rate
+            )
+            start = time.perf_counter()
+            try:
+                list_results = self.analyze_batch(list_docs) if list_docs else []
+            except Exception:
+                list_results = None
+
+            if list_results is not None and self.bExists:
+                list_results = [first_match(result) for result in list_results]
+
+            if bRecord and list_docs and list_results is not None:
+                self.get_metrics().record(
+                    time.perf_counter() - start,
+                    list_results,
+                    sum(self.count_pages(doc) for doc in list_docs),
+                    len(list_docs),
+                )
+
+            iter_results = iter(list_results) if list_results is not None else None
+            for i_doc, doc in enumerate(docs):
+                if i_doc in dict_skipped:
+                    self.get_doc_results(doc)[self.name] = dict_skipped[i_doc]
+                elif iter_results is None:
+                    doc = self(doc)
+                else:
+                    self.get_doc_results(doc)[self.name] = next(iter_results)
+                yield doc
+
+    def analyze_batch(self, docs):
+        """Function that analyzes a batch of docs and returns a ResultMatch per doc (same as analyze per doc).
+
+        Args:
+            docs: list of Spacy.Doc
+
+        Returns: list of ResultMatch
+        """
+        return [self.analyze(doc) for doc in docs]
+
+    def get_batch_texts(self, docs):
+        """Helper function that collects the texts to analyze in a batch: every page, or every doc as a whole.
+
+        Args:
+            docs: list of Spacy.Doc
+
+        Returns: tuple, (list of texts, list of (index of the doc in docs, doc_id, page number) per text)
+        """
+        list_texts = []
+        list_targets = []
+        for i_doc, doc in enumerate(docs):
+            if self.bLoopOverSpans:
+                text = (
+                    doc.text
+                )  # slicing one doc.text is cheaper than span.text per page
+                for i_page_number, span in self.get_pages(doc):
+                    list_texts.append(text[span.start_char : span.end_char])
+                    list_targets.append((i_doc, doc._.doc_id, i_page_number))
+            else:
+                list_texts.append(doc.text)
+                list_targets.append((i_doc, None, None))
+        return list_texts, list_targets
+
+    @staticmethod
+    def sum_batch_results(docs, list_targets, list_results):
+        """Helper function that sums the ResultMatch per text from get_batch_texts back into one per doc."""
+        list_builders = [ResultMatchBuilder() for _ in docs]
+        for (i_doc, _, _), result in zip(list_targets, list_results):
+            list_builders[i_doc].add(result)
+        return [builder.build() for builder in list_builders]
+
+    def analyze(self, doc):
+        """Function that analyzes a complete doc, either page by page or as a whole, and returns the ResultMatch.
+
+        Args:
+            doc: Spacy.Doc
+
+        Returns: ResultMatch
+        """
+        # with a page scope only a few pages are analyzed, so matching the whole doc would be more work
+        if self.bLoopOverSpans and self.bDocLevelMatching and self.page_scope is None:
+            result = self.analyze_doc_level(doc)
+
+        elif self.bLoopOverSpans:
+
+            # analyze_doc returns a ResultMatch per page, the builder sums them in linear time
+            result = ResultMatchBuilder.sum(
+                self.analyze_pages(doc), bStopAtMatch=self.bExists
             )
 
         else:
-            doc._._dict_results[self.name] = self.analyze_doc(doc, None)
-        return doc
+            result = self.analyze_doc(doc, None)
+
+        return first_match(result) if self.bExists else result
+
+    def analyze_pages(self, doc):
+        """Function that analyzes the pages of the doc one by one, timing every page if the doc is sampled.
+
+        Args:
+            doc: Spacy.Doc
+
+        Returns: generator of ResultMatch, one per page
+        """
+        bSampled = self.is_sampled(doc)
+        for i_page_number, span in self.get_pages(doc):
+            if not bSampled:
+                yield self.analyze_doc(span, doc._.doc_id, i_page_number)
+                continue
+            start = time.perf_counter()
+            result = self.analyze_doc(span, doc._.doc_id, i_page_number)
+            self.get_metrics().record_page(time.perf_counter() - start)
+            yield result
 
     def analyze_doc(self, doc, doc_id, i_page_number=None):
         """Main analyze function which will be called on every span/doc and returning the ResultMatch object.
@@ -51,9 +432,32 @@ class BasePipelineComponent:
         """
         raise NotImplementedError
 
+    def analyze_doc_level(self, doc):
+        """Analyze function that matches once over the whole doc and buckets the matches per page.
+
+        Must return the same ResultMatch as analyzing every page span with analyze_doc.
+
+        Args:
+            doc: Spacy.Doc
+
+        Returns: ResultMatch
+        """
+        raise NotImplementedError
+
 
 class BaseRegex(BasePipelineComponent):
-    """Base class for the regex matchers."""
+    """Base class for the regex matchers.
+
+    By default all regex questions of one nlp object share a RegexEngine, which scans every doc once for all of
+    them. Set bSharedEngine to False to let the component scan the doc on its own.
+
+    fTimeout gives every match call (one per page, or one per doc) a time budget in seconds. A page that exceeds it
+    is recorded in ResultMatch.tTimeouts instead of blocking the pipeline, i_timeouts counts them per question.
+
+    Pages that contain none of the literals every match needs are skipped without running the pattern. By default
+    these are taken from the patterns (see get_required_literals), list_literals declares them explicitly and an
+    empty list turns the prefilter off.
+    """
 
     def __init__(
         self,
@@ -61,16 +465,72 @@ class BaseRegex(BasePipelineComponent):
         name: str,
         list_regex_patterns: list,
         bLoopOverSpans: bool = True,
+        bSharedEngine: bool = True,
+        fTimeout: float = None,
+        list_literals: list = None,
+        page_scope: PageScope = None,
+        bExists: bool = False,
+        bExistsPerContract: bool = False,
+        list_gates: list = None,
         *args,
         **kwargs
     ):
         self.pattern = re.compile("|".join(list_regex_patterns))
         self.name = name  # used to store result
         self.bLoopOverSpans = bLoopOverSpans
-        super().__init__(bLoopOverSpans)
+        self.fTimeout = fTimeout
+        self.i_timeouts = 0
+        if list_literals is None:
+            list_literals = get_required_literals(self.pattern)
+        self.list_literals = list_literals
+        self.engine = None
+        if bSharedEngine:
+            self.engine = RegexEngine.get_engine(nlp)
+            self.engine.register(
+                name, self.pattern, bLoopOverSpans, fTimeout, list_literals, page_scope
+            )
+        super().__init__(
+            bLoopOverSpans,
+            page_scope=page_scope,
+            bExists=bExists,
+            bExistsPerContract=bExistsPerContract,
+            list_gates=list_gates,
+        )
+
+    def analyze(self, doc):
+        if self.engine is None:
+            result = super().analyze(doc)
+        else:
+            result = self.engine.get_result(doc, self.name)
+
+        if isinstance(result, ResultMatch):  # a doc without pages sums to 0
+            self.i_timeouts += len(result.tTimeouts)
+        return result
+
+    def get_definition(self):
+        return {
+            **super().get_definition(),
+            "type": "regex",
+            "pattern": self.pattern.pattern,
+            "flags": self.pattern.flags,
+            "fTimeout": self.fTimeout,
+            "list_literals": self.list_literals,
+        }
 
     def analyze_doc(self, doc, doc_id, i_page_number=None):
-        tuple_matches = tuple(self.pattern.findall(doc.text))
+        text = doc.text
+        if self.list_literals and not any(lit in text for lit in self.list_literals):
+            return ResultMatch(False)
+
+        tuple_matches, tTimeouts = RegexEngine.findall(
+            self.name,
+            self.pattern,
+            text,
+            self.fTimeout,
+            doc_id if doc_id is not None else doc._.doc_id,
+            i_page_number,
+            self.bExists,
+        )
         return (
             ResultMatch(
                 bResult=True,
@@ -79,12 +539,33 @@ class BaseRegex(BasePipelineComponent):
                 tDocIds=(doc_id,),
             )
             if tuple_matches
-            else ResultMatch(False)
+            else ResultMatch(False, tTimeouts=tTimeouts)
         )
 
+    @staticmethod
+    def get_timeout_counts(nlp):
+        """Function that returns the number of timeouts per regex question in the pipeline of nlp.
+
+        Args:
+            nlp: spacy.Language
+
+        Returns: dict, question name -> number of pages/docs that exceeded the time budget
+        """
+        return {
+            name: proc.i_timeouts
+            for name, proc in nlp.pipeline
+            if isinstance(proc, BaseRegex)
+        }
+
 
 class BaseTFIDF(BasePipelineComponent):
-    """Base class for the Term Frequency - Inverse document frequency matchers."""
+    """Base class for the Term Frequency - Inverse document frequency matchers.
+
+    By default the vocabulary and IDF are fitted on the source texts once, when the component is created. Every
+    doc/page then only needs a transform and a sparse dot product. Set bFitOnce to False to refit on the source
+    texts plus the target for every doc/page (the old behaviour). Questions with the same source texts can share
+    one fitted vectorizer.
+    """
 
     def __init__(
         self,
@@ -93,46 +574,152 @@ class BaseTFIDF(BasePipelineComponent):
         i_threshold,
         list_source_texts,
         bLoopOverSpans: bool = False,
+        bFitOnce: bool = True,
+        vectorizer: Vectorizer = None,
+        page_scope: PageScope = None,
+        bExists: bool = False,
+        bExistsPerContract: bool = False,
+        list_gates: list = None,
     ):
         self.i_threshold = i_threshold
         self.list_source_texts = list_source_texts
-        self.vectorizer = Vectorizer()
+        self.bFitOnce = bFitOnce
+        if vectorizer is None or not bFitOnce:
+            vectorizer = Vectorizer()
+            if bFitOnce:
+                vectorizer.fit(list_source_texts)
+        self.vectorizer = vectorizer
         self.name = name
         self.bLoopOverSpans = (
             bLoopOverSpans  # mmm maybe this should be a pipeline parameter?
         )
-        super().__init__(bLoopOverSpans)
+        super().__init__(
+            bLoopOverSpans,
+            page_scope=page_scope,
+            bExists=bExists,
+            bExistsPerContract=bExistsPerContract,
+            list_gates=list_gates,
+        )
+
+    def get_definition(self):
+        return {
+            **super().get_definition(),
+            "type": "tfidf",
+            "i_threshold": self.i_threshold,
+            "list_source_texts": self.list_source_texts,
+            "bFitOnce": self.bFitOnce,
+        }
 
     def analyze_doc(self, doc, doc_id, i_page_number=None):
-        similarity_score, best_match = self.vectorizer.get_similarity_score(
-            list_source_texts=self.list_source_texts, target_text=doc.text
-        )
+        if self.bFitOnce:
+            similarity_score, best_match = self.vectorizer.get_fitted_similarity_score(
+                target_text=doc.text
+            )
+        else:
+            similarity_score, best_match = self.vectorizer.get_similarity_score(
+                list_source_texts=self.list_source_texts, target_text=doc.text
+            )
         return (
             ResultMatch(
                 bResult=True,
                 tMatches=(best_match,),
                 tPage_nr=(i_page_number,),
-                tDocIds=(doc._.doc_id,),
+                tDocIds=(doc_id if doc_id is not None else doc._.doc_id,),
             )
             if similarity_score > self.i_threshold
             else ResultMatch(False)
         )
 
+    def analyze_batch(self, docs):
+        if not self.bFitOnce:
+            return super().analyze_batch(docs)
+
+        # one transform and one sparse dot product for all docs/pages in the batch
+        list_texts, list_targets = self.get_batch_texts(docs)
+        arr_scores, list_best_matches = self.vectorizer.get_fitted_similarity_scores(
+            list_texts
+        )
+        list_results = [
+            ResultMatch(
+                bResult=True,
+                tMatches=(best_match,),
+                tPage_nr=(i_page_number,),
+                tDocIds=(doc_id if doc_id is not None else docs[i_doc]._.doc_id,),
+            )
+            if similarity_score > self.i_threshold
+            else ResultMatch(False)
+            for (i_doc, doc_id, i_page_number), similarity_score, best_match in zip(
+                list_targets, arr_scores, list_best_matches
+            )
+        ]
+        return self.sum_batch_results(docs, list_targets, list_results)
+
 
 class BaseSpacyMatcher(BasePipelineComponent):
-    """Base class for the Spacy build in pattern matchers."""
+    """Base class for the Spacy build in pattern matchers.
+
+    By default all matcher questions of one nlp object share a SpacyMatcherEngine, whose matchers run once per doc
+    for all of them. Set bSharedEngine to False to let the component run its own Matcher.
+    """
+
+    bTokenLevel = True
 
     def __init__(
-        self, nlp: Language, name: str, list_patterns: list, bLoopOverSpans: bool = True
+        self,
+        nlp: Language,
+        name: str,
+        list_patterns: list,
+        bLoopOverSpans: bool = True,
+        bDocLevelMatching: bool = False,
+        bSharedEngine: bool = True,
+        page_scope: PageScope = None,
+        bExists: bool = False,
+        bExistsPerContract: bool = False,
+        list_gates: list = None,
     ):
         _matcher = Matcher(nlp.vocab)
         _matcher.add("key", list_patterns)
+        self.list_patterns = list_patterns
         self.matcher = _matcher
         self.name = name
         self.bLoopOverSpans = (
             bLoopOverSpans  # mmm maybe this should be a pipeline parameter?
         )
-        super().__init__(bLoopOverSpans)
+        self.engine = None
+        if bSharedEngine:
+            self.engine = SpacyMatcherEngine.get_engine(nlp)
+            self.engine.register(name, list_patterns, bLoopOverSpans, page_scope)
+        super().__init__(
+            bLoopOverSpans,
+            bDocLevelMatching,
+            page_scope,
+            bExists,
+            bExistsPerContract,
+            list_gates,
+        )
+
+    def analyze(self, doc):
+        if self.engine is None:
+            return super().analyze(doc)
+        return self.engine.get_result(doc, self.name)
+
+    def get_definition(self):
+        return {
+            **super().get_definition(),
+            "type": "matcher",
+            "list_patterns": self.list_patterns,
+        }
+
+    def get_required_annotations(self):
+        return get_pattern_annotations(self.list_patterns)
+
+    @classmethod
+    def get_class_annotations(cls):
+        # questions that set their patterns as class attribute (e.g. Question27)
+        list_patterns = getattr(cls, "list_patterns", None)
+        if list_patterns is None:
+            return None
+        return get_pattern_annotations(list_patterns)
 
     def analyze_doc(self, doc, doc_id, i_page_number=None):
         matches = self.matcher(doc, as_spans=True)
@@ -148,9 +735,30 @@ class BaseSpacyMatcher(BasePipelineComponent):
             else ResultMatch(False)
         )
 
+    def analyze_doc_level(self, doc):
+        list_page_starts, list_page_ends = get_page_offsets(doc, bCharOffsets=False)
+
+        # the matcher returns every match, so matches that cross a page boundary are simply not found per page
+        list_page_matches, _ = bucket_matches(
+            [(span.start, span.end, span) for span in self.matcher(doc, as_spans=True)],
+            list_page_starts,
+            list_page_ends,
+        )
+        builder = ResultMatchBuilder()
+        for i_page_number, matches in enumerate(list_page_matches):
+            if matches:
+                builder.append(matches, i_page_number, doc._.doc_id)
+            else:
+                builder.add_empty()
+        return builder.build()
+
 
 class BaseNormalizedCounter(BasePipelineComponent):
-    """Base class for the Spacy build in pattern matchers."""
+    """Base class for the Spacy build in pattern matchers.
+
+    By default all counter questions of one nlp object share a NormalizedCounterEngine, which counts the words of
+    every doc once for all of them. Set bSharedEngine to False to let the component count the words on its own.
+    """
 
     def __init__(
         self,
@@ -159,6 +767,12 @@ class BaseNormalizedCounter(BasePipelineComponent):
         iThreshold,
         list_words_of_interest,
         bLoopOverSpans: bool = True,
+        bDocLevelMatching: bool = False,
+        bSharedEngine: bool = True,
+        page_scope: PageScope = None,
+        bExists: bool = False,
+        bExistsPerContract: bool = False,
+        list_gates: list = None,
     ):
         self.iThreshold = iThreshold
         self.list_words_of_interest = list_words_of_interest
@@ -166,7 +780,33 @@ class BaseNormalizedCounter(BasePipelineComponent):
         self.bLoopOverSpans = (
             bLoopOverSpans  # mmm maybe this should be a pipeline parameter?
         )
-        super().__init__(bLoopOverSpans)
+        self.engine = None
+        if bSharedEngine:
+            self.engine = NormalizedCounterEngine.get_engine(nlp)
+            self.engine.register(
+                name, list_words_of_interest, iThreshold, bLoopOverSpans, page_scope
+            )
+        super().__init__(
+            bLoopOverSpans,
+            bDocLevelMatching,
+            page_scope,
+            bExists,
+            bExistsPerContract,
+            list_gates,
+        )
+
+    def analyze(self, doc):
+        if self.engine is None:
+            return super().analyze(doc)
+        return self.engine.get_result(doc, self.name)
+
+    def get_definition(self):
+        return {
+            **super().get_definition(),
+            "type": "counter",
+            "iThreshold": self.iThreshold,
+            "list_words_of_interest": self.list_words_of_interest,
+        }
 
     def analyze_doc(self, doc, doc_id, i_page_number=None):
         normalized_score_count = calc_normalized_count(
@@ -183,3 +823,43 @@ class BaseNormalizedCounter(BasePipelineComponent):
             if normalized_score_count > self.iThreshold
             else ResultMatch(False)
         )
+
+    def analyze_doc_level(self, doc):
+        text = doc.text
+        list_page_starts, list_page_ends = get_page_offsets(doc)
+        list_scores = calc_normalized_count_per_page(
+            text, list_page_starts, list_page_ends, self.list_words_of_interest
+        )
+        builder = ResultMatchBuilder()
+        for i_page_number, (start, end, score) in enumerate(
+            zip(list_page_starts, list_page_ends, list_scores)
+        ):
+            if score > self.iThreshold:
+                # return only first 100 chars
+                builder.append([text[start:end][:100]], i_page_number, doc._.doc_id)
+            else:
+                builder.add_empty()
+        return builder.build()
+
+    def analyze_batch(self, docs):
+        if self.engine is not None:
+            # the engine already counts every doc once for all counter questions
+            return super().analyze_batch(docs)
+
+        # count the words of interest in all docs/pages of the batch with a single scan
+        list_texts, list_targets = self.get_batch_texts(docs)
+        list_scores = calc_normalized_counts(list_texts, self.list_words_of_interest)
+        list_results = [
+            ResultMatch(
+                bResult=True,
+                tMatches=([text[:100]],),  # return only first 100 chars
+                tPage_nr=(i_page_number,),
+                tDocIds=(doc_id,),
+            )
+            if score > self.iThreshold
+            else ResultMatch(False)
+            for (_, doc_id, i_page_number), text, score in zip(
+                list_targets, list_texts, list_scores
+            )
+        ]
+        return self.sum_batch_results(docs, list_targets, list_results)
@@ -0,0 +1,208 @@
+"""Questions defined as data instead of classes.
+
+A definition file (questions_<name>.json next to the question modules) holds one definition per question:
+
+{
+    "questions": {
+        "q60": {"type": "regex", "patterns": [".{100}boeteclausule.{100}"], "timeout": 1.0},
+        "q61": {"type": "matcher", "patterns": [[{"LEMMA": "factuur"}, {"LEMMA": "termijn"}]]},
+        "q62": {"type": "tfidf", "source_texts": ["uittreksel handelsregister"], "threshold": 0.5, "scope": "doc"},
+        "q63": {"type": "counter", "words": ["boete", "schadevergoeding"], "threshold": 0.001}
+    }
+}
+
+scope is "pages" (every page on its own), "doc" (the doc as a whole) or a page scope: {"first": 3} for the first
+three pages, {"last": 2} for the last two, or both (see pynder.utils.page_scope). mode is "all" (every match),
+"exists" (the first match of a doc) or "contract" (the first match of a contract, see bExistsPerContract). gates
+lists the questions that have to match on a doc before the question is analyzed, e.g. "gates": ["q60"]. The
+defaults of the Base* classes apply to everything that is left out. The compiled questions are regular Base*
+components, so they share the engines with all other questions of the same type. A complete example file is
+tests/QuestionDefinitionTests/questions_example.json.
+
+Parsed files and fitted TF-IDF vectorizers are kept in memory for the lifetime of the process, nothing is written
+to disk: every process (e.g. every worker of a corpus run) parses a file and fits a vectorizer once.
+"""
+# standard library
+import hashlib
+import json
+import os
+
+# non-standard library
+from spacy.language import Language
+
+# custom code
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseSpacyMatcher,
+    BaseTFIDF,
+    BaseNormalizedCounter,
+)
+from pynder.utils.page_scope import PageScope
+from pynder.utils.similarity import Vectorizer
+
+# type -> (Base* class, {definition key: keyword argument of the class})
+DICT_TYPES = {
+    "regex": (
+        BaseRegex,
+        {
+            "patterns": "list_regex_patterns",
+            "timeout": "fTimeout",
+            "literals": "list_literals",
+        },
+    ),
+    "matcher": (BaseSpacyMatcher, {"patterns": "list_patterns"}),
+    "tfidf": (
+        BaseTFIDF,
+        {"threshold": "i_threshold", "source_texts": "list_source_texts"},
+    ),
+    "counter": (
+        BaseNormalizedCounter,
+        {"threshold": "iThreshold", "words": "list_words_of_interest"},
+    ),
+}
+
+DICT_REQUIRED_KEYS = {
+    "regex": ["patterns"],
+    "matcher": ["patterns"],
+    "tfidf": ["threshold", "source_texts"],
+    "counter": ["threshold", "words"],
+}
+
+DICT_SCOPES = {"pages": True, "doc": False}
+
+# keys of a page scope, e.g. {"first": 3}
+TUPLE_PAGE_SCOPE_KEYS = ("first", "last")
+
+# mode -> keyword arguments of the Base* class
+DICT_MODES = {
+    "all": {},
+    "exists": {"bExists": True},
+    "contract": {"bExistsPerContract": True},
+}
+
+# (path, modification time) -> definitions of the file, in this process
+_dict_files = {}
+
+# hash of the source texts -> fitted Vectorizer, shared by all tfidf questions with the same source texts in this
+# process
+_dict_vectorizers = {}
+
+
+def validate_definition(name, definition):
+    """Function that checks a question definition, so a typo fails when the file is loaded and not halfway a run.
+
+    Args:
+        name: str
+        definition: dict
+
+    Raises: ValueError
+    """
+    str_type = definition.get("type")
+    if str_type not in DICT_TYPES:
+        raise ValueError(
+            f"{name}: unknown type {str_type}, choose from {', '.join(DICT_TYPES)}"
+        )
+
+    set_known = {"type", "scope", "mode", "gates"} | set(DICT_TYPES[str_type][1])
+    set_unknown = set(definition) - set_known
+    if set_unknown:
+        raise ValueError(f"{name}: unknown keys {', '.join(sorted(set_unknown))}")
+
+    list_missing = [
+        key for key in DICT_REQUIRED_KEYS[str_type] if key not in definition
+    ]
+    if list_missing:
+        raise ValueError(f"{name}: missing keys {', '.join(list_missing)}")
+
+    if definition.get("mode", "all") not in DICT_MODES:
+        raise ValueError(
+            f"{name}: unknown mode {definition['mode']}, choose from {', '.join(DICT_MODES)}"
+        )
+
+    list_gates = definition.get("gates", [])
+    if not isinstance(list_gates, list) or not all(
+        isinstance(gate, str) for gate in list_gates
+    ):
+        raise ValueError(f"{name}: gates is a list of question names, got {list_gates}")
+
+    scope = definition.get("scope", "pages")
+    if isinstance(scope, dict):
+        if not scope or set(scope) - set(TUPLE_PAGE_SCOPE_KEYS):
+            raise ValueError(
+                f"{name}: a page scope has the keys {', '.join(TUPLE_PAGE_SCOPE_KEYS)}, got {scope}"
+            )
+        if not all(isinstance(i, int) and i >= 0 for i in scope.values()):
+            raise ValueError(f"{name}: page scope {scope} needs page counts >= 0")
+    elif scope not in DICT_SCOPES:
+        raise ValueError(f"{name}: unknown scope {scope}")
+
+
+def load_definitions(path):
+    """Function that reads and validates a definition file, kept in memory until the file changes.
+
+    Args:
+        path: str
+
+    Returns: dict, question name -> definition
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _dict_files:
+        with open(path, encoding="utf-8") as f:
+            dict_questions = json.load(f)["questions"]
+        for name, definition in dict_questions.items():
+            validate_definition(name, definition)
+        _dict_files[key] = dict_questions
+    return _dict_files[key]
+
+
+def get_vectorizer(list_source_texts):
+    """Function that returns a Vectorizer fitted on the source texts, fitting it only once per process."""
+    key = hashlib.sha1(
+        json.dumps(list_source_texts, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    if key not in _dict_vectorizers:
+        _dict_vectorizers[key] = Vectorizer().fit(list_source_texts)
+    return _dict_vectorizers[key]
+
+
+def compile_question(nlp, name, definition):
+    """Function that turns a question definition into its pipeline component.
+
+    Args:
+        nlp: spacy.Language
+        name: str
+        definition: dict
+
+    Returns: BasePipelineComponent
+    """
+    validate_definition(name, definition)
+    base_class, dict_arguments = DICT_TYPES[definition["type"]]
+
+    kwargs = {
+        argument: definition[key]
+        for key, argument in dict_arguments.items()
+        if key in definition
+    }
+    scope = definition.get("scope")
+    if isinstance(scope, dict):
+        kwargs["bLoopOverSpans"] = True
+        kwargs["page_scope"] = PageScope.from_dict(scope)
+    elif scope is not None:
+        kwargs["bLoopOverSpans"] = DICT_SCOPES[scope]
+    kwargs.update(DICT_MODES[definition.get("mode", "all")])
+    if "gates" in definition:
+        kwargs["list_gates"] = definition["gates"]
+    if base_class is BaseTFIDF:
+        kwargs["vectorizer"] = get_vectorizer(definition["source_texts"])
+    return base_class(nlp, name, **kwargs)
+
+
+@Language.factory("pynder_question", default_config={"definition": {}})
+def make_question(nlp: Language, name: str, definition: dict):
+    """Factory of all questions defined as data, the definition travels along in the pipeline config.
+
+    example usage:
+
+    nlp.add_pipe("pynder_question", name="q60", config={"definition": {"type": "regex", "patterns": ["boete"]}})
+    """
+    return compile_question(nlp, name, definition)
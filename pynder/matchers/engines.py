@@ -0,0 +1,864 @@
+# standard library
+import time
+import weakref
+
+# non-standard library
+import numpy as np
+from spacy.matcher import Matcher, PhraseMatcher
+from spacy.tokens import Doc, Span
+
+# custom code
+from pynder.enums import ResultMatch, ResultMatchBuilder, first_match
+from pynder.utils.gating import is_gate_closed
+from pynder.utils.literals import LiteralScanner
+from pynder.utils.metrics import ComponentMetrics
+from pynder.utils.model_loading import DICT_ANNOTATION_COMPONENTS
+from pynder.utils.occurance import calc_term_counts
+from pynder.utils.page_bucketing import get_page_offsets, bucket_matches
+
+
+class BaseSharedEngine:
+    """Main parent class of the engines that analyze a doc once for all questions of one type.
+
+    There is one engine per engine class and nlp object. The first component that asks for its result on a doc
+    triggers analyze_doc, which returns the ResultMatch of every registered question whose component runs in the
+    pipeline. These are kept in doc.user_data until the matching component picks them up. Questions whose component
+    is disabled or was never added are left out, so nothing is computed that no component picks up.
+
+    Questions in exists mode (see set_exists) only get their first match. Questions that are already answered for
+    the contract of the doc are not analyzed at all. Questions with a closed gate (see set_gates) get
+    ResultMatch(False) without being analyzed.
+
+    With metrics switched on, analyze_doc times the work of every question on its own and records it in the
+    metrics of the component of that question (see add_component). The work done once for all questions, like
+    building doc.text or running a Matcher, goes into the metrics of the engine itself.
+    """
+
+    USER_DATA_KEY = None
+
+    # one engine per engine class and nlp object, cleaned up together with the nlp object
+    _dict_engines = weakref.WeakKeyDictionary()
+
+    def __init__(self, nlp):
+        # weak, an engine must not keep its nlp object alive (see _dict_engines)
+        self.nlp_ref = weakref.ref(nlp)
+        self.dict_page_scopes = {}
+        self.dict_exists = {}
+        self.dict_is_answered = {}
+        self.dict_gates = {}
+        # weak, like nlp_ref, the components belong to the pipeline
+        self.dict_components = weakref.WeakValueDictionary()
+        self.metrics = None
+
+    @classmethod
+    def get_engine(cls, nlp):
+        """Function that returns the engine belonging to the nlp object, creating it on first use.
+
+        Args:
+            nlp: spacy.Language
+
+        Returns: BaseSharedEngine
+        """
+        dict_engines = cls._dict_engines.setdefault(nlp, {})
+        if cls not in dict_engines:
+            dict_engines[cls] = cls(nlp)
+        return dict_engines[cls]
+
+    def get_inactive_names(self):
+        """Function that returns the registered questions whose component does not run in the pipeline of the nlp.
+
+        That is a component that is disabled, removed or never added. When none of the registered questions is in
+        the pipeline, the components are used on their own (e.g. in a benchmark) and all of them count as active.
+
+        Returns: set
+        """
+        nlp = self.nlp_ref()
+        set_registered = set(self.dict_page_scopes)
+        if nlp is None or set_registered.isdisjoint(nlp.component_names):
+            return set()
+        return set_registered.difference(nlp.pipe_names)
+
+    def analyze_doc(self, doc, set_done=frozenset()):
+        """Function that analyzes the doc for all registered questions at once.
+
+        Args:
+            doc: spacy.Doc
+            set_done: set, questions that already have their result on the doc or do not run, these are left out
+
+        Returns: dict, question name -> ResultMatch
+        """
+        raise NotImplementedError
+
+    def get_result(self, doc, name):
+        """Function that returns the ResultMatch of one question, analyzing the doc if that did not happen yet.
+
+        Results are removed from doc.user_data once they are picked up, so nothing is left on the doc afterwards.
+
+        Args:
+            doc: spacy.Doc
+            name: str
+
+        Returns: ResultMatch
+        """
+        dict_cache = doc.user_data.get(self.USER_DATA_KEY)
+        if dict_cache is None or name not in dict_cache:
+            # components that ran before (and skipped the doc), or that do not run, would never pick up their result
+            set_done = (set(doc._._dict_results) | self.get_inactive_names()) - {name}
+            dict_cache = self.analyze_doc(doc, set_done)
+            doc.user_data[self.USER_DATA_KEY] = dict_cache
+
+        result = dict_cache.pop(name)
+        if not dict_cache:
+            del doc.user_data[self.USER_DATA_KEY]
+        return result
+
+    def discard(self, doc, name):
+        """Function that drops the ResultMatch of a question that skips the doc, if the doc was analyzed for it."""
+        dict_cache = doc.user_data.get(self.USER_DATA_KEY)
+        if dict_cache is None:
+            return
+        dict_cache.pop(name, None)
+        if not dict_cache:
+            del doc.user_data[self.USER_DATA_KEY]
+
+    def set_exists(self, name, bExists: bool = False, is_answered=None):
+        """Function that sets the evaluation mode of a registered question.
+
+        Args:
+            name: str, name of the pipeline component (the question)
+            bExists: bool, only the first match in the doc is needed
+            is_answered: function doc -> bool, True if the doc can be skipped, None to analyze every doc
+        """
+        self.dict_exists[name] = bExists
+        self.dict_is_answered[name] = is_answered
+
+    def set_gates(self, name, list_gates):
+        """Function that sets the names of the questions that gate a registered question."""
+        self.dict_gates[name] = list(list_gates)
+
+    def add_component(self, component):
+        """Function that links a registered question to its component, which records the metrics of the question."""
+        self.dict_components[component.name] = component
+
+    def get_sampled_names(self, doc):
+        """Function that returns the questions whose component records metrics for the doc."""
+        return {
+            name
+            for name, component in self.dict_components.items()
+            if component.is_sampled(doc)
+        }
+
+    def get_metrics(self):
+        """Function that returns the ComponentMetrics of the work done once per doc, created on first use."""
+        if self.metrics is None:
+            self.metrics = ComponentMetrics()
+        return self.metrics
+
+    def record(self, name, f_seconds, result, i_pages):
+        """Function that records the time of one question on a doc in the metrics of its component.
+
+        Args:
+            name: str
+            f_seconds: float, wall time of the work for this question only
+            result: ResultMatch
+            i_pages: int, number of texts analyzed for the question (1 for a doc as a whole)
+        """
+        component = self.dict_components.get(name)
+        if component is not None:
+            component.get_metrics().record(f_seconds, result, i_pages)
+
+    def record_page(self, name, f_seconds):
+        """Function that records the time of one question on a single page in the metrics of its component."""
+        component = self.dict_components.get(name)
+        if component is not None:
+            component.get_metrics().record_page(f_seconds)
+
+    def is_gated(self, name, doc, dict_results):
+        """Function that returns True if one of the gates of the question is closed on the doc.
+
+        Args:
+            name: str
+            doc: spacy.Doc
+            dict_results: dict, the results of this engine on the doc so far, which the pipeline does not have yet
+
+        Returns: bool
+        """
+        return any(
+            is_gate_closed(
+                dict_results[gate]
+                if gate in dict_results
+                else doc._._dict_results.get(gate)
+            )
+            for gate in self.dict_gates.get(name, ())
+        )
+
+    def is_skipped(self, name, doc, set_done=frozenset()):
+        """Function that returns True if the question does not need to be analyzed on the doc."""
+        if name in set_done:
+            return True
+        is_answered = self.dict_is_answered.get(name)
+        return is_answered is not None and is_answered(doc)
+
+    @staticmethod
+    def to_result_match(matches, doc_id, i_page_number):
+        """Function that converts the matches of one page (or doc) into a ResultMatch, like the Base* analyze_doc."""
+        return (
+            ResultMatch(
+                bResult=True,
+                tMatches=(matches,),
+                tPage_nr=(i_page_number,),
+                tDocIds=(doc_id,),
+            )
+            if matches
+            else ResultMatch(False)
+        )
+
+    def get_page_numbers(self, name, i_pages):
+        """Function that returns the page numbers the question analyzes, all pages if it has no PageScope."""
+        page_scope = self.dict_page_scopes.get(name)
+        if page_scope is None:
+            return range(i_pages)
+        return page_scope.get_page_numbers(i_pages)
+
+    @staticmethod
+    def sum_page_results(list_page_matches, doc_id, list_page_numbers=None):
+        """Function that converts the matches per page into the summed ResultMatch of the doc.
+
+        Gives the same result as summing a ResultMatch per page, but appends the matches to a ResultMatchBuilder
+        instead of creating and adding a ResultMatch for every page.
+
+        Args:
+            list_page_matches: list, matches per page
+            doc_id: str
+            list_page_numbers: list, only sum these pages (the PageScope of the question), None for all pages
+
+        Returns: ResultMatch, or 0 for a doc without pages (like summing no pages)
+        """
+        if list_page_numbers is None:
+            list_page_numbers = range(len(list_page_matches))
+
+        builder = ResultMatchBuilder()
+        for i_page_number in list_page_numbers:
+            matches = list_page_matches[i_page_number]
+            if matches:
+                builder.append(matches, i_page_number, doc_id)
+            else:
+                builder.add_empty()
+        return builder.build()
+
+
+class RegexEngine(BaseSharedEngine):
+    """Regex engine shared by all BaseRegex components that are created on the same nlp object.
+
+    Every BaseRegex registers its compiled pattern here. The first regex component that runs on a doc triggers a
+    single pass over the doc: doc.text is built once, every page is sliced out of it once and all registered
+    patterns are run over those slices. The results are tagged with the question name and kept in doc.user_data
+    until the matching component picks them up.
+
+    Mind you: the patterns are deliberately not merged into one big alternation. The regex module speeds up every
+    pattern with a required-literal search, which is lost once the patterns are wrapped in a combined alternation.
+
+    Most patterns need a literal keyword to match (e.g. "opzegtermijn"). One LiteralScanner pass over doc.text finds
+    which of these keywords are on which page, a pattern only runs on the pages that contain one of its keywords.
+
+    example usage:
+
+    engine = RegexEngine.get_engine(nlp)
+    engine.register("q8", regex.compile(r"tussen\\ *(?s)(.*?dossiernummer\\ *\\d*)"))
+    result = engine.get_result(doc, "q8")  # ResultMatch
+    """
+
+    USER_DATA_KEY = "pynder_regex_engine"
+
+    def __init__(self, nlp):
+        self.dict_patterns = {}
+        self.dict_loop_over_spans = {}
+        self.dict_timeouts = {}
+        self.dict_literals = {}
+        self._dict_scanners = {}
+        super().__init__(nlp)
+
+    def register(
+        self,
+        name,
+        pattern,
+        bLoopOverSpans: bool = True,
+        fTimeout: float = None,
+        list_literals: list = None,
+        page_scope=None,
+    ):
+        """Function that adds the compiled pattern of a question to the engine.
+
+        Args:
+            name: str, name of the pipeline component (the question)
+            pattern: compiled regex pattern
+            bLoopOverSpans: bool, analyze per page (True) or the doc as a whole (False)
+            fTimeout: float, time budget in seconds per page (or doc), None for no budget
+            list_literals: list, every match contains at least one of these, None (or empty) to always run
+            page_scope: PageScope, the pages to analyze, None for all pages
+        """
+        self.dict_patterns[name] = pattern
+        self.dict_loop_over_spans[name] = bLoopOverSpans
+        self.dict_timeouts[name] = fTimeout
+        self.dict_literals[name] = set(list_literals) if list_literals else None
+        self.dict_page_scopes[name] = page_scope
+        self._dict_scanners = {}  # rebuilt on the next doc
+
+    def get_scanner(self, set_names):
+        """Function that returns the LiteralScanner for the literals of the questions, None if there are none.
+
+        Args:
+            set_names: frozenset, the questions that run in the pipeline, see get_inactive_names
+
+        Returns: LiteralScanner or None
+        """
+        if set_names not in self._dict_scanners:
+            set_literals = set().union(
+                *(self.dict_literals[name] or () for name in set_names)
+            )
+            self._dict_scanners[set_names] = (
+                LiteralScanner(set_literals) if set_literals else None
+            )
+        return self._dict_scanners[set_names]
+
+    @staticmethod
+    def findall(
+        name,
+        pattern,
+        text,
+        fTimeout,
+        doc_id,
+        i_page_number=None,
+        bExists: bool = False,
+    ):
+        """Function that runs pattern.findall within the time budget.
+
+        The regex module aborts a match call that exceeds its timeout. That page (or doc) then gets no matches, but
+        a timeout entry instead, so one pathological page can not stall the whole pipeline.
+
+        Args:
+            name: str, name of the question, used in the warning
+            pattern: compiled regex pattern
+            text: str
+            fTimeout: float, time budget in seconds, None for no budget
+            doc_id: str
+            i_page_number: int
+            bExists: bool, stop at the first match (pattern.search), which is also the first match of findall
+
+        Returns: tuple, (tuple of matches, tuple of timeouts for ResultMatch.tTimeouts)
+        """
+        try:
+            if not bExists:
+                return tuple(pattern.findall(text, timeout=fTimeout)), ()
+
+            match = pattern.search(text, timeout=fTimeout)
+            if match is None:
+                return (), ()
+            # the same form findall returns: the match, the only group, or a tuple of all groups
+            tGroups = match.groups("")
+            if not tGroups:
+                return (match.group(),), ()
+            return (tGroups[0] if len(tGroups) == 1 else tGroups,), ()
+        except TimeoutError:
+            print(
+                f"Warning - {name} exceeded its time budget of {fTimeout}s on: {doc_id}, page {i_page_number}"
+            )
+            return (), ((doc_id, i_page_number),)
+
+    def analyze_doc(self, doc, set_done=frozenset()):
+        """Function that runs all registered patterns over the doc in a single pass.
+
+        Args:
+            doc: spacy.Doc
+            set_done: set, questions that already have their result on the doc or do not run, these are left out
+
+        Returns: dict, question name -> ResultMatch
+        """
+        set_sampled = self.get_sampled_names(doc)
+        start = time.perf_counter()
+        list_names = [
+            name
+            for name in self.dict_patterns
+            if not self.is_skipped(name, doc, set_done)
+        ]
+        # doc.text is rebuilt from the tokens on every access, so only do it once
+        text = doc.text
+        # the same for every doc, unlike the questions that are done on this doc
+        scanner = self.get_scanner(
+            frozenset(self.dict_patterns).difference(
+                self.get_inactive_names().intersection(set_done)
+            )
+        )
+
+        list_page_texts, list_page_literals = None, None
+        if any(self.dict_loop_over_spans[name] for name in list_names):
+            list_page_starts, list_page_ends = get_page_offsets(doc)
+            list_page_texts = [
+                text[start:end] for start, end in zip(list_page_starts, list_page_ends)
+            ]
+            if scanner is not None:
+                list_page_literals = scanner.get_literals_per_page(
+                    text, list_page_starts, list_page_ends
+                )
+
+        set_doc_literals = None
+        if scanner is not None and not all(
+            self.dict_loop_over_spans[name] for name in list_names
+        ):
+            set_doc_literals = scanner.get_literals(text)
+        if set_sampled:
+            self.get_metrics().record(
+                time.perf_counter() - start, None, len(doc.spans.get("PAGES", ()))
+            )
+
+        dict_results = {}
+        for name in list_names:
+            pattern = self.dict_patterns[name]
+            if self.is_gated(name, doc, dict_results):
+                dict_results[name] = ResultMatch(False)
+                continue
+            bSampled = name in set_sampled
+            start = time.perf_counter()
+            fTimeout = self.dict_timeouts[name]
+            set_literals = self.dict_literals[name]
+            bExists = self.dict_exists.get(name, False)
+            if self.dict_loop_over_spans[name]:
+                list_page_matches, tTimeouts = [()] * len(list_page_texts), ()
+                list_page_numbers = []
+                for i_page_number in self.get_page_numbers(name, len(list_page_texts)):
+                    list_page_numbers.append(i_page_number)
+                    if bSampled:
+                        start_page = time.perf_counter()
+                    if set_literals and set_literals.isdisjoint(
+                        list_page_literals[i_page_number]
+                    ):
+                        # none of the keywords on this page, the pattern can not match
+                        if bSampled:
+                            self.record_page(name, time.perf_counter() - start_page)
+                        continue
+
+                    matches, tPage_timeouts = self.findall(
+                        name,
+                        pattern,
+                        list_page_texts[i_page_number],
+                        fTimeout,
+                        doc._.doc_id,
+                        i_page_number,
+                        bExists,
+                    )
+                    list_page_matches[i_page_number] = matches
+                    tTimeouts += tPage_timeouts
+                    if bSampled:
+                        self.record_page(name, time.perf_counter() - start_page)
+                    if bExists and matches:
+                        break
+                result = self.sum_page_results(
+                    list_page_matches, doc._.doc_id, list_page_numbers
+                )
+            elif set_literals and set_literals.isdisjoint(set_doc_literals):
+                result, tTimeouts = ResultMatch(False), ()
+            else:
+                matches, tTimeouts = self.findall(
+                    name, pattern, text, fTimeout, doc._.doc_id, None, bExists
+                )
+                result = self.to_result_match(matches, None, None)
+
+            if tTimeouts:
+                result = result + ResultMatch(False, tTimeouts=tTimeouts)
+            dict_results[name] = result
+            if bSampled:
+                i_pages = (
+                    len(list_page_numbers) if self.dict_loop_over_spans[name] else 1
+                )
+                self.record(name, time.perf_counter() - start, result, i_pages)
+        return dict_results
+
+
+class SpacyMatcherEngine(BaseSharedEngine):
+    """Matcher engine shared by all BaseSpacyMatcher components that are created on the same nlp object.
+
+    The patterns of all questions go into matchers that are built once and kept for every doc, each question under
+    its own name as key. They run once over the whole doc and the matches are split back out per question by key.
+    Per page questions get their matches assigned to pages with a binary search over the page token offsets; matches
+    that cross a page boundary are dropped, as the per page matcher would never find them.
+
+    A spacy Matcher tries every pattern at every token, so its cost grows with the number of patterns. Most
+    patterns are a literal sequence of tokens on one attribute though, e.g. [{"LEMMA": "betaal"}, {"LEMMA":
+    "termijn"}] or [{"LOWER": "betaaltermijn"}]. Questions with only such patterns go into a PhraseMatcher per
+    attribute, which looks the tokens of the doc up in a hash table: its cost hardly grows with the number of
+    questions. Questions with any other pattern (operators, sets of values, more attributes in one token) go into
+    one Matcher, whose cost does grow with their number.
+
+    example usage:
+
+    engine = SpacyMatcherEngine.get_engine(nlp)
+    engine.register("q27", [[{"LEMMA": "betaal"}, {"LEMMA": "termijn"}]])
+    result = engine.get_result(doc, "q27")  # ResultMatch
+    """
+
+    USER_DATA_KEY = "pynder_matcher_engine"
+
+    # label of the match spans, identical to the key of the matcher of a single BaseSpacyMatcher
+    MATCH_LABEL = "key"
+
+    # token attributes a PhraseMatcher can match a literal pattern on -> the Token attribute with the string value
+    DICT_PHRASE_ATTRS = {
+        "ORTH": "orth_",
+        "TEXT": "orth_",
+        "LOWER": "lower_",
+        "NORM": "norm_",
+        "LEMMA": "lemma_",
+    }
+
+    def __init__(self, nlp):
+        self.vocab = nlp.vocab
+        self.dict_patterns = {}
+        self.dict_phrases = {}
+        self.dict_loop_over_spans = {}
+        self.dict_annotations = {}
+        self._dict_matchers = {}
+        super().__init__(nlp)
+
+    def register(
+        self, name, list_patterns, bLoopOverSpans: bool = True, page_scope=None
+    ):
+        """Function that adds the token patterns of a question to the engine.
+
+        Args:
+            name: str, name of the pipeline component (the question)
+            list_patterns: list, spacy Matcher patterns
+            bLoopOverSpans: bool, analyze per page (True) or the doc as a whole (False)
+            page_scope: PageScope, the pages to analyze, None for all pages
+        """
+        self.dict_patterns[name] = list_patterns
+        list_phrases = [self.get_phrase(pattern) for pattern in list_patterns]
+        # the matches of a question come from one kind of matcher only, so they keep the order of the spacy Matcher
+        self.dict_phrases[name] = None if None in list_phrases else list_phrases
+        self.dict_loop_over_spans[name] = bLoopOverSpans
+        self.dict_page_scopes[name] = page_scope
+        self.dict_annotations[name] = {
+            key.upper()
+            for pattern in list_patterns
+            for spec in pattern
+            for key in spec
+            # set by the model, e.g. the spacy Matcher refuses to match on LEMMA when the doc is not lemmatized
+            if key.upper() in DICT_ANNOTATION_COMPONENTS
+        }
+        self._dict_matchers = {}  # rebuilt on the next doc
+
+    def get_phrase(self, pattern):
+        """Function that returns the pattern as a phrase for a PhraseMatcher, if that finds the same matches.
+
+        That is a pattern of plain string values on one and the same attribute, e.g. [{"LOWER": "betaal"}, {"LOWER":
+        "termijn"}]. The phrase is a doc whose tokens have exactly these values, so e.g. {"LOWER": "Factuur"}, which
+        the Matcher never matches, is left to the Matcher.
+
+        Args:
+            pattern: list, spacy Matcher pattern
+
+        Returns: tuple, (attribute, doc), or None
+        """
+        str_attr, list_values = None, []
+        for spec in pattern:
+            if len(spec) != 1:
+                return None
+            ((key, value),) = spec.items()
+            key = "ORTH" if key.upper() == "TEXT" else key.upper()
+            if key not in self.DICT_PHRASE_ATTRS or not isinstance(value, str):
+                return None
+            if not value or str_attr not in (None, key):
+                return None
+            str_attr = key
+            list_values.append(value)
+        if not list_values:
+            return None
+
+        doc = Doc(
+            self.vocab,
+            words=list_values,
+            lemmas=list_values if str_attr == "LEMMA" else None,
+        )
+        str_token_attr = self.DICT_PHRASE_ATTRS[str_attr]
+        if [getattr(token, str_token_attr) for token in doc] != list_values:
+            return None
+        return str_attr, doc
+
+    def get_matchers(self, set_names):
+        """Function that returns the matchers with the patterns of the questions, built on first use.
+
+        Args:
+            set_names: frozenset, questions to match
+
+        Returns: tuple, (Matcher or None, dict attribute -> PhraseMatcher)
+        """
+        if set_names not in self._dict_matchers:
+            matcher = None
+            dict_phrase_matchers = {}
+            # in registration order, the order of the patterns within a key decides the order of its matches
+            for name in self.dict_patterns:
+                if name not in set_names:
+                    continue
+                if self.dict_phrases[name] is None:
+                    if matcher is None:
+                        matcher = Matcher(self.vocab)
+                    matcher.add(name, self.dict_patterns[name])
+                    continue
+                dict_docs = {}
+                for str_attr, doc in self.dict_phrases[name]:
+                    dict_docs.setdefault(str_attr, []).append(doc)
+                for str_attr, list_docs in dict_docs.items():
+                    if str_attr not in dict_phrase_matchers:
+                        dict_phrase_matchers[str_attr] = PhraseMatcher(
+                            self.vocab, attr=str_attr
+                        )
+                    dict_phrase_matchers[str_attr].add(name, list_docs)
+            self._dict_matchers[set_names] = (matcher, dict_phrase_matchers)
+        return self._dict_matchers[set_names]
+
+    def find_matches(self, doc, set_names):
+        """Function that runs the matchers once over the doc and returns the matches of every question.
+
+        Args:
+            doc: spacy.Doc
+            set_names: set, questions to match
+
+        Returns: dict, question name -> list of (start, end), in the order of a spacy Matcher
+        """
+        # the same for every doc of a pipeline, unlike the questions that are done on this doc
+        set_inactive = self.get_inactive_names()
+        set_matched = frozenset(
+            name
+            for name in self.dict_patterns
+            if name in set_names or name not in set_inactive
+            if all(doc.has_annotation(attr) for attr in self.dict_annotations[name])
+        )
+        matcher, dict_phrase_matchers = self.get_matchers(set_matched)
+
+        dict_matches = {name: [] for name in set_names}
+        if matcher is not None:
+            for match_id, start, end in matcher(doc):
+                name = self.vocab.strings[match_id]
+                if name in dict_matches:
+                    dict_matches[name].append((start, end))
+
+        set_phrase_names = set()
+        for phrase_matcher in dict_phrase_matchers.values():
+            for match_id, start, end in phrase_matcher(doc):
+                name = self.vocab.strings[match_id]
+                if name in dict_matches:
+                    dict_matches[name].append((start, end))
+                    set_phrase_names.add(name)
+        for name in set_phrase_names:
+            # the Matcher returns a match once, ordered by its end and then its start
+            dict_matches[name] = sorted(
+                set(dict_matches[name]), key=lambda match: (match[1], match[0])
+            )
+        return dict_matches
+
+    def get_result(self, doc, name):
+        """Function that returns the ResultMatch of one question, see BaseSharedEngine.get_result.
+
+        Raises a ValueError when the doc lacks an annotation the patterns of the question use, like the spacy
+        Matcher of a single BaseSpacyMatcher does.
+        """
+        set_missing = {
+            attr for attr in self.dict_annotations[name] if not doc.has_annotation(attr)
+        }
+        if set_missing:
+            raise ValueError(
+                f"{name}: the pipeline does not set {', '.join(sorted(set_missing))}, "
+                f"which the Matcher patterns of this question use"
+            )
+        return super().get_result(doc, name)
+
+    def analyze_doc(self, doc, set_done=frozenset()):
+        """Function that runs the matchers once over the doc and splits the matches per question.
+
+        Args:
+            doc: spacy.Doc
+            set_done: set, questions that already have their result on the doc or do not run, these are left out
+
+        Returns: dict, question name -> ResultMatch
+        """
+        set_sampled = self.get_sampled_names(doc)
+        start = time.perf_counter()
+        dict_results = {}
+        set_names = set()
+        for name, set_annotations in self.dict_annotations.items():
+            if self.is_skipped(name, doc, set_done) or not all(
+                doc.has_annotation(attr) for attr in set_annotations
+            ):
+                continue
+            # the matchers run once for all questions, so only the gates of earlier components are known
+            if self.is_gated(name, doc, {}):
+                dict_results[name] = ResultMatch(False)
+            else:
+                set_names.add(name)
+        dict_matches = self.find_matches(doc, set_names)
+
+        list_page_starts, list_page_ends = None, None
+        if any(self.dict_loop_over_spans[name] for name in set_names):
+            list_page_starts, list_page_ends = get_page_offsets(doc, bCharOffsets=False)
+        if set_sampled:
+            self.get_metrics().record(
+                time.perf_counter() - start, None, len(doc.spans.get("PAGES", ()))
+            )
+
+        for name, list_matches in dict_matches.items():
+            start = time.perf_counter()
+            list_matches = [
+                (start, end, Span(doc, start, end, label=self.MATCH_LABEL))
+                for start, end in list_matches
+            ]
+            if self.dict_loop_over_spans[name]:
+                list_page_matches, _ = bucket_matches(
+                    list_matches, list_page_starts, list_page_ends
+                )
+                list_page_numbers = self.get_page_numbers(name, len(list_page_matches))
+                dict_results[name] = self.sum_page_results(
+                    list_page_matches, doc._.doc_id, list_page_numbers
+                )
+                i_pages = len(list_page_numbers)
+            else:
+                i_pages = 1
+                dict_results[name] = self.to_result_match(
+                    [span for _, _, span in list_matches], None, None
+                )
+            if self.dict_exists.get(name, False):
+                dict_results[name] = first_match(dict_results[name])
+            if name in set_sampled:
+                self.record(
+                    name,
+                    time.perf_counter() - start,
+                    dict_results[name],
+                    i_pages,
+                )
+        return dict_results
+
+
+class NormalizedCounterEngine(BaseSharedEngine):
+    """Counter engine shared by all BaseNormalizedCounter components that are created on the same nlp object.
+
+    The words of every page (and of the doc as a whole, if a question needs it) are counted once per doc into a
+    sparse pages x vocabulary matrix. The normalized count of a question is then a sum over the columns of its
+    words, instead of another split and count of the text per question.
+
+    example usage:
+
+    engine = NormalizedCounterEngine.get_engine(nlp)
+    engine.register("q12", ["boete", "schadevergoeding"], 0.001)
+    result = engine.get_result(doc, "q12")  # ResultMatch
+    """
+
+    USER_DATA_KEY = "pynder_counter_engine"
+
+    def __init__(self, nlp):
+        self.dict_words = {}
+        self.dict_thresholds = {}
+        self.dict_loop_over_spans = {}
+        super().__init__(nlp)
+
+    def register(
+        self,
+        name,
+        list_words_of_interest,
+        iThreshold,
+        bLoopOverSpans: bool = True,
+        page_scope=None,
+    ):
+        """Function that adds the words of interest of a question to the engine.
+
+        Args:
+            name: str, name of the pipeline component (the question)
+            list_words_of_interest: list
+            iThreshold: float, the normalized count has to exceed this
+            bLoopOverSpans: bool, analyze per page (True) or the doc as a whole (False)
+            page_scope: PageScope, the pages to analyze, None for all pages
+        """
+        self.dict_words[name] = list_words_of_interest
+        self.dict_thresholds[name] = iThreshold
+        self.dict_loop_over_spans[name] = bLoopOverSpans
+        self.dict_page_scopes[name] = page_scope
+
+    def analyze_doc(self, doc, set_done=frozenset()):
+        """Function that counts the words of the doc once and scores all registered questions on those counts.
+
+        Args:
+            doc: spacy.Doc
+            set_done: set, questions that already have their result on the doc or do not run, these are left out
+
+        Returns: dict, question name -> ResultMatch
+        """
+        set_sampled = self.get_sampled_names(doc)
+        start = time.perf_counter()
+        # doc.text is rebuilt from the tokens on every access, so only do it once
+        text = doc.text
+        list_names = [
+            name for name in self.dict_words if not self.is_skipped(name, doc, set_done)
+        ]
+        list_texts = []
+        dict_page_numbers = {}
+        if any(self.dict_loop_over_spans[name] for name in list_names):
+            pages = doc.spans["PAGES"]
+            dict_page_numbers = {
+                name: self.get_page_numbers(name, len(pages))
+                for name in list_names
+                if self.dict_loop_over_spans[name]
+            }
+            # only count the pages that are in scope of at least one question
+            set_pages = set().union(*dict_page_numbers.values())
+            list_texts = [
+                text[span.start_char : span.end_char] if i in set_pages else ""
+                for i, span in enumerate(pages)
+            ]
+        i_doc_row = len(list_texts)
+        if not all(self.dict_loop_over_spans[name] for name in list_names):
+            list_texts.append(text)
+
+        dict_vocab, matrix_counts, arr_lengths = calc_term_counts(list_texts)
+        if set_sampled:
+            self.get_metrics().record(
+                time.perf_counter() - start, None, len(doc.spans.get("PAGES", ()))
+            )
+
+        dict_results = {}
+        for name in list_names:
+            if self.is_gated(name, doc, dict_results):
+                dict_results[name] = ResultMatch(False)
+                continue
+            start = time.perf_counter()
+            list_words = self.dict_words[name]
+            # words can be listed more than once, each occurence then counts that many times
+            list_columns = [dict_vocab[w] for w in list_words if w in dict_vocab]
+            # empty pages (and pages out of scope) score 0
+            arr_counts = np.asarray(matrix_counts[:, list_columns].sum(axis=1)).ravel()
+            arr_scores = arr_counts / np.maximum(arr_lengths, 1)
+            iThreshold = self.dict_thresholds[name]
+
+            if self.dict_loop_over_spans[name]:
+                dict_results[name] = self.sum_page_results(
+                    [
+                        [page_text[:100]] if score > iThreshold else []
+                        for page_text, score in zip(list_texts, arr_scores)
+                    ],
+                    doc._.doc_id,
+                    dict_page_numbers[name],
+                )
+            else:
+                dict_results[name] = self.to_result_match(
+                    [text[:100]] if arr_scores[i_doc_row] > iThreshold else [],
+                    None,
+                    None,
+                )
+            if self.dict_exists.get(name, False):
+                dict_results[name] = first_match(dict_results[name])
+            if name in set_sampled:
+                self.record(
+                    name,
+                    time.perf_counter() - start,
+                    dict_results[name],
+                    len(dict_page_numbers[name])
+                    if self.dict_loop_over_spans[name]
+                    else 1,
+                )
+        return dict_results
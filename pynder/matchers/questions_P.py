@@ -64,7 +64,10 @@ class Question13(BaseRegex):
 @Dutch.factory("q17")
 class Question17(BaseRegex):
     def __init__(self, nlp: Language, name: str):
-        super().__init__(nlp, name, [r".{200}onbepaalde\s{1,10}tijd.{200}"])
+        # backtracks badly on long OCR'd pages
+        super().__init__(
+            nlp, name, [r".{200}onbepaalde\s{1,10}tijd.{200}"], fTimeout=1.0
+        )
 
 
 @Dutch.factory("q20")
@@ -94,14 +97,16 @@ class Question27(BaseSpacyMatcher):
     We found that A and B worked but C didn't! Mind blown!
     """
 
+    # class attribute, so the annotations it needs are known before the spacy model is loaded
+    list_patterns = [
+        [{"LEMMA": "betaal"}, {"LEMMA": "termijn"}],
+        [{"LEMMA": "betaal"}, {"LEMMA": "afspraken"}],
+        [{"LOWER": "betaaltermijn"}],
+        [{"LEMMA": "facturering"}],
+    ]
+
     def __init__(self, nlp: Language, name: str):
-        list_patterns = [
-            [{"LEMMA": "betaal"}, {"LEMMA": "termijn"}],
-            [{"LEMMA": "betaal"}, {"LEMMA": "afspraken"}],
-            [{"LOWER": "betaaltermijn"}],
-            [{"LEMMA": "facturering"}],
-        ]
-        super().__init__(nlp, name, list_patterns)
+        super().__init__(nlp, name, self.list_patterns)
 
 
 @Dutch.factory("q28")
@@ -111,15 +116,16 @@ class Question28(BaseSpacyMatcher):
     We found that A and B worked but C didn't! Mind blown!
     """
 
+    list_patterns = [
+        [{"LEMMA": "factuur"}, {"LEMMA": "afspraken"}],
+        [{"LEMMA": "factuur"}, {"LEMMA": "voorwaarden"}],
+        [{"LOWER": "factureringsvoorwaarden"}],
+        [{"LOWER": "facturering"}],
+        [{"LOWER": "betaling"}],
+    ]
+
     def __init__(self, nlp: Language, name: str):
-        list_patterns = [
-            [{"LEMMA": "factuur"}, {"LEMMA": "afspraken"}],
-            [{"LEMMA": "factuur"}, {"LEMMA": "voorwaarden"}],
-            [{"LOWER": "factureringsvoorwaarden"}],
-            [{"LOWER": "facturering"}],
-            [{"LOWER": "betaling"}],
-        ]
-        super().__init__(nlp, name, list_patterns)
+        super().__init__(nlp, name, self.list_patterns)
 
 
 @Dutch.factory("q31")
@@ -166,4 +172,7 @@ class Question51(BaseRegex):
     """
 
     def __init__(self, nlp: Language, name: str):
-        super().__init__(nlp, name, [r".{50}bivc.{1,20}?\d.*?\d.*?\d.*?\d?.{50}"])
+        # backtracks badly on long OCR'd pages
+        super().__init__(
+            nlp, name, [r".{50}bivc.{1,20}?\d.*?\d.*?\d.*?\d?.{50}"], fTimeout=1.0
+        )
@@ -0,0 +1,212 @@
+# standard library
+from collections.abc import Mapping
+import glob
+import importlib
+import json
+import os
+import re
+
+# every question is a class decorated with a spacy factory, e.g. @Dutch.factory("q8") followed by class Question8
+FACTORY_PATTERN = re.compile(
+    r"""^@\w+\.factory\(\s*["']([^"']+)["'][^\n]*\n(?:@[^\n]*\n)*class\s+(\w+)""",
+    re.MULTILINE,
+)
+
+
+def scan_questions(folder, str_glob: str = "questions_*.py"):
+    """Function that finds all questions in the question modules and definition files of folder, without importing.
+
+    Args:
+        folder: str, folder of the package with the question modules
+        str_glob: str, file name pattern of the question modules, the definition files have the .json extension
+
+    Returns: dict, question name -> (module name without package, class name), (file name, None) for definitions
+    """
+    dict_questions = {}
+    for path in sorted(glob.glob(os.path.join(folder, str_glob))):
+        module = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            for name, class_name in FACTORY_PATTERN.findall(f.read()):
+                dict_questions[name] = (module, class_name)
+
+    str_glob_definitions = os.path.splitext(str_glob)[0] + ".json"
+    for path in sorted(glob.glob(os.path.join(folder, str_glob_definitions))):
+        with open(path, encoding="utf-8") as f:
+            for name in json.load(f)["questions"]:
+                dict_questions[name] = (os.path.basename(path), None)
+    return dict_questions
+
+
+def get_entry_points(folder, package: str = "pynder.matchers"):
+    """Function that returns the spacy_factories entry points of all questions, used by setup.py.
+
+    With these installed, spacy resolves nlp.add_pipe("q8") itself and only imports the module of q8.
+
+    Args:
+        folder: str, folder of the package with the question modules
+        package: str
+
+    Returns: list, e.g. ["q8 = pynder.matchers.questions_P:Question8", ...]
+    """
+    return [
+        f"{name} = {package}.{module}:{class_name}"
+        for name, (module, class_name) in scan_questions(folder).items()
+        if class_name is not None
+    ]
+
+
+class QuestionRegistry(Mapping):
+    """Class that maps question names on their matcher class, importing a question module only when it is needed.
+
+    Importing a question module registers the spacy factory of every question in it. With hundreds or thousands
+    of questions that dominates the startup of a worker, while a worker often only needs some of them. The registry
+    finds the questions by scanning the source of the question modules instead.
+
+    Questions defined as data (questions_*.json, see pynder.matchers.definitions) are found as well, those are
+    compiled into their component when they are added to a pipeline.
+
+    example usage:
+
+    registry = QuestionRegistry("pynder.matchers", folder)
+    registry.add_pipe(nlp, "q8")  # imports questions_P, then nlp.add_pipe("q8")
+    registry["q8"]  # Question8
+    """
+
+    def __init__(self, package, folder, str_glob: str = "questions_*.py"):
+        self.package = package
+        self.folder = folder
+        self.str_glob = str_glob
+        self._dict_questions = None
+
+    @property
+    def dict_questions(self):
+        if self._dict_questions is None:
+            self._dict_questions = scan_questions(self.folder, self.str_glob)
+        return self._dict_questions
+
+    def __getitem__(self, str_question):
+        module, class_name = self.dict_questions[str_question]
+        if class_name is None:
+            definitions = self.import_module("definitions")
+            return definitions.DICT_TYPES[self.get_definition(str_question)["type"]][0]
+        return getattr(self.import_module(module), class_name)
+
+    def __iter__(self):
+        return iter(self.dict_questions)
+
+    def __len__(self):
+        return len(self.dict_questions)
+
+    def import_module(self, module):
+        return importlib.import_module(f"{self.package}.{module}")
+
+    def get_definition(self, str_question):
+        """Function that returns the definition of a question that is defined as data."""
+        definitions = self.import_module("definitions")
+        path = os.path.join(self.folder, self.dict_questions[str_question][0])
+        return definitions.load_definitions(path)[str_question]
+
+    def get_gates(self, str_question):
+        """Function that returns the names of the questions that gate a question, see BasePipelineComponent.
+
+        Args:
+            str_question: str
+
+        Returns: list
+        """
+        if self.dict_questions[str_question][1] is None:
+            return list(self.get_definition(str_question).get("gates", []))
+        return list(getattr(self[str_question], "list_gates", ()))
+
+    def get_annotations(self, str_question, lang: str = "nl"):
+        """Function that returns the token annotations a question needs from the spacy model, before it is loaded.
+
+        Taken from the definition or the question class where possible, see BasePipelineComponent
+        get_class_annotations. Otherwise the question is created once on a blank model of lang to ask it.
+
+        Args:
+            str_question: str
+            lang: str, language of the blank model
+
+        Returns: set, e.g. {"LEMMA"}
+        """
+        from pynder.utils.model_loading import get_pattern_annotations
+
+        if self.dict_questions[str_question][1] is None:
+            definition = self.get_definition(str_question)
+            if definition["type"] != "matcher":
+                return set()
+            return get_pattern_annotations(definition["patterns"])
+
+        question_class = self[str_question]
+        set_annotations = question_class.get_class_annotations()
+        if set_annotations is None:
+            import spacy
+
+            question = question_class(spacy.blank(lang), str_question)
+            set_annotations = question.get_required_annotations()
+        return set_annotations
+
+    def ensure_factory(self, str_question):
+        """Function that registers the spacy factory of the question, by importing its module if that did not happen.
+
+        Args:
+            str_question: str
+        """
+        if str_question not in self.dict_questions:
+            return
+        module, class_name = self.dict_questions[str_question]
+        self.import_module("definitions" if class_name is None else module)
+
+    def add_pipe(self, nlp, str_question, **kwargs):
+        """Function that adds the question to the pipeline, nlp.add_pipe with the factory resolved on demand.
+
+        Args:
+            nlp: spacy.Language
+            str_question: str
+            kwargs: passed on to nlp.add_pipe
+
+        Returns: the pipeline component
+        """
+        self.ensure_factory(str_question)
+        if str_question in self.dict_questions and (
+            self.dict_questions[str_question][1] is None
+        ):
+            # the definition goes into the config, so the pipeline can be saved and loaded like any other
+            kwargs.setdefault("name", str_question)
+            kwargs["config"] = {
+                "definition": self.get_definition(str_question),
+                **kwargs.get("config", {}),
+            }
+            return nlp.add_pipe("pynder_question", **kwargs)
+        return nlp.add_pipe(str_question, **kwargs)
+
+    def get_module_attribute(self, name):
+        """Function that returns a class or question list of one of the question modules, importing only that one.
+
+        Args:
+            name: str, e.g. "Question8" or "__all_init_P_questions__"
+
+        Returns: the attribute
+
+        Raises: AttributeError if no question module defines it
+        """
+        match = re.fullmatch(r"__all_init_(\w+)_questions__", name)
+        if match and os.path.exists(
+            os.path.join(self.folder, f"questions_{match.group(1)}.py")
+        ):
+            return getattr(self.import_module(f"questions_{match.group(1)}"), name)
+        if match and os.path.exists(
+            os.path.join(self.folder, f"questions_{match.group(1)}.json")
+        ):
+            str_file = f"questions_{match.group(1)}.json"
+            return [
+                str_question
+                for str_question, (module, _) in self.dict_questions.items()
+                if module == str_file
+            ]
+
+        for module, class_name in self.dict_questions.values():
+            if class_name == name:
+                return getattr(self.import_module(module), name)
+        raise AttributeError(f"module {self.package} has no attribute {name}")
@@ -0,0 +1,239 @@
+# standard library
+from dataclasses import replace
+from functools import partial
+from itertools import islice
+import multiprocessing
+import os
+
+# non-standard library
+import pandas as pd
+from spacy.tokens import Doc, Span
+
+# custom code
+from pynder.custom_pipeline_components import CustomTokenizerWrapper
+from pynder.enums import ResultMatch
+from pynder.matchers import add_questions, get_question_annotations
+from pynder.utils.model_loading import get_required_annotations, load_model
+
+# one pipeline per worker process, built once by init_worker
+_nlp = None
+
+
+def get_paths_from_metadata(path_df_sql, folder_text, str_language: str = "nld"):
+    """Function that returns the text paths of all docs in the metadata csv (df_sql.csv), of one language.
+
+    Args:
+        path_df_sql: str
+        folder_text: str, folder with a sub folder of text files per contract
+        str_language: str, None for all languages
+
+    Returns: list, folder_text/<contract_id>/<file_uuid>.txt
+    """
+    df_meta = pd.read_csv(path_df_sql, sep=";")
+    if str_language is not None:
+        df_meta = df_meta.loc[df_meta.loc[:, "language"] == str_language]
+    return [
+        os.path.join(folder_text, str(contract_id), f"{file_uuid}.txt")
+        for contract_id, file_uuid in zip(df_meta["contract_id"], df_meta["file_uuid"])
+    ]
+
+
+def add_pipeline(
+    nlp, folder_span, list_questions, tokenizer_kwargs=None, path_store=None
+):
+    """Function that adds the path tokenizer, the page spans and the questions to a loaded spacy model."""
+    tokenizer_kwargs = tokenizer_kwargs or {}
+    if path_store is not None:
+        tokenizer_kwargs = {"path_corpus": path_store, **tokenizer_kwargs}
+    nlp.tokenizer = CustomTokenizerWrapper(nlp.tokenizer, **tokenizer_kwargs)
+    if path_store is not None:
+        nlp.add_pipe("load_page_spans", first=True, config={"store": path_store})
+    elif folder_span is not None:
+        nlp.add_pipe("load_page_spans", first=True, config={"basepath": folder_span})
+    add_questions(nlp, list_questions)
+    return nlp
+
+
+def build_pipeline(
+    model: str = "nl_core_news_lg",
+    folder_span: str = None,
+    list_questions=None,
+    bPruneModel: bool = True,
+    tokenizer_kwargs: dict = None,
+    path_store: str = None,
+):
+    """Function that builds the pynder pipeline as in notebooks/1_run_analysis.py, reading the docs from their path.
+
+    With bPruneModel only the components of the model that the questions need are loaded and run: none at all when
+    all questions are regex, tfidf or counter questions, see pynder.utils.model_loading. The annotations the
+    questions need (e.g. LEMMA for a LEMMA pattern) are taken from their classes and definitions before the model
+    is loaded, so the model is loaded and the pipeline built once.
+
+    Args:
+        model: str, spacy model
+        folder_span: str, folder with the page spans (load_page_spans), None if the docs have no pages
+        list_questions: list, None for __all_init_P_questions__
+        bPruneModel: bool, False to load and run the whole model
+        tokenizer_kwargs: dict, passed on to CustomTokenizerWrapper, e.g. {"path_corpus": "corpus.zip", "i_prefetch": 16}
+        path_store: str, corpus store (pynder.utils.corpus_store) to read the texts and page spans from, instead of
+            the text files and folder_span
+
+    Returns: spacy.Language
+    """
+    if list_questions is None:
+        # imported here, importing the runner should not import every question module
+        from pynder.matchers import __all_init_P_questions__
+
+        list_questions = __all_init_P_questions__
+
+    Doc.set_extension("_dict_results", default={}, force=True)
+    Doc.set_extension("doc_id", default="", force=True)
+    Doc.set_extension("contract_id", default="", force=True)
+
+    if not bPruneModel:
+        return add_pipeline(
+            load_model(model), folder_span, list_questions, tokenizer_kwargs, path_store
+        )
+
+    set_annotations = get_question_annotations(list_questions)
+    nlp = add_pipeline(
+        load_model(model, set_annotations),
+        folder_span,
+        list_questions,
+        tokenizer_kwargs,
+        path_store,
+    )
+    set_missing = get_required_annotations(nlp) - set_annotations
+    if set_missing:
+        # a question asked for less than it needs, only the created questions know for sure
+        print(
+            f"Warning - the questions need {', '.join(sorted(set_missing))} as well, loading {model} again"
+        )
+        nlp = add_pipeline(
+            load_model(model, set_annotations | set_missing),
+            folder_span,
+            list_questions,
+            tokenizer_kwargs,
+            path_store,
+        )
+    return nlp
+
+
+def to_plain_matches(matches):
+    """Function that replaces the spans in (nested tuples/lists of) matches by their text, so they can be pickled."""
+    if isinstance(matches, Span):
+        return matches.text
+    if isinstance(matches, (tuple, list)):
+        return type(matches)(to_plain_matches(match) for match in matches)
+    return matches
+
+
+def get_doc_output(doc):
+    """Function that returns what a worker sends back of a doc: (contract id, doc id, question -> ResultMatch)."""
+    dict_results = {}
+    for question, result in doc._._dict_results.items():
+        if isinstance(result, ResultMatch):
+            result = replace(result, tMatches=to_plain_matches(result.tMatches))
+        dict_results[question] = result
+    return doc._.contract_id, doc._.doc_id, dict_results
+
+
+def init_worker(build_nlp, kwargs):
+    """Function that builds the pipeline of a worker process, once, when the worker starts."""
+    global _nlp
+    _nlp = build_nlp(**kwargs)
+
+
+def analyze_shard(list_paths, batch_size: int = 32):
+    """Function that runs the pipeline of the worker over a shard of paths.
+
+    If the shard fails as a whole (e.g. a missing file), its docs are analyzed one by one and the failing ones are
+    left out. The contracts that bExistsPerContract questions marked as answered during the failed run are forgotten
+    first, otherwise the retry would skip the docs that answered them.
+
+    Args:
+        list_paths: list
+        batch_size: int, passed on to nlp.pipe
+
+    Returns: list of (contract id, doc id, question -> ResultMatch)
+    """
+    dict_answered = {
+        name: dict(proc.dict_answered_contracts)
+        for name, proc in _nlp.pipeline
+        if hasattr(proc, "dict_answered_contracts")
+    }
+    try:
+        prefetch = getattr(_nlp.tokenizer, "prefetch", iter)
+        return [
+            get_doc_output(doc)
+            for doc in _nlp.pipe(prefetch(list_paths), batch_size=batch_size)
+        ]
+    except Exception:
+        for name, dict_answered_contracts in dict_answered.items():
+            _nlp.get_pipe(name).dict_answered_contracts = dict_answered_contracts
+        list_output = []
+        for path in list_paths:
+            try:
+                list_output.append(get_doc_output(_nlp(path)))
+            except Exception as e:
+                print(f"Warning - could not analyze {path}: {e}")
+        return list_output
+
+
+def iter_shards(list_paths, i_shard_size):
+    """Function that cuts the paths into lists of i_shard_size paths, lazily so list_paths may be a generator."""
+    iter_paths = iter(list_paths)
+    while True:
+        shard = list(islice(iter_paths, i_shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def run_corpus(
+    list_paths,
+    build_nlp=build_pipeline,
+    build_kwargs: dict = None,
+    i_workers: int = None,
+    i_shard_size: int = 64,
+    batch_size: int = 32,
+    bOrdered: bool = False,
+    str_start_method: str = None,
+):
+    """Function that analyzes a corpus with a fixed pool of long-lived workers and streams the results back.
+
+    Every worker builds the pipeline once (the model load is what makes n_process in nlp.pipe so expensive for a
+    few docs) and then keeps pulling shards of i_shard_size paths until the corpus is done. Only the paths go to
+    the workers and only the results come back, not the docs.
+
+    example usage:
+
+    list_paths = get_paths_from_metadata(path_df_sql, folder_text)
+    exporter = ResultExporter()
+    for contract_id, doc_id, dict_results in run_corpus(list_paths, build_kwargs={"folder_span": folder_span}):
+        for question, result in dict_results.items():
+            exporter.add_result(question, result, contract_id, doc_id)
+
+    Args:
+        list_paths: iterable of paths (or texts, depending on the pipeline)
+        build_nlp: function that returns the pipeline, module level so the workers can import it
+        build_kwargs: dict, passed on to build_nlp
+        i_workers: int, number of worker processes, None for one per cpu
+        i_shard_size: int, number of paths per task, small enough to keep all workers busy until the end
+        batch_size: int, passed on to nlp.pipe
+        bOrdered: bool, yield the docs in the order of list_paths instead of as soon as their shard is done
+        str_start_method: str, multiprocessing start method, None for the default of the platform
+
+    Returns: generator of (contract id, doc id, question -> ResultMatch), matcher spans replaced by their text
+    """
+    i_workers = i_workers or os.cpu_count() or 1
+    context = multiprocessing.get_context(str_start_method)
+    with context.Pool(
+        i_workers, initializer=init_worker, initargs=(build_nlp, build_kwargs or {})
+    ) as pool:
+        imap = pool.imap if bOrdered else pool.imap_unordered
+        for list_output in imap(
+            partial(analyze_shard, batch_size=batch_size),
+            iter_shards(list_paths, i_shard_size),
+        ):
+            yield from list_output
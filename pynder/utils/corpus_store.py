@@ -0,0 +1,294 @@
+# standard library
+from bisect import bisect_left
+import os
+import zlib
+
+# non-standard library
+import numpy as np
+
+FILE_CHUNKS = "chunks.bin"  # the compressed text chunks, one per page
+FILE_KEYS = "keys.bin"  # the <contract_id>/<doc_id> keys, utf-8 encoded and sorted, see KeyIndex
+
+# columns of the arrays
+KEYS_COLUMNS = ("byte_start", "byte_end", "row")  # row in docs.npy
+DOCS_COLUMNS = ("first_chunk", "n_chunks", "first_page", "n_pages")
+CHUNKS_COLUMNS = ("byte_start", "byte_end", "start_char")
+PAGES_COLUMNS = ("start", "end", "start_char", "end_char")
+
+PAGE_LABEL = "PAGES"
+
+
+def get_key(contract_id, doc_id):
+    return f"{contract_id}/{doc_id}"
+
+
+def load_bytes(path):
+    """Function that memory maps a file as an array of bytes, an empty file can not be memory mapped."""
+    if not os.path.getsize(path):
+        return np.zeros(0, dtype=np.uint8)
+    return np.asarray(np.memmap(path, dtype=np.uint8, mode="r"))
+
+
+class KeyIndex:
+    """Class that finds the row of a doc among the sorted keys of a corpus store, with a binary search.
+
+    The keys stay in the memory mapped keys.bin, so opening a store with millions of docs reads no index into
+    memory, and a lookup reads about log2(number of docs) keys. It is a sequence of the keys (as bytes) for bisect.
+
+    example usage:
+
+    index = KeyIndex(arr_keys, arr_key_bytes)
+    index.find("1001/doc0")  # row in docs.npy, None if the doc is not in the store
+    """
+
+    def __init__(self, arr_keys, arr_key_bytes):
+        self.arr_keys = arr_keys
+        self.arr_key_bytes = arr_key_bytes
+
+    def __len__(self):
+        return len(self.arr_keys)
+
+    def __getitem__(self, i_key):
+        byte_start, byte_end, _ = self.arr_keys[i_key].tolist()
+        return self.arr_key_bytes[byte_start:byte_end].tobytes()
+
+    def find(self, key):
+        """Function that returns the row in docs.npy of the key, None if it is not in the store."""
+        bytes_key = key.encode("utf-8")
+        i_key = bisect_left(self, bytes_key)
+        if i_key < len(self) and self[i_key] == bytes_key:
+            return int(self.arr_keys[i_key, 2])
+        return None
+
+
+class CorpusStoreWriter:
+    """Class that writes the texts and page spans of many docs into one corpus store, see CorpusStore.
+
+    The text of a doc is cut at the first character of every page and every piece is compressed on its own, so a
+    single page can be read without the rest of the doc. The texts are written as they come, only the (small)
+    offsets are kept in memory until close.
+
+    example usage:
+
+    with CorpusStoreWriter("corpus_store") as writer:
+        writer.add(contract_id, doc_id, text, spans)  # spans as saved by extract_file
+    """
+
+    def __init__(self, path, i_level: int = 6):
+        self.path = path
+        self.i_level = i_level
+        os.makedirs(path, exist_ok=True)
+        self.file_chunks = open(os.path.join(path, FILE_CHUNKS), "wb")
+        self.i_bytes = 0
+        self.list_docs = []
+        self.list_chunks = []
+        self.list_pages = []
+        self.dict_index = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, contract_id, doc_id, text, spans):
+        """Function that adds a doc to the store, a doc that is added twice is replaced (in the index).
+
+        Args:
+            contract_id: str
+            doc_id: str
+            text: str
+            spans: list, {"start", "end", "start_char", "end_char"} per page, see get_spans_from_doc
+        """
+        list_starts = [0] + [span["start_char"] for span in spans[1:]]
+        self.dict_index[get_key(contract_id, doc_id)] = len(self.list_docs)
+        self.list_docs.append(
+            (len(self.list_chunks), len(list_starts), len(self.list_pages), len(spans))
+        )
+        for start_char, end_char in zip(list_starts, list_starts[1:] + [len(text)]):
+            chunk = zlib.compress(
+                text[start_char:end_char].encode("utf-8"), self.i_level
+            )
+            self.file_chunks.write(chunk)
+            self.list_chunks.append(
+                (self.i_bytes, self.i_bytes + len(chunk), start_char)
+            )
+            self.i_bytes += len(chunk)
+        self.list_pages.extend(
+            (span["start"], span["end"], span["start_char"], span["end_char"])
+            for span in spans
+        )
+
+    def close(self):
+        """Function that writes the offsets and the sorted keys, the store can only be read after close."""
+        if self.file_chunks.closed:
+            return
+        self.file_chunks.close()
+
+        list_keys, i_bytes = [], 0
+        with open(os.path.join(self.path, FILE_KEYS), "wb") as f:
+            # sorted on the utf-8 bytes, the order KeyIndex compares them in
+            for bytes_key, i_row in sorted(
+                (key.encode("utf-8"), i_row) for key, i_row in self.dict_index.items()
+            ):
+                f.write(bytes_key)
+                list_keys.append((i_bytes, i_bytes + len(bytes_key), i_row))
+                i_bytes += len(bytes_key)
+
+        for name, list_rows, columns in [
+            ("keys", list_keys, KEYS_COLUMNS),
+            ("docs", self.list_docs, DOCS_COLUMNS),
+            ("chunks", self.list_chunks, CHUNKS_COLUMNS),
+            ("pages", self.list_pages, PAGES_COLUMNS),
+        ]:
+            np.save(
+                os.path.join(self.path, f"{name}.npy"),
+                np.array(list_rows, dtype=np.int64).reshape(-1, len(columns)),
+            )
+
+
+class CorpusStore:
+    """Class that reads the texts and page spans of docs from one corpus store instead of a file per doc.
+
+    The store is a folder with the compressed texts (chunks.bin), the sorted keys of the docs (keys.bin) and numpy
+    arrays with the offsets of the keys, the docs, their text chunks and their pages. All of them are memory
+    mapped, so a doc is found with a binary search over the keys (see KeyIndex), getting the spans of a doc is a
+    slice of an array and a page is read (and decompressed) without reading the rest of its doc. Get one per store
+    with CorpusStore.get(path), see load_page_spans and CustomTokenizerWrapper for the pipeline.
+
+    example usage:
+
+    store = CorpusStore.get("corpus_store")
+    store.get_text(contract_id, doc_id)
+    store.get_page_text(contract_id, doc_id, 0)
+    store.get_spans(contract_id, doc_id)  # [{"start", "end", "label", "start_char", "end_char"}]
+    """
+
+    # path -> CorpusStore, one per store and process
+    _dict_stores = {}
+
+    def __init__(self, path):
+        self.path = path
+        # plain ndarray views of the memory maps, slicing a np.memmap costs more than reading the slice
+        arr_keys, self.arr_docs, self.arr_chunks, self.arr_pages = (
+            np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+            for name in ("keys", "docs", "chunks", "pages")
+        )
+        self.index = KeyIndex(arr_keys, load_bytes(os.path.join(path, FILE_KEYS)))
+        self.arr_bytes = load_bytes(os.path.join(path, FILE_CHUNKS))
+
+    @classmethod
+    def get(cls, path):
+        """Function that returns the CorpusStore of the folder, opening it on first use."""
+        key = (os.path.abspath(path), os.getpid())
+        if key not in cls._dict_stores:
+            cls._dict_stores[key] = cls(path)
+        return cls._dict_stores[key]
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return self.index.find(get_key(*key)) is not None
+
+    def get_row(self, contract_id, doc_id):
+        """Function that returns the (first_chunk, n_chunks, first_page, n_pages) of a doc."""
+        key = get_key(contract_id, doc_id)
+        i_row = self.index.find(key)
+        if i_row is None:
+            raise KeyError(f"{key} is not in the corpus store {self.path}")
+        return self.arr_docs[i_row].tolist()
+
+    def read_chunk(self, i_chunk):
+        byte_start, byte_end, _ = self.arr_chunks[i_chunk].tolist()
+        return zlib.decompress(self.arr_bytes[byte_start:byte_end].tobytes()).decode(
+            "utf-8"
+        )
+
+    def get_text(self, contract_id, doc_id):
+        """Function that returns the text of a doc."""
+        first_chunk, n_chunks, _, _ = self.get_row(contract_id, doc_id)
+        return "".join(
+            self.read_chunk(i_chunk)
+            for i_chunk in range(first_chunk, first_chunk + n_chunks)
+        )
+
+    def get_page_text(self, contract_id, doc_id, i_page):
+        """Function that returns the text of one page of a doc, from its own chunk.
+
+        Args:
+            contract_id: str
+            doc_id: str
+            i_page: int, page number (0 based)
+
+        Returns: str
+        """
+        first_chunk, _, first_page, n_pages = self.get_row(contract_id, doc_id)
+        if not 0 <= i_page < n_pages:
+            raise IndexError(f"{contract_id}/{doc_id} has {n_pages} pages")
+        _, _, start_char, end_char = self.arr_pages[first_page + i_page].tolist()
+        chunk_start_char = int(self.arr_chunks[first_chunk + i_page, 2])
+        return self.read_chunk(first_chunk + i_page)[
+            start_char - chunk_start_char : end_char - chunk_start_char
+        ]
+
+    def get_page_offsets(self, contract_id, doc_id):
+        """Function that returns the token offsets of the pages of a doc: a list of [start, end]."""
+        _, _, first_page, n_pages = self.get_row(contract_id, doc_id)
+        return self.arr_pages[first_page : first_page + n_pages, :2].tolist()
+
+    def get_spans(self, contract_id, doc_id):
+        """Function that returns the page spans of a doc in the list(dict) form of get_spans_from_doc."""
+        _, _, first_page, n_pages = self.get_row(contract_id, doc_id)
+        return [
+            dict(
+                start=start,
+                end=end,
+                label=PAGE_LABEL,
+                start_char=start_char,
+                end_char=end_char,
+            )
+            for start, end, start_char, end_char in self.arr_pages[
+                first_page : first_page + n_pages
+            ].tolist()
+        ]
+
+
+def build_corpus_store(list_paths, folder_span, path_store, tokenizer):
+    """Function that converts the text files and page pickles of extract_file into a corpus store.
+
+    The pickles have the token offsets of the pages only, the character offsets are found by tokenizing the text
+    with the tokenizer of the model that made them.
+
+    Args:
+        list_paths: list of paths of text files, <folder>/<contract_id>/<doc_id>.txt
+        folder_span: str, folder with <contract_id>/<doc_id>.pickle
+        path_store: str, folder of the new corpus store
+        tokenizer: e.g. spacy.load("nl_core_news_lg").tokenizer
+
+    Returns: int, the number of docs in the store
+    """
+    # text_parsers imports the pdf and ocr libraries
+    from pynder.utils.text_parsing.text_parsers import load_bare_spans_from_file
+
+    with CorpusStoreWriter(path_store) as writer:
+        for _path in list_paths:
+            folder, file_name = os.path.split(os.path.splitext(_path)[0])
+            contract_id, doc_id = os.path.basename(folder), file_name
+            with open(_path, "r") as f:
+                text = f.read()
+            spans = load_bare_spans_from_file(
+                os.path.join(folder_span, contract_id, doc_id + ".pickle")
+            )
+            if spans and "start_char" not in spans[0]:
+                doc = tokenizer(text)
+                spans = [
+                    dict(
+                        span,
+                        start_char=doc[span["start"] : span["end"]].start_char,
+                        end_char=doc[span["start"] : span["end"]].end_char,
+                    )
+                    for span in spans
+                ]
+            writer.add(contract_id, doc_id, text, spans)
+        return len(writer.dict_index)
@@ -0,0 +1,150 @@
+# standard library
+from itertools import repeat
+import os
+
+# non-standard library
+import pandas as pd
+from spacy.tokens import Span
+
+LIST_COLUMNS = ["question", "contract_id", "doc_id", "page_nr", "match"]
+
+
+def match_to_str(match):
+    """Function that turns a single match of any of the Base* matchers into a string.
+
+    Args:
+        match: Span (BaseSpacyMatcher), str, or tuple of groups (BaseRegex with more than one group)
+
+    Returns: str
+    """
+    if isinstance(match, str):
+        return match
+    if isinstance(match, Span):
+        return match.text
+    if isinstance(match, tuple):
+        return " | ".join(match)
+    return str(match)
+
+
+class ResultExporter:
+    """Class that collects the results of many docs in columns, one row per match, and turns them into DataFrames.
+
+    The columns are filled with list.extend per page, instead of building a dict per row. question, contract_id and
+    doc_id repeat a lot, so they become categorical columns. Questions without a result give no rows.
+
+    example usage:
+
+    exporter = ResultExporter()
+    for doc in nlp.pipe(texts):
+        exporter.add_doc(doc)
+    df = exporter.to_frame()  # question, contract_id, doc_id, page_nr, match
+    """
+
+    def __init__(self):
+        self.dict_columns = {column: [] for column in LIST_COLUMNS}
+        self.i_docs = 0
+
+    def __len__(self):
+        return len(self.dict_columns["match"])
+
+    def add_doc(self, doc):
+        """Function that adds the ResultMatch of every question in doc._._dict_results."""
+        self.i_docs += 1
+        for question, result in doc._._dict_results.items():
+            self.add_result(question, result, doc._.contract_id, doc._.doc_id)
+
+    def add_result(self, question, result, contract_id, doc_id):
+        """Function that adds the matches of one ResultMatch.
+
+        Args:
+            question: str
+            result: ResultMatch (or 0, the sum of a doc without pages)
+            contract_id: str
+            doc_id: str, used when the ResultMatch has no doc id itself (questions that analyze the doc as a whole)
+        """
+        if not result or not result.bResult:
+            return
+
+        list_matches = self.dict_columns["match"]
+        list_page_nr = self.dict_columns["page_nr"]
+        list_doc_ids = self.dict_columns["doc_id"]
+        i_start = len(list_matches)
+        for page_matches, i_page_nr, result_doc_id in zip(
+            result.tMatches, result.tPage_nr, result.tDocIds
+        ):
+            # BaseTFIDF returns the best matching text itself, the other matchers a collection of matches
+            if isinstance(page_matches, str):
+                page_matches = (page_matches,)
+            i_rows = len(list_matches)
+            list_matches.extend(map(match_to_str, page_matches))
+            i_rows = len(list_matches) - i_rows
+            list_page_nr.extend(repeat(i_page_nr, i_rows))
+            list_doc_ids.extend(
+                repeat(doc_id if result_doc_id is None else result_doc_id, i_rows)
+            )
+
+        i_rows = len(list_matches) - i_start
+        self.dict_columns["question"].extend(repeat(question, i_rows))
+        self.dict_columns["contract_id"].extend(repeat(contract_id, i_rows))
+
+    def to_frame(self, bClear: bool = True):
+        """Function that returns the collected rows as a DataFrame.
+
+        Args:
+            bClear: bool, empty the exporter afterwards, so it can collect the next batch
+
+        Returns: pandas.DataFrame
+        """
+        df = pd.DataFrame(
+            {
+                "question": pd.Categorical(self.dict_columns["question"]),
+                "contract_id": pd.Categorical(
+                    [str(i) for i in self.dict_columns["contract_id"]]
+                ),
+                "doc_id": pd.Categorical([str(i) for i in self.dict_columns["doc_id"]]),
+                "page_nr": pd.array(self.dict_columns["page_nr"], dtype="Int64"),
+                "match": pd.array(self.dict_columns["match"], dtype="string"),
+            },
+            columns=LIST_COLUMNS,
+        )
+        if bClear:
+            self.__init__()
+        return df
+
+
+def export_results(docs, folder, str_format: str = "parquet", i_batch_docs=100000):
+    """Function that exports the results of all docs to folder, as one parquet or feather file per batch of docs.
+
+    Only one batch is kept in memory, so the docs can come straight out of nlp.pipe. The folder can be read back at
+    once with pd.read_parquet(folder) (parquet only, feather files are read one by one).
+
+    Args:
+        docs: iterable of spacy.Doc
+        folder: str
+        str_format: str, "parquet" or "feather", both need pyarrow
+        i_batch_docs: int, number of docs per file
+
+    Returns: list, paths of the written files
+    """
+    assert str_format in ("parquet", "feather"), f"unknown format: {str_format}"
+    os.makedirs(folder, exist_ok=True)
+
+    list_paths = []
+
+    def write_batch(exporter):
+        path = os.path.join(folder, f"part-{len(list_paths):05d}.{str_format}")
+        df = exporter.to_frame()
+        if str_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_feather(path)
+        list_paths.append(path)
+
+    exporter = ResultExporter()
+    for doc in docs:
+        exporter.add_doc(doc)
+        if exporter.i_docs >= i_batch_docs:
+            write_batch(exporter)
+    if exporter.i_docs:
+        write_batch(exporter)
+    return list_paths
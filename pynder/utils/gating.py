@@ -0,0 +1,73 @@
+# custom code
+from pynder.enums import ResultMatch
+
+
+def is_gate_closed(result):
+    """Function that returns True if the result of a gate question closes the gate of the questions behind it.
+
+    A gate is open when its question found a match on the doc. A gate without a result on the doc (the question
+    is not in the pipeline, failed, or skipped the doc for its contract) is left open, so nothing is skipped on an
+    unknown.
+
+    Args:
+        result: ResultMatch, 0 (doc without pages) or None (no result)
+
+    Returns: bool
+    """
+    if result is None:
+        return False
+    return not (isinstance(result, ResultMatch) and result.bResult)
+
+
+def sort_by_gates(dict_gates):
+    """Function that orders questions so that every question comes after the questions that gate it.
+
+    The order of dict_gates is kept as much as possible. Gates that are not in dict_gates are ignored.
+
+    Args:
+        dict_gates: dict, question name -> list of gate question names
+
+    Returns: list of question names
+
+    Raises: ValueError if the gates form a cycle
+    """
+    list_order = []
+    set_done = set()
+    set_visiting = set()
+
+    def visit(name):
+        if name in set_done:
+            return
+        if name in set_visiting:
+            raise ValueError(f"the gates of {name} depend on {name} itself")
+        set_visiting.add(name)
+        for gate in dict_gates[name]:
+            if gate in dict_gates:
+                visit(gate)
+        set_visiting.discard(name)
+        set_done.add(name)
+        list_order.append(name)
+
+    for name in dict_gates:
+        visit(name)
+    return list_order
+
+
+def get_skipped_work(nlp):
+    """Function that returns how much work the gates saved per question in the pipeline of nlp.
+
+    Args:
+        nlp: spacy.Language
+
+    Returns: dict, question name -> {"docs": skipped docs, "pages": skipped pages}, plus the "total" over all
+    """
+    dict_skipped = {
+        name: {"docs": proc.i_gated_docs, "pages": proc.i_gated_pages}
+        for name, proc in nlp.pipeline
+        if getattr(proc, "list_gates", None)
+    }
+    dict_skipped["total"] = {
+        key: sum(dict_counts[key] for dict_counts in dict_skipped.values())
+        for key in ("docs", "pages")
+    }
+    return dict_skipped
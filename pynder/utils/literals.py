@@ -0,0 +1,129 @@
+# standard library
+from bisect import bisect_right
+
+try:
+    from re import _parser as sre_parse  # python >= 3.11
+except ImportError:
+    import sre_parse
+
+# non-standard library
+import regex as re
+
+# inline flags that do not change which literals a pattern requires, the stdlib parser rejects them mid-pattern
+INLINE_FLAGS = re.compile(r"\(\?[aLmsu]+\)")
+
+# constructs of the regex module the stdlib parser would read as plain literals, e.g. the fuzzy match "exit{e<=1}"
+UNSUPPORTED = re.compile(r"\(\?[a-zA-Z]*[ixV]|\{[^\d,}]|\[:")
+
+REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+REPEATS.add(getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT))
+GROUPS = {sre_parse.SUBPATTERN}
+GROUPS.add(getattr(sre_parse, "ATOMIC_GROUP", sre_parse.SUBPATTERN))
+
+
+def get_required_literals(pattern):
+    """Function that returns literals of which at least one occurs in every match of the pattern.
+
+    E.g. r".{100}opzegtermijn.{100}" gives ["opzegtermijn"] and r"exit.{1,5}plan|dossiernummer\\ *\\d*" gives
+    ["exit", "dossiernummer"]. A text without any of these literals can not contain a match, so the pattern does not
+    have to run on it. Patterns that can match without a literal, that ignore case or use syntax only the regex
+    module knows give None: those always have to run.
+
+    Args:
+        pattern: compiled regex pattern (regex module) or str
+
+    Returns: list or None
+    """
+    if not isinstance(pattern, str):
+        if pattern.flags & (re.IGNORECASE | re.VERBOSE | re.VERSION1):
+            return None
+        pattern = pattern.pattern
+
+    if UNSUPPORTED.search(pattern):
+        return None
+    try:
+        parsed = sre_parse.parse(INLINE_FLAGS.sub("", pattern))
+    except Exception:
+        return None
+
+    set_literals = _get_required_literals(list(parsed))
+    return sorted(set_literals) if set_literals else None
+
+
+def _get_required_literals(list_items):
+    """Helper function that returns the most selective set of required literals of a parsed sequence, or None."""
+    list_candidates = []
+    list_run = []
+    for op, av in list_items + [(None, None)]:
+        if op == sre_parse.LITERAL:
+            list_run.append(chr(av))
+            continue
+
+        if list_run:
+            list_candidates.append({"".join(list_run)})
+            list_run = []
+
+        if op in GROUPS:
+            list_candidates.append(_get_required_literals(list(av[-1])))
+        elif op in REPEATS and av[0] >= 1:
+            list_candidates.append(_get_required_literals(list(av[2])))
+        elif op == sre_parse.BRANCH:
+            list_branches = [_get_required_literals(list(p)) for p in av[1]]
+            if all(list_branches):
+                list_candidates.append(set().union(*list_branches))
+
+    list_candidates = [c for c in list_candidates if c]
+    if not list_candidates:
+        return None
+
+    # the longer the shortest literal, the fewer texts contain one
+    return max(list_candidates, key=lambda c: (min(map(len, c)), -len(c)))
+
+
+class LiteralScanner:
+    """Class that finds which literals occur on which page of a text.
+
+    Every literal is looked up with str.find, which skips through the text at C speed. Once a literal is found on a
+    page the search continues at the start of the next page, so a frequent literal costs at most one hit per page.
+
+    example usage:
+
+    scanner = LiteralScanner(["exit", "plan", "opzegtermijn"])
+    scanner.get_literals_per_page(text, list_page_starts, list_page_ends)  # [{"exit", "plan"}, set(), ...]
+    """
+
+    def __init__(self, list_literals):
+        self.list_literals = sorted(set(list_literals))
+
+    def get_literals(self, text):
+        """Function that returns the set of literals that occur in the text."""
+        return {lit for lit in self.list_literals if lit in text}
+
+    def get_literals_per_page(self, text, list_page_starts, list_page_ends):
+        """Function that returns the set of literals that occur within every page of the text.
+
+        Args:
+            text: str
+            list_page_starts: list, sorted character offsets where the pages start
+            list_page_ends: list, character offsets where the pages end
+
+        Returns: list of sets
+        """
+        list_pages = [set() for _ in list_page_starts]
+        if not list_page_starts:
+            return list_pages
+
+        i_text_start, i_text_end = list_page_starts[0], list_page_ends[-1]
+        for lit in self.list_literals:
+            start = text.find(lit, i_text_start, i_text_end)
+            while start != -1:
+                i_page = bisect_right(list_page_starts, start) - 1
+                if start + len(lit) <= list_page_ends[i_page]:
+                    list_pages[i_page].add(lit)
+                    if i_page + 1 == len(list_page_starts):
+                        break
+                    start = text.find(lit, list_page_starts[i_page + 1], i_text_end)
+                else:
+                    # crosses the end of the page, try again from the next position
+                    start = text.find(lit, start + 1, i_text_end)
+        return list_pages
@@ -0,0 +1,158 @@
+# standard library
+from collections import Counter
+import json
+import math
+import random
+
+# custom code
+from pynder.enums import ResultMatch
+
+# doc.user_data key of the draw that decides whether the metrics of a doc are recorded, see is_sampled
+USER_DATA_KEY = "pynder_metrics_draw"
+
+# upper bounds of the latency buckets in seconds: 1us, 2us, 4us, ... up to ~1 hour
+LIST_BUCKET_BOUNDS = [2**i / 1e6 for i in range(32)]
+
+
+class Histogram:
+    """Class that counts values in exponential buckets, so millions of values take a few dozen counters.
+
+    example usage:
+
+    histogram = Histogram()
+    histogram.add(0.0031)
+    histogram.get_quantile(0.99)  # 0.004096, the upper bound of the bucket the 99th percentile falls in
+    """
+
+    def __init__(self):
+        self.dict_counts = Counter()
+        self.i_count = 0
+        self.f_sum = 0.0
+
+    def add(self, value, i_weight: int = 1):
+        """Function that adds a value i_weight times."""
+        i_bucket = min(
+            max(math.ceil(math.log2(value * 1e6)), 0) if value > 0 else 0,
+            len(LIST_BUCKET_BOUNDS) - 1,
+        )
+        self.dict_counts[i_bucket] += i_weight
+        self.i_count += i_weight
+        self.f_sum += value * i_weight
+
+    def get_quantile(self, f_quantile):
+        """Function that returns the upper bound of the bucket the quantile falls in, None if there are no values."""
+        i_seen = 0
+        for i_bucket in sorted(self.dict_counts):
+            i_seen += self.dict_counts[i_bucket]
+            if i_seen >= f_quantile * self.i_count:
+                return LIST_BUCKET_BOUNDS[i_bucket]
+        return None
+
+    def to_dict(self):
+        return {
+            "count": self.i_count,
+            "mean": self.f_sum / self.i_count if self.i_count else None,
+            "p50": self.get_quantile(0.5),
+            "p90": self.get_quantile(0.9),
+            "p99": self.get_quantile(0.99),
+            "buckets": {
+                f"<={LIST_BUCKET_BOUNDS[i_bucket]:g}s": i_count
+                for i_bucket, i_count in sorted(self.dict_counts.items())
+            },
+        }
+
+
+class ComponentMetrics:
+    """Class that aggregates the latency and output of one pipeline component over a run.
+
+    seconds_per_doc holds the time of the component per doc. seconds_per_page holds the time of every page that is
+    analyzed on its own, so it stays empty for a component that matches a doc as a whole.
+    """
+
+    def __init__(self):
+        self.i_docs = 0
+        self.i_pages = 0
+        self.i_matches = 0
+        self.i_results = 0
+        self.histogram_doc = Histogram()
+        self.histogram_page = Histogram()
+
+    def record(self, f_seconds, result, i_pages: int = 1, i_docs: int = 1):
+        """Function that records the analysis of i_docs docs with i_pages pages in total, which took f_seconds.
+
+        The time per page is not derived from this, see record_page.
+
+        Args:
+            f_seconds: float, wall time
+            result: ResultMatch or list of ResultMatch, one per doc, None for work that has no result of its own
+            i_pages: int
+            i_docs: int
+        """
+        list_results = result if isinstance(result, list) else [result]
+        self.i_docs += i_docs
+        self.i_pages += i_pages
+        for result in list_results:
+            if isinstance(result, ResultMatch) and result.bResult:
+                self.i_results += 1
+                self.i_matches += sum(len(matches) for matches in result.tMatches)
+
+        self.histogram_doc.add(f_seconds / i_docs, i_docs)
+
+    def record_page(self, f_seconds):
+        """Function that records the analysis of a single page, which took f_seconds."""
+        self.histogram_page.add(f_seconds)
+
+    def to_dict(self):
+        return {
+            "docs": self.i_docs,
+            "pages": self.i_pages,
+            "docs_with_result": self.i_results,
+            "matches": self.i_matches,
+            "seconds_per_doc": self.histogram_doc.to_dict(),
+            "seconds_per_page": self.histogram_page.to_dict(),
+        }
+
+
+def is_sampled(doc, f_sample_rate):
+    """Function that returns True if the metrics of the doc are recorded at the sample rate.
+
+    The draw is made once per doc, so all components with the same sample rate record the same docs. A shared engine
+    relies on that: it times the questions whose component records the doc.
+
+    Args:
+        doc: spacy.Doc
+        f_sample_rate: float, None when metrics are switched off
+
+    Returns: bool
+    """
+    if f_sample_rate is None:
+        return False
+    f_draw = doc.user_data.get(USER_DATA_KEY)
+    if f_draw is None:
+        f_draw = doc.user_data[USER_DATA_KEY] = random.random()
+    return f_draw < f_sample_rate
+
+
+def dump_metrics(nlp, path=None):
+    """Function that collects the metrics of all instrumented components in the pipeline of nlp.
+
+    The work a shared engine does once per doc for all its questions (e.g. the single Matcher run) is listed under
+    the name of the engine, e.g. "RegexEngine (shared)". The questions of the engine only get their own work.
+
+    Args:
+        nlp: spacy.Language
+        path: str, optional json file to write the metrics to
+
+    Returns: dict, component name -> metrics
+    """
+    dict_metrics = {}
+    for name, proc in nlp.pipeline:
+        if getattr(proc, "metrics", None) is not None:
+            dict_metrics[name] = proc.metrics.to_dict()
+        engine = getattr(proc, "engine", None)
+        if getattr(engine, "metrics", None) is not None:
+            dict_metrics[f"{type(engine).__name__} (shared)"] = engine.metrics.to_dict()
+    if path is not None:
+        with open(path, "w") as f:
+            json.dump(dict_metrics, f, indent=2)
+    return dict_metrics
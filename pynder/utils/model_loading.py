@@ -0,0 +1,163 @@
+# standard library
+from pathlib import Path
+
+# non-standard library
+import spacy
+
+# token annotations a question can depend on -> the components of a spacy model that may set (or feed) them. The
+# names are those of the spacy core models, e.g. nl_core_news_lg. Annotations that are not in here (ORTH, LOWER,
+# SHAPE, ...) are set by the tokenizer.
+DICT_ANNOTATION_COMPONENTS = {
+    "TAG": ("tok2vec", "tagger", "attribute_ruler"),
+    "POS": ("tok2vec", "morphologizer", "tagger", "attribute_ruler"),
+    "MORPH": ("tok2vec", "morphologizer", "attribute_ruler"),
+    "LEMMA": (
+        "tok2vec",
+        "morphologizer",
+        "tagger",
+        "attribute_ruler",
+        "lemmatizer",
+        "trainable_lemmatizer",
+    ),
+    "DEP": ("tok2vec", "parser"),
+    "HEAD": ("tok2vec", "parser"),
+    "SENT_START": ("tok2vec", "parser", "senter"),
+    "IS_SENT_START": ("tok2vec", "parser", "senter"),
+    "ENT_TYPE": ("tok2vec", "ner", "entity_ruler"),
+    "ENT_IOB": ("tok2vec", "ner", "entity_ruler"),
+    "ENT_ID": ("tok2vec", "ner", "entity_ruler"),
+}
+
+SET_MODEL_COMPONENTS = {
+    name for tuple_names in DICT_ANNOTATION_COMPONENTS.values() for name in tuple_names
+}
+
+
+def get_pattern_annotations(list_patterns):
+    """Function that returns the token annotations spacy Matcher patterns match on.
+
+    Args:
+        list_patterns: list, spacy Matcher patterns
+
+    Returns: set, e.g. {"LEMMA"}
+    """
+    return {
+        key.upper()
+        for pattern in list_patterns
+        for spec in pattern
+        for key in spec
+        if key.upper() in DICT_ANNOTATION_COMPONENTS
+    }
+
+
+def get_required_annotations(nlp):
+    """Function that returns the token annotations the questions in the pipeline of nlp depend on.
+
+    Args:
+        nlp: spacy.Language
+
+    Returns: set, e.g. {"LEMMA"}, empty if the questions only need the text and the tokens
+    """
+    return {
+        annotation
+        for _, proc in nlp.pipeline
+        if hasattr(proc, "get_required_annotations")
+        for annotation in proc.get_required_annotations()
+    }
+
+
+def get_component_names(model):
+    """Function that returns the names of all components of a spacy model, without loading the model.
+
+    Args:
+        model: str, name of an installed model package, path of a model, or "blank:<lang>"
+
+    Returns: list, empty for a blank model
+    """
+    if model.startswith("blank:"):
+        return []
+    path = Path(
+        spacy.util.get_package_path(model) if spacy.util.is_package(model) else model
+    )
+    return spacy.util.get_model_meta(path).get("components", [])
+
+
+def get_unneeded_components(list_names, set_annotations):
+    """Function that returns the model components in list_names that none of the annotations needs.
+
+    Args:
+        list_names: list, component names
+        set_annotations: set, see get_required_annotations
+
+    Returns: list
+    """
+    set_needed = set()
+    for annotation in set_annotations:
+        if annotation not in DICT_ANNOTATION_COMPONENTS:
+            print(f"Warning - unknown annotation {annotation}, all components are kept")
+            return []
+        set_needed.update(DICT_ANNOTATION_COMPONENTS[annotation])
+    return [name for name in list_names if name not in set_needed]
+
+
+def get_excluded_components(model, set_annotations):
+    """Function that returns the components of a model that none of the annotations needs.
+
+    Args:
+        model: str, see get_component_names
+        set_annotations: set, see get_required_annotations
+
+    Returns: list
+    """
+    return get_unneeded_components(get_component_names(model), set_annotations)
+
+
+def load_model(model, set_annotations=None):
+    """Function that loads a spacy model with only the components that set the annotations.
+
+    With an empty set_annotations only the tokenizer (and the vocab) is loaded: enough for the regex, counter and
+    tfidf questions, which look at the text of the pages only.
+
+    Args:
+        model: str, see get_component_names
+        set_annotations: set, see get_required_annotations, None for the whole model
+
+    Returns: spacy.Language
+    """
+    if set_annotations is None:
+        return spacy.load(model)
+    list_excluded = get_excluded_components(model, set_annotations)
+    if list_excluded:
+        print(f"Info - not loading {', '.join(list_excluded)} of {model}")
+    return spacy.load(model, exclude=list_excluded)
+
+
+def prune_pipeline(nlp):
+    """Function that disables the components of the spacy model that none of the questions in the pipeline needs.
+
+    Call it once all questions are added. Only the components of the model are considered (see
+    DICT_ANNOTATION_COMPONENTS), never the questions or e.g. load_page_spans. The components are disabled, not
+    removed: nlp.enable_pipe(name) brings one back, e.g. after adding a question that needs it.
+
+    example usage:
+
+    nlp = spacy.load("nl_core_news_lg")
+    add_questions(nlp, __all_init_P_questions__)
+    prune_pipeline(nlp)  # disables parser, ner; q27 and q28 need the lemmatizer
+
+    Args:
+        nlp: spacy.Language
+
+    Returns: list, the names of the disabled components
+    """
+    list_disabled = get_unneeded_components(
+        [name for name in nlp.pipe_names if name in SET_MODEL_COMPONENTS],
+        get_required_annotations(nlp),
+    )
+    for name in list_disabled:
+        nlp.disable_pipe(name)
+    if list_disabled:
+        print(
+            f"Info - disabled {', '.join(list_disabled)}, none of the questions needs them"
+        )
+    return list_disabled
@@ -1,4 +1,12 @@
 from collections import Counter
+import numpy as np
+import regex as re
+from scipy.sparse import csr_matrix
+
+from pynder.utils.page_bucketing import bucket_matches
+
+# every character str.split() splits on, so matches on doc.text line up with the words of text.split()
+WHITESPACE = r"\t\n\x0b\x0c\r\x1c-\x1f\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
 
 
 def calc_normalized_count(text, list_words_of_interest):
@@ -12,3 +20,98 @@ def calc_normalized_count(text, list_words_of_interest):
     """
     dict_count = Counter(text.split())
     return sum([dict_count[w] for w in list_words_of_interest]) / len(text)
+
+
+def calc_normalized_count_per_page(
+    text, list_page_starts, list_page_ends, list_words_of_interest
+):
+    """Function that returns calc_normalized_count for every page, while scanning the full text only once.
+
+    The words of interest are searched as whole words in the full text and counted on the page they start in.
+    Pages that are glued to the text around them (no whitespace at the page boundary) can split words differently
+    than the full text does, those pages are counted on their own.
+
+    Args:
+        text: str, doc.text
+        list_page_starts: list, character offsets where the pages start
+        list_page_ends: list, character offsets where the pages end
+        list_words_of_interest: list
+
+    Returns: list, normalized count per page
+    """
+    dict_weights = Counter(list_words_of_interest)
+    pattern = re.compile(
+        rf"(?<![^{WHITESPACE}])(?:"
+        + "|".join(re.escape(w) for w in sorted(dict_weights, key=len, reverse=True))
+        + rf")(?![^{WHITESPACE}])"
+    )
+
+    list_page_weights, _ = bucket_matches(
+        [
+            (match.start(), match.end(), dict_weights[match.group()])
+            for match in pattern.finditer(text)
+        ],
+        list_page_starts,
+        list_page_ends,
+    )
+
+    list_scores = []
+    for start, end, list_weights in zip(
+        list_page_starts, list_page_ends, list_page_weights
+    ):
+        if (start > 0 and not text[start - 1].isspace()) or (
+            end < len(text) and not text[end].isspace()
+        ):
+            list_scores.append(
+                calc_normalized_count(text[start:end], list_words_of_interest)
+            )
+        else:
+            list_scores.append(sum(list_weights) / (end - start))
+    return list_scores
+
+
+def calc_normalized_counts(list_texts, list_words_of_interest):
+    """Function that returns calc_normalized_count for every text in the list, with a single scan over all of them.
+
+    Args:
+        list_texts: list
+        list_words_of_interest: list
+
+    Returns: list, normalized count per text
+    """
+    # joining on a newline keeps every text separated by whitespace, so no text has to be recounted on its own
+    list_starts, list_ends = [], []
+    i_start = 0
+    for text in list_texts:
+        list_starts.append(i_start)
+        list_ends.append(i_start + len(text))
+        i_start += len(text) + 1
+    return calc_normalized_count_per_page(
+        "\n".join(list_texts), list_starts, list_ends, list_words_of_interest
+    )
+
+
+def calc_term_counts(list_texts):
+    """Function that counts the words (text.split()) of every text once, as a sparse texts x vocabulary matrix.
+
+    Args:
+        list_texts: list
+
+    Returns: tuple, (dict word -> column, scipy.sparse.csr_matrix with the counts, np.array with the text lengths)
+    """
+    dict_vocab = {}
+    list_indices, list_data, list_indptr = [], [], [0]
+    for text in list_texts:
+        dict_count = Counter(text.split())
+        list_indices.extend(
+            dict_vocab.setdefault(w, len(dict_vocab)) for w in dict_count
+        )
+        list_data.extend(dict_count.values())
+        list_indptr.append(len(list_indices))
+
+    matrix_counts = csr_matrix(
+        (list_data, list_indices, list_indptr),
+        shape=(len(list_texts), len(dict_vocab)),
+        dtype=np.int64,
+    )
+    return dict_vocab, matrix_counts, np.array([len(text) for text in list_texts])
@@ -0,0 +1,50 @@
+from bisect import bisect_left, bisect_right
+
+
+def get_page_offsets(doc, bCharOffsets: bool = True):
+    """Function that returns the start and end offsets of all pages in doc.spans["PAGES"].
+
+    Args:
+        doc: spacy.Doc
+        bCharOffsets: bool, character offsets (True) or token offsets (False)
+
+    Returns: tuple, (list of page starts, list of page ends)
+    """
+    pages = doc.spans["PAGES"]
+    if bCharOffsets:
+        return [span.start_char for span in pages], [span.end_char for span in pages]
+    return [span.start for span in pages], [span.end for span in pages]
+
+
+def bucket_matches(list_matches, list_page_starts, list_page_ends):
+    """Function that assigns doc level matches to their page with a binary search over the page start offsets.
+
+    A match is assigned to a page when it lies completely within that page. Matches that cross a page boundary (or
+    are empty and sit on the edge of a page) can not be assigned without changing the per page result, so the pages
+    they overlap are returned as touched. It is up to the caller to rescan those pages or to drop the match.
+
+    Args:
+        list_matches: list, tuples of (start, end, match), start and end in the same unit as the page offsets
+        list_page_starts: list, sorted start offsets of the pages
+        list_page_ends: list, end offsets of the pages
+
+    Returns: tuple, (list of lists with the matches per page, set of touched page indices)
+    """
+    list_buckets = [[] for _ in list_page_starts]
+    set_touched_pages = set()
+    for start, end, match in list_matches:
+        i_page = bisect_right(list_page_starts, start) - 1
+        if (
+            i_page >= 0
+            and end <= list_page_ends[i_page]
+            and (
+                start < end or list_page_starts[i_page] < start < list_page_ends[i_page]
+            )
+        ):
+            list_buckets[i_page].append(match)
+        else:
+            # pages are sorted and do not overlap, so the ends are sorted as well
+            i_first = bisect_left(list_page_ends, start)
+            i_last = bisect_right(list_page_starts, end) - 1
+            set_touched_pages.update(range(i_first, i_last + 1))
+    return list_buckets, set_touched_pages
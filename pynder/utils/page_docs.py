@@ -0,0 +1,35 @@
+# non-standard library
+from spacy.tokens import Span
+
+
+def make_doc(nlp, list_pages, doc_id="doc1", contract_id="", bPipeline: bool = True):
+    """Function that returns a doc of the pages joined by newlines, with a span per page in doc.spans["PAGES"].
+
+    The page spans are what load_page_spans puts on a doc. Whitespace at the end of a page is left out of its span.
+    The tests (through tests/conftest.py) and the benchmarks make their docs with it.
+
+    example usage:
+
+    doc = make_doc(spacy.blank("nl"), ["pagina een", "pagina twee"], doc_id="doc2", contract_id="c1")
+
+    Args:
+        nlp: spacy.Language
+        list_pages: list, the text of every page
+        doc_id: str
+        contract_id: str
+        bPipeline: bool, run the pipeline of nlp over the text, or only tokenize it (nlp.make_doc)
+
+    Returns: spacy.Doc
+    """
+    text = "\n".join(list_pages)
+    doc = nlp(text) if bPipeline else nlp.make_doc(text)
+    spans, i_start = [], 0
+    for page in list_pages:
+        span = doc.char_span(i_start, i_start + len(page.rstrip()))
+        spans.append(Span(doc, span.start, span.end, label="PAGES"))
+        i_start += len(page) + 1
+    doc.spans["PAGES"] = spans
+    doc._.doc_id = doc_id
+    doc._.contract_id = contract_id
+    doc._._dict_results = {}
+    return doc
@@ -0,0 +1,74 @@
+# standard library
+import hashlib
+
+
+class PageScope:
+    """Class that restricts a question to the pages it makes sense on, e.g. the parties clause on the first pages.
+
+    A page is in scope when it is one of the first i_first_pages, one of the last i_last_pages, or when
+    predicate(i_page_number, i_pages) is True. Without any restriction all pages are in scope. Pages out of scope
+    are not analyzed at all.
+
+    example usage:
+
+    PageScope(i_first_pages=3)  # parties clause
+    PageScope(i_last_pages=2)  # signatures
+    PageScope(predicate=lambda i_page_number, i_pages: i_page_number % 2 == 0)  # every other page
+    """
+
+    def __init__(
+        self, i_first_pages: int = None, i_last_pages: int = None, predicate=None
+    ):
+        self.i_first_pages = i_first_pages
+        self.i_last_pages = i_last_pages
+        self.predicate = predicate
+
+    @classmethod
+    def from_dict(cls, dict_scope):
+        """Function that creates the scope from its json form: {"first": 3} and/or {"last": 2}."""
+        return cls(
+            i_first_pages=dict_scope.get("first"), i_last_pages=dict_scope.get("last")
+        )
+
+    def to_dict(self):
+        """Function that returns the scope as a dict, the predicate as a hash of its code (see ResultCache)."""
+        predicate = None
+        if self.predicate is not None:
+            code = getattr(self.predicate, "__code__", None)
+            predicate = (
+                repr(self.predicate)
+                if code is None
+                else hashlib.sha1(
+                    code.co_code + repr((code.co_consts, code.co_names)).encode("utf-8")
+                ).hexdigest()
+            )
+        return {
+            "first": self.i_first_pages,
+            "last": self.i_last_pages,
+            "predicate": predicate,
+        }
+
+    def get_page_numbers(self, i_pages):
+        """Function that returns the sorted page numbers in scope of a doc with i_pages pages.
+
+        Args:
+            i_pages: int
+
+        Returns: list
+        """
+        if self.i_first_pages is None and self.i_last_pages is None:
+            if self.predicate is None:
+                return list(range(i_pages))
+            return [i for i in range(i_pages) if self.predicate(i, i_pages)]
+
+        set_pages = set(range(min(self.i_first_pages or 0, i_pages)))
+        set_pages.update(range(max(i_pages - (self.i_last_pages or 0), 0), i_pages))
+        if self.predicate is not None:
+            set_pages.update(i for i in range(i_pages) if self.predicate(i, i_pages))
+        return sorted(set_pages)
+
+    def __repr__(self):
+        return (
+            f"PageScope(i_first_pages={self.i_first_pages}, i_last_pages={self.i_last_pages}, "
+            f"predicate={self.predicate})"
+        )
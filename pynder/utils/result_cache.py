@@ -0,0 +1,267 @@
+# standard library
+from dataclasses import replace
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+
+# non-standard library
+import spacy
+from spacy.tokens import Span
+
+# custom code
+from pynder.enums import ResultMatch
+from pynder.version import __version__
+
+# doc.user_data key with the names of the questions whose result came from the cache
+USER_DATA_KEY = "pynder_cached"
+
+# doc.user_data key with the content hash of the doc, set by the cache reader
+USER_DATA_KEY_HASH = "pynder_doc_hash"
+
+# factories of the pynder components that prepare the doc or handle the cache, these set no token annotations
+TUPLE_NON_ANNOTATING_FACTORIES = (
+    "load_page_spans",
+    "pynder_cache_reader",
+    "pynder_cache_writer",
+)
+
+
+class CachedSpan:
+    """Class that stands in for a Span of a cached result, spans can only be pickled together with their doc."""
+
+    __slots__ = ("start_char", "end_char", "label")
+
+    def __init__(self, start_char, end_char, label):
+        self.start_char = start_char
+        self.end_char = end_char
+        self.label = label
+
+    def __getstate__(self):
+        return self.start_char, self.end_char, self.label
+
+    def __setstate__(self, state):
+        self.start_char, self.end_char, self.label = state
+
+
+def dump_matches(matches):
+    """Function that replaces the spans in (nested tuples/lists of) matches by a CachedSpan."""
+    if isinstance(matches, Span):
+        return CachedSpan(matches.start_char, matches.end_char, matches.label_)
+    if isinstance(matches, (tuple, list)):
+        return type(matches)(dump_matches(match) for match in matches)
+    return matches
+
+
+def load_matches(matches, doc):
+    """Function that turns the CachedSpans in (nested tuples/lists of) matches back into spans of doc."""
+    if isinstance(matches, CachedSpan):
+        return doc.char_span(matches.start_char, matches.end_char, label=matches.label)
+    if isinstance(matches, (tuple, list)):
+        return type(matches)(load_matches(match, doc) for match in matches)
+    return matches
+
+
+def get_doc_hash(doc):
+    """Function that returns the content hash of a doc: its text and where its pages start and end.
+
+    Args:
+        doc: spacy.Doc
+
+    Returns: str
+    """
+    sha1 = hashlib.sha1(doc.text.encode("utf-8"))
+    if "PAGES" in doc.spans:
+        sha1.update(
+            json.dumps(
+                [(span.start_char, span.end_char) for span in doc.spans["PAGES"]]
+            ).encode("utf-8")
+        )
+    return sha1.hexdigest()
+
+
+def get_model_fingerprint(nlp):
+    """Function that returns what determines the tokens and token annotations of the docs of nlp.
+
+    That is the language, the name and version of the spacy model, the spacy version and the components that run
+    before the questions and set annotations (e.g. the lemmatizer).
+
+    Args:
+        nlp: spacy.Language
+
+    Returns: dict
+    """
+    return {
+        "lang": nlp.lang,
+        "model": nlp.meta.get("name"),
+        "model_version": nlp.meta.get("version"),
+        "spacy": spacy.__version__,
+        "pipes": [
+            name
+            for name, proc in nlp.pipeline
+            if not hasattr(proc, "get_definition")
+            and nlp.get_pipe_meta(name).factory not in TUPLE_NON_ANNOTATING_FACTORIES
+        ],
+    }
+
+
+def get_definition_hashes(nlp):
+    """Function that returns the definition hash of every question in the pipeline of nlp.
+
+    The hash covers the definition of the question (see BasePipelineComponent.get_definition), the pynder version,
+    and the definition hashes of its gates, since the result of a gated question depends on those too. Questions
+    that match on tokens (bTokenLevel) also depend on the model, so their hash covers get_model_fingerprint as well.
+    The other questions only read the text of the doc and its pages, which the doc hash covers already.
+
+    Args:
+        nlp: spacy.Language
+
+    Returns: dict, question name -> hash
+    """
+    dict_definitions = {
+        name: proc.get_definition()
+        for name, proc in nlp.pipeline
+        if hasattr(proc, "get_definition")
+    }
+    set_token_level = {
+        name for name, proc in nlp.pipeline if getattr(proc, "bTokenLevel", False)
+    }
+    model_fingerprint = get_model_fingerprint(nlp) if set_token_level else None
+    dict_hashes = {}
+
+    def get_hash(name):
+        if name not in dict_hashes:
+            definition = dict_definitions[name]
+            dict_hashes[name] = hashlib.sha1(
+                json.dumps(
+                    {
+                        "version": __version__,
+                        "definition": definition,
+                        "gates": [
+                            get_hash(gate)
+                            for gate in definition.get("list_gates", ())
+                            if gate in dict_definitions
+                        ],
+                        "model": model_fingerprint if name in set_token_level else None,
+                    },
+                    sort_keys=True,
+                    default=repr,
+                ).encode("utf-8")
+            ).hexdigest()
+        return dict_hashes[name]
+
+    for name in dict_definitions:
+        get_hash(name)
+    return dict_hashes
+
+
+class ResultCache:
+    """Class that keeps the results of the questions per doc in a sqlite file, so a rerun only does what changed.
+
+    A result is stored under the content hash of the doc and the name of the question, together with the definition
+    hash of the question. On a rerun it is only used when both the doc and the definition are unchanged, a new
+    result replaces it. Docs are identified by their content, so renamed or copied docs are found as well: a copy
+    gets the result with its own doc id (see load_result).
+
+    The pipeline components pynder_cache_reader and pynder_cache_writer (pynder.custom_pipeline_components) use
+    this class, get one per file with ResultCache.get(path). The results are pickled, so only use cache files you
+    wrote yourself.
+
+    example usage:
+
+    cache = ResultCache.get("results.sqlite")
+    dict_blobs = cache.get_results(get_doc_hash(doc), get_definition_hashes(nlp))  # unchanged questions only
+    cache.load_result(dict_blobs["q8"], doc)  # ResultMatch
+    """
+
+    # path -> ResultCache, one connection per file and process
+    _dict_caches = {}
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=60)
+        # readers do not block the writer (e.g. with n_process > 1)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                doc_hash TEXT NOT NULL,
+                question TEXT NOT NULL,
+                definition_hash TEXT NOT NULL,
+                result BLOB NOT NULL,
+                PRIMARY KEY (doc_hash, question)
+            )"""
+        )
+        self.connection.commit()
+
+    @classmethod
+    def get(cls, path):
+        """Function that returns the ResultCache of the file, opening it on first use."""
+        key = (os.path.abspath(path), os.getpid())
+        if key not in cls._dict_caches:
+            cls._dict_caches[key] = cls(path)
+        return cls._dict_caches[key]
+
+    def get_results(self, doc_hash, dict_definition_hashes):
+        """Function that returns the cached results of the doc, for the questions whose definition did not change.
+
+        Args:
+            doc_hash: str
+            dict_definition_hashes: dict, question name -> definition hash
+
+        Returns: dict, question name -> pickled result (see load_result)
+        """
+        return {
+            question: result
+            for question, definition_hash, result in self.connection.execute(
+                "SELECT question, definition_hash, result FROM results WHERE doc_hash = ?",
+                (doc_hash,),
+            )
+            if dict_definition_hashes.get(question) == definition_hash
+        }
+
+    @staticmethod
+    def dump_result(result):
+        """Function that pickles a ResultMatch (or 0) for the cache."""
+        if isinstance(result, ResultMatch):
+            result = replace(result, tMatches=dump_matches(result.tMatches))
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load_result(blob, doc):
+        """Function that unpickles a cached result, with its spans and doc ids on doc.
+
+        The result may have been stored for another doc with the same content, so the doc ids in it are replaced by
+        the doc id of doc.
+        """
+        result = pickle.loads(blob)
+        if isinstance(result, ResultMatch):
+            doc_id = doc._.doc_id
+            result = replace(
+                result,
+                tMatches=load_matches(result.tMatches, doc),
+                tDocIds=tuple(
+                    None if cached_id is None else doc_id
+                    for cached_id in result.tDocIds
+                ),
+                tTimeouts=tuple(
+                    (doc_id, i_page_number) for _, i_page_number in result.tTimeouts
+                ),
+            )
+        return result
+
+    def put_results(self, list_rows):
+        """Function that stores results and commits them.
+
+        Args:
+            list_rows: list of (doc hash, question name, definition hash, pickled result)
+        """
+        if not list_rows:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", list_rows
+            )
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
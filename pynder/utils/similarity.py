@@ -1,3 +1,6 @@
+from collections import Counter
+
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 
@@ -16,10 +19,95 @@ class Vectorizer:
             ],
             target_text = text
         )
+
+    When the source texts are fixed, count their terms once and only count the terms of the targets:
+        vectorizer = Vectorizer().fit(list_source_texts)
+        similarity_score,_ = vectorizer.get_fitted_similarity_score(target_text = text)
     """
 
     def __init__(self, *args, **kwargs):
         self.vectorizer = TfidfVectorizer(*args, **kwargs)
+        self.list_source_texts = None
+        self.analyzer = None
+        self.source_counts = None
+        self.source_squared = None
+        self.arr_df = None
+
+    def fit(self, list_source_texts):
+        """Function that fits the vocabulary on the source texts and keeps their (sparse) term counts and document
+        frequencies.
+
+        Parameters
+        ----------
+        list_source_texts : list
+            source texts
+
+        Returns
+        -------
+        Vectorizer
+        """
+        assert (
+            self.vectorizer.norm == "l2"
+        ), "the fitted similarity scores need l2 normalized rows"
+        self.list_source_texts = list(list_source_texts)
+        self.vectorizer.fit(self.list_source_texts)
+        self.analyzer = self.vectorizer.build_analyzer()
+        self.source_counts, _ = self.count_terms(self.list_source_texts)
+        self.source_squared = self.source_counts.multiply(self.source_counts).tocsr()
+        # csr has one entry per (text, term), so counting the column indices gives the document frequencies
+        self.arr_df = np.bincount(
+            self.source_counts.indices, minlength=len(self.vectorizer.vocabulary_)
+        )
+        return self
+
+    def get_tf(self, arr_counts):
+        return np.log(arr_counts) + 1 if self.vectorizer.sublinear_tf else arr_counts
+
+    def get_idf(self, arr_df, i_texts):
+        """Function that returns the IDF the way TfidfVectorizer computes it for i_texts texts."""
+        if not self.vectorizer.use_idf:
+            return np.ones(np.shape(arr_df))
+        i_smooth = int(self.vectorizer.smooth_idf)
+        return np.log((i_texts + i_smooth) / (arr_df + i_smooth)) + 1
+
+    def count_terms(self, list_texts):
+        """Function that counts the (sublinear) term frequencies of the texts.
+
+        Parameters
+        ----------
+        list_texts : list
+            texts to count
+
+        Returns : tuple
+            sparse matrix (n texts x vocabulary) with the frequencies of the fitted terms and array with the summed
+            squared frequencies of the terms outside the vocabulary per text
+        -------
+        """
+        dict_vocabulary = self.vectorizer.vocabulary_
+        list_indptr, list_indices, list_counts, list_oov = [0], [], [], []
+        for text in list_texts:
+            list_oov_counts = []
+            for term, i_count in Counter(self.analyzer(text)).items():
+                i_term = dict_vocabulary.get(term)
+                if i_term is None:
+                    list_oov_counts.append(i_count)
+                else:
+                    list_indices.append(i_term)
+                    list_counts.append(i_count)
+            list_indptr.append(len(list_indices))
+            list_oov.append(
+                np.sum(self.get_tf(np.array(list_oov_counts, dtype=float)) ** 2)
+            )
+        matrix_counts = sparse.csr_matrix(
+            (
+                self.get_tf(np.array(list_counts, dtype=float)),
+                np.array(list_indices, dtype=np.int64),
+                np.array(list_indptr, dtype=np.int64),
+            ),
+            shape=(len(list_texts), len(dict_vocabulary)),
+        )
+        matrix_counts.sort_indices()
+        return matrix_counts, np.array(list_oov)
 
     def vectorize(self, list_source_texts, target_text):
         return self.vectorizer.fit_transform(list_source_texts + [target_text])
@@ -66,3 +154,76 @@ class Vectorizer:
         ]  # this would give the best match
 
         return np.nanmax(results), text_best_match
+
+    def get_fitted_similarity_score(self, target_text: str):
+        """Function that returns the similarity score and best match of a target against the fitted source texts.
+
+        Gives the same score as get_similarity_score, which refits on the source texts plus the target: the IDF is
+        taken over the source texts plus the target, and the terms of the target outside the fitted vocabulary
+        still count in its norm. Only with max_df, min_df or max_features the vocabulary itself can differ.
+
+        Parameters
+        ----------
+        target_text: str
+            target document of interest
+
+        Returns : tuple
+            the best match score and the actual best matched text
+        -------
+        """
+        arr_scores, list_best_matches = self.get_fitted_similarity_scores([target_text])
+        return arr_scores[0], list_best_matches[0]
+
+    def get_fitted_similarity_scores(self, list_target_texts: list):
+        """Function that scores a batch of targets at once against the fitted source texts.
+
+        Parameters
+        ----------
+        list_target_texts : list
+            target documents of interest
+
+        Returns : tuple
+            array with the best match score per target and list with the best matched text per target
+        -------
+        """
+        assert self.source_counts is not None, "call fit before scoring a target"
+        if not list_target_texts:
+            return np.zeros(0), []
+
+        matrix_targets, arr_oov = self.count_terms(list_target_texts)
+        i_texts = self.source_counts.shape[0] + 1  # the source texts plus the target
+        # the IDF of a term depends on whether the target contains it (idf_in) or not (idf_out)
+        arr_idf_out = self.get_idf(self.arr_df, i_texts)
+        arr_idf_in = self.get_idf(self.arr_df + 1, i_texts)
+        idf_oov = self.get_idf(1, i_texts)
+
+        # only shared terms add to the dot product, so they all have idf_in
+        arr_dots = (
+            matrix_targets @ sparse.diags(arr_idf_in**2) @ self.source_counts.T
+        ).toarray()
+        arr_target_squared_norms = (
+            matrix_targets.multiply(matrix_targets) @ arr_idf_in**2
+            + arr_oov * idf_oov**2
+        )
+        # norm of a source text with idf_out for all terms, corrected for the terms it shares with the target
+        matrix_in = matrix_targets.copy()
+        matrix_in.data[:] = 1
+        arr_source_squared_norms = (self.source_squared @ arr_idf_out**2)[
+            np.newaxis, :
+        ] + (
+            matrix_in
+            @ sparse.diags(arr_idf_in**2 - arr_idf_out**2)
+            @ self.source_squared.T
+        ).toarray()
+
+        # (n targets x n sources), only the small result is made dense
+        arr_norms = np.sqrt(
+            arr_target_squared_norms[:, np.newaxis] * arr_source_squared_norms
+        )
+        arr_results = np.divide(
+            arr_dots, arr_norms, out=np.zeros_like(arr_dots), where=arr_norms > 0
+        )
+        arr_best_matches = np.argmax(arr_results, axis=1)
+        return arr_results[np.arange(len(arr_results)), arr_best_matches], [
+            self.list_source_texts[i] for i in arr_best_matches
+        ]
@@ -0,0 +1,401 @@
+"""Driver that runs extract_file over a whole corpus, in parallel and resumable.
+
+The manifest is a csv (sep ";") with the columns path, uuid and contract_id. Every extracted file gets a row in the
+status csv: its status (ok, error, timeout, crashed or ignored), language, extension, scan flag, error and duration. A rerun
+skips every file that already has a row, so after a crash or a stop it picks up where it stopped.
+
+The workers are the OCR parallelism as well: a worker is a daemon process, which can not start the OCR pool of
+ocr_pages, so it OCRs the pages of a scan one by one. Set --workers to the number of cores to OCR in parallel.
+
+usage:
+    python -m pynder.utils.text_parsing.extraction_driver manifest.csv output_basepath --workers 8 --timeout 600
+"""
+# standard library
+import argparse
+from collections import deque
+import csv
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import time
+
+# custom code
+from pynder.utils.text_parsing import text_parsers
+
+LIST_STATUS_COLUMNS = [
+    "contract_id",
+    "uuid",
+    "path",
+    "status",
+    "lang",
+    "ext",
+    "scan",
+    "error",
+    "seconds",
+]
+
+# seconds the driver waits for a result before it checks the workers for timeouts
+F_POLL = 0.5
+
+# a worker slot that dies this many times in a row without a file (e.g. while loading its models) is not restarted
+I_MAX_STARTUP_DEATHS = 3
+
+
+def read_manifest(path_manifest):
+    """Function that returns the files of a manifest csv (sep ";", columns path, uuid and contract_id).
+
+    Returns: list of (path, uuid, contract_id)
+    """
+    with open(path_manifest, newline="") as f:
+        return [
+            (row["path"], row["uuid"], row["contract_id"])
+            for row in csv.DictReader(f, delimiter=";")
+        ]
+
+
+def read_status(path_status):
+    """Function that returns the rows of the status csv per file.
+
+    Returns: dict, (contract_id, uuid) -> row (dict with LIST_STATUS_COLUMNS)
+    """
+    if not os.path.isfile(path_status):
+        return {}
+    with open(path_status, newline="") as f:
+        return {
+            (row["contract_id"], row["uuid"]): row
+            for row in csv.DictReader(f, delimiter=";")
+        }
+
+
+def extract_worker(
+    queue_tasks, connection_results, output_basepath, dict_models, path_ocr_cache
+):
+    """Function that runs in a worker process: extracts the files it gets until it gets None.
+
+    The results go back over a pipe of this worker only, so when the driver kills the worker (even while it sends)
+    no other worker is affected.
+
+    The models of dict_models are loaded before the worker reports it is ready, so they do not count against the
+    timeout of its first file. The workers are daemons, so they OCR the pages of a scan one by one; the workers
+    themselves already run in parallel.
+    """
+    text_parsers.models.update(dict_models)
+    for lang in {model: lang for lang, model in text_parsers.models.items()}.values():
+        try:
+            text_parsers.get_tokenizer_model(lang)
+        except Exception as e:
+            print(f"Warning - could not load the model for {lang}: {e}")
+    connection_results.send((None, None))
+
+    while True:
+        task = queue_tasks.get()
+        if task is None:
+            return
+        path, uuid, contract_id = task
+        try:
+            result = text_parsers.extract_file(
+                path, uuid, contract_id, output_basepath, path_ocr_cache=path_ocr_cache
+            )
+        except Exception as e:
+            # e.g. writing the output failed
+            result = ("unknown", str(e) or type(e).__name__, path.split(".")[-1], -1)
+        connection_results.send((task, result))
+
+
+class ExtractionDriver:
+    """Class that runs extract_file over the files of a manifest with a pool of worker processes.
+
+    Every worker extracts one file at a time. A worker that is still busy with a file after f_timeout seconds (e.g.
+    stuck in OCR) is killed, the file is recorded as timeout and a new worker takes its place. A worker that dies
+    has its file recorded as crashed. Each status row is written and flushed as soon as its file is done. Every
+    worker has its own task queue and result pipe, so killing a worker never blocks the others, and extract_file
+    only puts complete output files in place, so a killed worker leaves no half written text or spans.
+
+    A worker that dies without a file, e.g. out of memory while loading its models, is restarted at most
+    I_MAX_STARTUP_DEATHS times in a row. After that its slot stays empty, and once no worker is left the files that
+    are still to do are recorded as crashed, so the run always ends.
+
+    The workers OCR the pages of a scan one by one (see extract_worker), so i_workers is the OCR parallelism too.
+
+    example usage:
+
+    driver = ExtractionDriver(output_basepath, path_status, i_workers=8, f_timeout=600)
+    driver.run(read_manifest("manifest.csv"))  # {"ok": 950, "error": 40, "timeout": 10, "skipped": 0}
+    """
+
+    def __init__(
+        self,
+        output_basepath,
+        path_status,
+        i_workers: int = None,
+        f_timeout: float = 600,
+        dict_models: dict = None,
+        str_start_method: str = None,
+        path_ocr_cache: str = None,
+    ):
+        self.output_basepath = output_basepath
+        self.path_status = path_status
+        self.i_workers = i_workers or os.cpu_count() or 1
+        self.f_timeout = f_timeout
+        self.dict_models = dict_models or {}
+        self.path_ocr_cache = path_ocr_cache
+        self.context = multiprocessing.get_context(str_start_method)
+        self.dict_workers = {}  # worker -> (process, task queue, result connection)
+        self.dict_running = {}  # worker -> (task, start time)
+        self.set_idle = set()
+        self.dict_startup_deaths = {}  # worker -> deaths in a row without a file
+        self.dict_counts = {}
+        self.file_status = None
+        self.writer = None
+
+    def start_worker(self, i_worker):
+        queue_tasks = self.context.Queue()
+        connection_results, connection_worker = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=extract_worker,
+            args=(
+                queue_tasks,
+                connection_worker,
+                self.output_basepath,
+                self.dict_models,
+                self.path_ocr_cache,
+            ),
+            daemon=True,
+        )
+        process.start()
+        # only the worker writes, so reading gives EOFError once it is gone
+        connection_worker.close()
+        self.dict_workers[i_worker] = (process, queue_tasks, connection_results)
+
+    def stop_worker(self, i_worker):
+        # the queue and pipe of the worker go with it, the other workers share nothing it may hold a lock on
+        process, _, connection_results = self.dict_workers.pop(i_worker)
+        process.kill()
+        process.join()
+        connection_results.close()
+
+    def record(self, i_worker, status, lang="", ext="", scan=-1, error=""):
+        """Function that writes the status row of the file of a worker, and flushes it."""
+        task, f_start = self.dict_running.pop(i_worker)
+        self.write_status(task, f_start, status, lang, ext, scan, error)
+
+    def write_status(self, task, f_start, status, lang="", ext="", scan=-1, error=""):
+        """Function that writes the status row of a file, and flushes it."""
+        path, uuid, contract_id = task
+        self.writer.writerow(
+            {
+                "contract_id": contract_id,
+                "uuid": uuid,
+                "path": path,
+                "status": status,
+                "lang": lang,
+                "ext": ext or path.split(".")[-1],
+                "scan": scan,
+                "error": error,
+                "seconds": round(time.time() - f_start, 3),
+            }
+        )
+        self.file_status.flush()
+        self.dict_counts[status] = self.dict_counts.get(status, 0) + 1
+
+    def check_workers(self, bMoreTasks):
+        """Function that replaces the workers that are past the timeout or died, their file is recorded.
+
+        A worker that died without a file is only replaced I_MAX_STARTUP_DEATHS times in a row.
+        """
+        for i_worker in list(self.dict_workers):
+            process = self.dict_workers[i_worker][0]
+            if i_worker in self.dict_running:
+                f_start = self.dict_running[i_worker][1]
+                if time.time() - f_start > self.f_timeout:
+                    self.record(
+                        i_worker,
+                        "timeout",
+                        error=f"no result after {self.f_timeout} seconds",
+                    )
+                elif not process.is_alive():
+                    self.record(
+                        i_worker,
+                        "crashed",
+                        error=f"worker exited with {process.exitcode}",
+                    )
+                else:
+                    continue
+            elif process.is_alive():
+                continue
+            else:
+                self.dict_startup_deaths[i_worker] = (
+                    self.dict_startup_deaths.get(i_worker, 0) + 1
+                )
+                if self.dict_startup_deaths[i_worker] >= I_MAX_STARTUP_DEATHS:
+                    print(
+                        f"Warning - worker {i_worker} exited with {process.exitcode} before it extracted a file, "
+                        f"{I_MAX_STARTUP_DEATHS} times in a row, it is not restarted"
+                    )
+                    bMoreTasks = False
+            self.set_idle.discard(i_worker)
+            self.stop_worker(i_worker)
+            if bMoreTasks:
+                self.start_worker(i_worker)
+
+    def run(self, list_files, bRetryFailed: bool = False):
+        """Function that extracts the files that are not in the status csv yet.
+
+        Args:
+            list_files: list of (path, uuid, contract_id), see read_manifest
+            bRetryFailed: bool, extract the files with status error, timeout or crashed again
+
+        Returns: dict, status -> number of files, "skipped" for the files that were done before
+        """
+        dict_done = read_status(self.path_status)
+        queue_todo = deque()
+        self.dict_counts = {"skipped": 0}
+        for path, uuid, contract_id in list_files:
+            row = dict_done.get((str(contract_id), str(uuid)))
+            if row is not None and (row["status"] == "ok" or not bRetryFailed):
+                self.dict_counts["skipped"] += 1
+            else:
+                queue_todo.append((path, str(uuid), str(contract_id)))
+        if not queue_todo:
+            return self.dict_counts
+
+        for folder in ("text", "span"):
+            os.makedirs(os.path.join(self.output_basepath, folder), exist_ok=True)
+        bHeader = not os.path.isfile(self.path_status)
+        self.file_status = open(self.path_status, "a", newline="")
+        self.writer = csv.DictWriter(
+            self.file_status, LIST_STATUS_COLUMNS, delimiter=";"
+        )
+        if bHeader:
+            self.writer.writeheader()
+
+        self.set_idle = set()
+        self.dict_startup_deaths = {}
+        for i_worker in range(min(self.i_workers, len(queue_todo))):
+            self.start_worker(i_worker)
+        try:
+            while queue_todo or self.dict_running:
+                while self.set_idle and queue_todo:
+                    i_worker = self.set_idle.pop()
+                    task = queue_todo.popleft()
+                    self.dict_running[i_worker] = (task, time.time())
+                    self.dict_workers[i_worker][1].put(task)
+
+                dict_connections = {
+                    connection_results: i_worker
+                    for i_worker, (_, _, connection_results) in (
+                        self.dict_workers.items()
+                    )
+                }
+                for connection_results in wait(list(dict_connections), F_POLL):
+                    i_worker = dict_connections[connection_results]
+                    try:
+                        task, result = connection_results.recv()
+                    except EOFError:
+                        continue  # the worker died, check_workers records its file
+                    if task is None:
+                        self.set_idle.add(i_worker)  # loaded its models
+                    elif self.dict_running.get(i_worker, (None,))[0] == task:
+                        self.dict_startup_deaths.pop(i_worker, None)
+                        if result is None:  # e.g. .DS_Store
+                            self.record(i_worker, "ignored")
+                        else:
+                            lang, error, ext, scan = result
+                            self.record(
+                                i_worker,
+                                "error" if error else "ok",
+                                lang,
+                                ext,
+                                scan,
+                                error,
+                            )
+                        self.set_idle.add(i_worker)
+                self.check_workers(bool(queue_todo))
+                if not self.dict_workers:
+                    # every worker slot gave up, see I_MAX_STARTUP_DEATHS
+                    f_start = time.time()
+                    while queue_todo:
+                        self.write_status(
+                            queue_todo.popleft(),
+                            f_start,
+                            "crashed",
+                            error="no worker could be started",
+                        )
+        finally:
+            for _, queue_tasks, _ in self.dict_workers.values():
+                queue_tasks.put(None)
+            for i_worker in list(self.dict_workers):
+                process, _, connection_results = self.dict_workers.pop(i_worker)
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+                connection_results.close()
+            self.file_status.close()
+        return self.dict_counts
+
+
+def extract_corpus(
+    path_manifest,
+    output_basepath,
+    path_status=None,
+    i_workers: int = None,
+    f_timeout: float = 600,
+    bRetryFailed: bool = False,
+    dict_models: dict = None,
+    path_ocr_cache: str = None,
+):
+    """Function that extracts all files of a manifest, see ExtractionDriver.
+
+    Args:
+        path_manifest: str, csv (sep ";") with the columns path, uuid and contract_id
+        output_basepath: str, the texts and spans are saved in its text and span folders
+        path_status: str, None for <output_basepath>/extraction_status.csv
+        i_workers: int, None for one per cpu
+        f_timeout: float, seconds per file
+        bRetryFailed: bool, extract the files that failed before again
+        dict_models: dict, language -> spacy model, overrides text_parsers.models in the workers
+        path_ocr_cache: str, sqlite file with the OCR results of pages, shared by the workers and the reruns
+
+    Returns: dict, status -> number of files
+    """
+    if path_status is None:
+        path_status = os.path.join(output_basepath, "extraction_status.csv")
+    driver = ExtractionDriver(
+        output_basepath,
+        path_status,
+        i_workers,
+        f_timeout,
+        dict_models,
+        path_ocr_cache=path_ocr_cache,
+    )
+    return driver.run(read_manifest(path_manifest), bRetryFailed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("manifest", help="csv (sep ;) with path, uuid and contract_id")
+    parser.add_argument("output_basepath")
+    parser.add_argument("--status", default=None, help="status csv")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, also the number of pages OCR'd in parallel (default: one per cpu)",
+    )
+    parser.add_argument("--timeout", type=float, default=600, help="seconds per file")
+    parser.add_argument("--retry-failed", action="store_true")
+    parser.add_argument(
+        "--ocr-cache", default=None, help="sqlite file of the OCR cache"
+    )
+    args = parser.parse_args()
+
+    dict_counts = extract_corpus(
+        args.manifest,
+        args.output_basepath,
+        args.status,
+        args.workers,
+        args.timeout,
+        args.retry_failed,
+        path_ocr_cache=args.ocr_cache,
+    )
+    print(f"Info - extraction finished: {dict_counts}")
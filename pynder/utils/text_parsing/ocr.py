@@ -0,0 +1,206 @@
+"""OCR of pdf pages for pages_to_spans: page by page over a process pool, with a persistent cache of the results."""
+# standard library
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+
+# non-standard library
+import fitz
+
+I_DPI = 120
+
+# the pool of OCR processes, created on first use
+_executor = None
+_i_executor_workers = 0
+
+
+def get_page_hash(page, lang, i_dpi: int = I_DPI):
+    """Function that returns the hash of what the OCR of a page depends on: its content stream, images and rotation.
+
+    The same scanned page in another pdf (e.g. a standard appendix) gets the same hash, without rendering it.
+
+    Args:
+        page: fitz.Page
+        lang: str, OCR language
+        i_dpi: int
+
+    Returns: str
+    """
+    # a rotated page renders (and reads) differently, while a rotation of 180 degrees keeps its rect
+    sha1 = hashlib.sha1(
+        f"{lang}|{i_dpi}|{tuple(page.rect)}|{page.rotation}".encode("utf-8")
+    )
+    sha1.update(page.read_contents())
+    for image in page.get_images(full=True):
+        sha1.update(page.parent.xref_stream_raw(image[0]) or b"")
+    return sha1.hexdigest()
+
+
+def ocr_page(page, lang, i_dpi: int = I_DPI):
+    """Function that returns the text blocks of a page by OCR, as fitz.Page.get_text_blocks does.
+
+    Returns: list of (x0, y0, x1, y1, text, block_no, block_type)
+    """
+    return [
+        tuple(block)
+        for block in page.get_textpage_ocr(
+            language=lang, dpi=i_dpi, full=True
+        ).extractBLOCKS()
+    ]
+
+
+def ocr_page_bytes(pdf_bytes, lang, i_dpi: int = I_DPI):
+    """Function that runs in an OCR process: the OCR of the single page pdf pdf_bytes, see get_page_bytes."""
+    return ocr_page(fitz.open("pdf", pdf_bytes)[0], lang, i_dpi)
+
+
+def get_page_bytes(fitz_doc, i_page):
+    """Function that returns one page of a pdf as a pdf of its own, to send it to an OCR process."""
+    single = fitz.open()
+    single.insert_pdf(fitz_doc, from_page=i_page, to_page=i_page)
+    return single.tobytes()
+
+
+def get_executor(i_workers):
+    """Function that returns the pool of OCR processes, kept for the life of the process."""
+    global _executor, _i_executor_workers
+    if _executor is None or _i_executor_workers != i_workers:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = ProcessPoolExecutor(i_workers)
+        _i_executor_workers = i_workers
+    return _executor
+
+
+class OcrCache:
+    """Class that keeps the OCR results of pages in a sqlite file, under the hash of the page (see get_page_hash).
+
+    Get one per file with OcrCache.get(path), several processes can share the file.
+    """
+
+    # path -> OcrCache, one connection per file and process
+    _dict_caches = {}
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                page_hash TEXT PRIMARY KEY,
+                blocks TEXT NOT NULL
+            )"""
+        )
+        self.connection.commit()
+
+    @classmethod
+    def get(cls, path):
+        """Function that returns the OcrCache of the file, opening it on first use."""
+        key = (os.path.abspath(path), os.getpid())
+        if key not in cls._dict_caches:
+            cls._dict_caches[key] = cls(path)
+        return cls._dict_caches[key]
+
+    def get_blocks(self, list_hashes):
+        """Function that returns the cached blocks of the pages.
+
+        Returns: dict, page hash -> list of blocks, only the hashes that are in the cache
+        """
+        dict_blocks = {}
+        for page_hash in set(list_hashes):
+            row = self.connection.execute(
+                "SELECT blocks FROM pages WHERE page_hash = ?", (page_hash,)
+            ).fetchone()
+            if row is not None:
+                dict_blocks[page_hash] = [tuple(block) for block in json.loads(row[0])]
+        return dict_blocks
+
+    def put_blocks(self, dict_blocks):
+        """Function that stores the blocks of pages and commits them.
+
+        Args:
+            dict_blocks: dict, page hash -> list of blocks
+        """
+        if not dict_blocks:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?)",
+                [
+                    (page_hash, json.dumps(blocks))
+                    for page_hash, blocks in dict_blocks.items()
+                ],
+            )
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+
+def ocr_pages(
+    fitz_doc,
+    list_page_numbers,
+    lang,
+    i_workers: int = 0,
+    path_cache: str = None,
+    i_dpi: int = I_DPI,
+):
+    """Function that returns the text blocks of pages of a pdf by OCR.
+
+    With path_cache, pages that were OCR'd before (in any pdf) come from the cache. With i_workers > 1 the other
+    pages are OCR'd in parallel, one page per task, by a pool of processes that is kept for the next documents. In a
+    daemon process (e.g. a worker of the extraction driver) the pages are OCR'd one by one, daemons can not start
+    processes.
+
+    Args:
+        fitz_doc: fitz.Document
+        list_page_numbers: list, the pages to OCR (0 based)
+        lang: str, OCR language
+        i_workers: int, number of OCR processes, 0 or 1 to OCR in this process
+        path_cache: str, sqlite file of the OcrCache, None for no cache
+        i_dpi: int
+
+    Returns: dict, page number -> list of (x0, y0, x1, y1, text, block_no, block_type)
+    """
+    if not list_page_numbers:
+        return {}
+    dict_hashes, dict_blocks = {}, {}
+    if path_cache is not None:
+        dict_hashes = {
+            i_page: get_page_hash(fitz_doc[i_page], lang, i_dpi)
+            for i_page in list_page_numbers
+        }
+        dict_cached = OcrCache.get(path_cache).get_blocks(dict_hashes.values())
+        dict_blocks = {
+            i_page: dict_cached[page_hash]
+            for i_page, page_hash in dict_hashes.items()
+            if page_hash in dict_cached
+        }
+
+    list_todo = [i_page for i_page in list_page_numbers if i_page not in dict_blocks]
+    if (
+        i_workers > 1
+        and len(list_todo) > 1
+        and not multiprocessing.current_process().daemon
+    ):
+        executor = get_executor(i_workers)
+        dict_futures = {
+            i_page: executor.submit(
+                ocr_page_bytes, get_page_bytes(fitz_doc, i_page), lang, i_dpi
+            )
+            for i_page in list_todo
+        }
+        dict_new = {i_page: future.result() for i_page, future in dict_futures.items()}
+    else:
+        dict_new = {
+            i_page: ocr_page(fitz_doc[i_page], lang, i_dpi) for i_page in list_todo
+        }
+
+    if path_cache is not None:
+        OcrCache.get(path_cache).put_blocks(
+            {dict_hashes[i_page]: blocks for i_page, blocks in dict_new.items()}
+        )
+    dict_blocks.update(dict_new)
+    return dict_blocks
@@ -1,19 +1,45 @@
 from spacy.tokens import Span
 import fitz
 import langdetect
-import spacy
 import pickle
 import textract
 from textract.exceptions import ExtensionNotSupported
 import regex as re
 import os
 
+from pynder.utils.model_loading import load_model
+from pynder.utils.text_parsing.ocr import ocr_pages
+
 models = {"nld": "nl_core_news_lg", "eng": "en_core_web_lg"}
 
+# model name -> its tokenizer only pipeline, loaded once per process
+_dict_tokenizer_models = {}
+
 PAGE_LABEL = "PAGES"
 BLOCK_LABEL = "BLOCKS"
 
 
+def get_tokenizer_model(lang):
+    """
+    Returns the tokenizer only pipeline of the model of a language, loaded on first use and kept for the life of
+    the process. The page spans only need the tokens, and the tokenizer of the model is the one the analysis
+    pipeline splits the text with, so the token offsets of the pages match.
+
+    Parameters
+    ----------
+    lang: str
+        Language, key of models ('nl_core_news_lg' for unknown languages)
+
+    Returns
+    -------
+    spacy.Language
+    """
+    model = models.get(lang, "nl_core_news_lg")
+    if model not in _dict_tokenizer_models:
+        _dict_tokenizer_models[model] = load_model(model, set())
+    return _dict_tokenizer_models[model]
+
+
 def extract_doc(filepath):
     """
     Extract text from a doc or docx file in the filepath. Returns the text, spans of start and end token per page
@@ -38,12 +64,12 @@ def extract_doc(filepath):
     lang = getlang(text)
 
     pages = [p for p in re.split(r"[\t\n]{4,5}", text) if p != ""]
-    doc = list_texts_to_nlp(spacy.load(models.get(lang, "nl_code_news_lg")), pages)
+    doc = list_texts_to_nlp(get_tokenizer_model(lang), pages)
 
     return doc.text, get_spans_from_doc(doc, PAGE_LABEL), lang, False
 
 
-def extract_pdf(filepath):
+def extract_pdf(filepath, i_ocr_workers=0, path_ocr_cache=None):
     """
     Extract text from a PDF document in the filepath. Returns the text, spans of start and end token per page
     and the detected language.
@@ -52,6 +78,10 @@ def extract_pdf(filepath):
     ----------
     filepath: str
         Path to file
+    i_ocr_workers: int
+        Number of processes to OCR the pages of a scanned document with, see pynder.utils.text_parsing.ocr
+    path_ocr_cache: str
+        sqlite file with the OCR results of pages seen before, None for no cache
 
     Returns
     -------
@@ -59,14 +89,15 @@ def extract_pdf(filepath):
     """
 
     document = fitz.open(filepath)
-    page = document[0] if document.page_count == 1 else document[1]
-    text = page.get_text().strip()
+    i_page = 0 if document.page_count == 1 else 1
+    text = document[i_page].get_text().strip()
     if text == "":
-        text = page.get_textpage_ocr(language="nld", dpi=120, full=True).extractText()
+        blocks = ocr_pages(document, [i_page], "nld", path_cache=path_ocr_cache)[i_page]
+        text = "".join(block[4] for block in blocks if block[-1] == 0)
     lang = getlang(text)
 
     doc, scan = fitz_to_nlp(
-        spacy.load(models.get(lang, "nl_core_news_lg")), document, lang
+        get_tokenizer_model(lang), document, lang, i_ocr_workers, path_ocr_cache
     )
 
     return doc.text, get_spans_from_doc(doc, PAGE_LABEL), lang, scan
@@ -116,7 +147,7 @@ def getlang(text, default="nld"):
         return default
 
 
-def fitz_to_nlp(model, fitz_doc, lang="nld"):
+def fitz_to_nlp(model, fitz_doc, lang="nld", i_ocr_workers=0, path_ocr_cache=None):
     """
     Fitz (PyMuPDF) doc to a spacy doc including a set of spans per page.
 
@@ -128,12 +159,18 @@ def fitz_to_nlp(model, fitz_doc, lang="nld"):
         PyMuPDF document
     lang: str
         Language to use for optional OCR parsing.
+    i_ocr_workers: int
+        see pages_to_spans
+    path_ocr_cache: str
+        see pages_to_spans
 
     Returns
     -------
 
     """
-    page_spans, block_spans, text, scan = pages_to_spans(fitz_doc, lang=lang)
+    page_spans, block_spans, text, scan = pages_to_spans(
+        fitz_doc, lang, i_ocr_workers, path_ocr_cache
+    )
     doc = model(text)
     page_spans = [new_span_by_char_idx(doc, x, PAGE_LABEL) for x in page_spans]
     # block_spans = [new_span_by_char_idx(doc, x, BLOCK_LABEL) for x in block_spans]
@@ -142,36 +179,66 @@ def fitz_to_nlp(model, fitz_doc, lang="nld"):
     return doc, scan
 
 
-def pages_to_spans(fitz_doc, lang):
+def pages_to_spans(fitz_doc, lang, i_ocr_workers=0, path_ocr_cache=None):
     """
     Helper function to convert a fitz document to a list of spans per page
     and the final text.
 
+    Pages without text are OCR'd, and once one of them turns out to be a scan, so are the later pages with fewer than
+    3 text blocks. The pages to OCR are known up front, so they are OCR'd together: in parallel with i_ocr_workers
+    and from the cache for pages seen before (see pynder.utils.text_parsing.ocr.ocr_pages).
+
     Parameters
     ----------
     fitz_doc: fitz.Document
         PyMuPDF document
     lang: str
         Language of the document
+    i_ocr_workers: int
+        Number of processes to OCR the pages with, 0 to OCR them one by one
+    path_ocr_cache: str
+        sqlite file with the OCR results of pages seen before, None for no cache
 
     Returns
     -------
     tuple
         page_spans (list), block_spans (list), text (str), scan(bool)
     """
+    list_blocks = [
+        [b for b in page.get_text_blocks() if b[-1] == 0] for page in fitz_doc.pages()
+    ]
+    dict_ocr_blocks = ocr_pages(
+        fitz_doc,
+        [i for i, blocks in enumerate(list_blocks) if not blocks],
+        lang,
+        i_ocr_workers,
+        path_ocr_cache,
+    )
+    list_scans = [i for i, blocks in dict_ocr_blocks.items() if blocks]
+    scan = bool(list_scans)
+    if scan:
+        dict_ocr_blocks.update(
+            ocr_pages(
+                fitz_doc,
+                [
+                    i
+                    for i, blocks in enumerate(list_blocks)
+                    if blocks and len(blocks) < 3 and i > min(list_scans)
+                ],
+                lang,
+                i_ocr_workers,
+                path_ocr_cache,
+            )
+        )
+
     page_spans = []
     block_spans = []
     text = ""
     idx = 0
-    scan = False
-    for page in fitz_doc.pages():
+    end = 0
+    for i_page, blocks in enumerate(list_blocks):
         page_start = idx
-        blocks = [b for b in page.get_text_blocks() if b[-1] == 0]
-        if not blocks or (scan and (len(blocks) < 3)):
-            page = page.get_textpage_ocr(language=lang, dpi=120, full=True)
-            blocks = page.extractBLOCKS()
-            if blocks:
-                scan = True
+        blocks = dict_ocr_blocks.get(i_page, blocks)
         for block in blocks:
             if block[-1] == 0:
                 start = idx
@@ -218,6 +285,15 @@ def save_bare_spans_from_file(obj, path):
         pickle.dump(obj, file)
 
 
+def replace_file(path, content):
+    """Helper function that writes content (str or bytes) to a temporary file next to path, which then replaces
+    path. A process that is killed halfway leaves the temporary file behind, never a half written path."""
+    path_tmp = f"{path}.{os.getpid()}.tmp"
+    with open(path_tmp, "wb" if isinstance(content, bytes) else "w") as file:
+        file.write(content)
+    os.replace(path_tmp, path)
+
+
 def set_spans_to_doc(doc, bare_spans, label):
     """Helper function to add spans in list(dict) form to spacy.Doc"""
     new_spans = [Span(doc, x["start"], x["end"], label=x["label"]) for x in bare_spans]
@@ -226,17 +302,35 @@ def set_spans_to_doc(doc, bare_spans, label):
 
 
 def get_spans_from_doc(doc, label):
-    """Helper function to convert form spacy.Doc.spans to spans in list(dict) form"""
+    """Helper function to convert form spacy.Doc.spans to spans in list(dict) form, with their character offsets"""
     spans = doc.spans[label]
-    bare_spans = [dict(start=s.start, end=s.end, label=s.label_) for s in spans]
+    bare_spans = [
+        dict(
+            start=s.start,
+            end=s.end,
+            label=s.label_,
+            start_char=s.start_char,
+            end_char=s.end_char,
+        )
+        for s in spans
+    ]
     return bare_spans
 
 
-def extract_file(path, uuid=None, contract_id=None, output_basepath=None):
+def extract_file(
+    path,
+    uuid=None,
+    contract_id=None,
+    output_basepath=None,
+    store_writer=None,
+    i_ocr_workers=0,
+    path_ocr_cache=None,
+):
     """
     Extract a file from document in path.
     If all uuid, contract_id and output_basepath are filled in the files will be saved. Otherwise text and spans
-    are also returned.
+    are also returned. With a store_writer (and uuid and contract_id) the text and spans are added to a corpus store
+    instead of saved as a text file and a pickle per document.
 
     Saves extracted text to path build up from output_basepath, contract_id, 'text', and uuid.
     Saves extracted spans to path build up from output_basepath, contract_id, 'spans', and uuid (as pickle).
@@ -250,6 +344,11 @@ def extract_file(path, uuid=None, contract_id=None, output_basepath=None):
     uuid: str
     contract_id: str
     output_basepath: str
+    store_writer: CorpusStoreWriter (optional)
+    i_ocr_workers: int
+        Number of processes to OCR the pages of a scanned pdf with, see pages_to_spans
+    path_ocr_cache: str
+        sqlite file with the OCR results of pages seen before, see pages_to_spans
 
     Returns
     -------
@@ -274,7 +373,11 @@ def extract_file(path, uuid=None, contract_id=None, output_basepath=None):
 
     try:
         if ext.lower() == "pdf":
-            text, spans, lang, scan = extract_pdf(filepath=path)
+            text, spans, lang, scan = extract_pdf(
+                filepath=path,
+                i_ocr_workers=i_ocr_workers,
+                path_ocr_cache=path_ocr_cache,
+            )
         elif ext.lower() in ["doc", "docx"]:
             text, spans, lang, scan = extract_doc(filepath=path)
         else:
@@ -297,23 +400,24 @@ def extract_file(path, uuid=None, contract_id=None, output_basepath=None):
     if text == "":
         return lang, error, ext, -1
 
+    if store_writer is not None and not any([x is None for x in [uuid, contract_id]]):
+        store_writer.add(contract_id, uuid, text, spans)
+        return lang, error, ext, int(scan)
+
     if not any([x is None for x in [uuid, contract_id, output_basepath]]):
-        if not os.path.isdir(os.path.join(output_basepath, "text", contract_id)):
-            os.mkdir(os.path.join(output_basepath, "text", contract_id))
-        if not os.path.isdir(os.path.join(output_basepath, "span", contract_id)):
-            os.mkdir(os.path.join(output_basepath, "span", contract_id))
+        # other processes may extract files of the same contract
+        os.makedirs(os.path.join(output_basepath, "text", contract_id), exist_ok=True)
+        os.makedirs(os.path.join(output_basepath, "span", contract_id), exist_ok=True)
 
         if text != "":
-            with open(
-                os.path.join(output_basepath, "text", contract_id, uuid + ".txt"), "w"
-            ) as file:
-                file.write(text)
-
-            with open(
+            # the spans first, so a text file always comes with its spans
+            replace_file(
                 os.path.join(output_basepath, "span", contract_id, uuid + ".pickle"),
-                "wb",
-            ) as file:
-                pickle.dump(spans, file)
+                pickle.dumps(spans),
+            )
+            replace_file(
+                os.path.join(output_basepath, "text", contract_id, uuid + ".txt"), text
+            )
 
         return lang, error, ext, int(scan)
     else:
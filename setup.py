@@ -13,13 +13,24 @@ version = {}
 with open("pynder/version.py") as fp:
     exec(fp.read(), version)
 
+# spacy resolves the question factories through these entry points, importing a question module only when needed
+registry = {}
+with open("pynder/matchers/registry.py") as fp:
+    exec(fp.read(), registry)
+
 setup(
     name="pynder",  # How you named your package folder (MyLib)
     packages=find_packages(),
+    package_data={"pynder.matchers": ["questions_*.json"]},
     python_requires="==3.8.10",
     version=version["__version__"],
     license="Apache 2.0",
     long_description=long_description,
     long_description_content_type="text/markdown",
     classifiers=["Programming Language :: Python :: 3.8"],
+    entry_points={
+        "spacy_factories": registry["get_entry_points"](
+            path.join(this_directory, "pynder", "matchers")
+        )
+    },
 )
@@ -0,0 +1,59 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseTFIDF,
+    BaseNormalizedCounter,
+)
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_DOCS = [
+    ["uittreksel uit het handelsregister", "het risico ligt bij de opdrachtnemer"],
+    ["geen match op deze pagina", "risico risico en nog eens risk"],
+    ["algemene inkoopvoorwaarden van de opdrachtgever"],
+]
+
+
+def make_docs(nlp):
+    return [
+        make_doc(nlp, list_pages, f"doc{i_doc}")
+        for i_doc, list_pages in enumerate(LIST_DOCS)
+    ]
+
+
+class TestsBatchPipe(unittest.TestCase):
+    def test_pipe_equals_call(self):
+        nlp = spacy.blank("nl")
+        docs = make_docs(nlp)
+        list_source_texts = [
+            "uittreksel handelsregister kamer van koophandel",
+            "algemene inkoopvoorwaarden",
+        ]
+
+        list_components = [
+            BaseRegex(nlp, "q_regex", [r"risico\s\w+"]),
+            BaseNormalizedCounter(
+                nlp, "q_counter", 0.01, ["risico", "risk"], bSharedEngine=False
+            ),
+            BaseNormalizedCounter(
+                nlp, "q_counter_doc", 0.01, ["risico"], False, bSharedEngine=False
+            ),
+            BaseNormalizedCounter(nlp, "q_counter_shared", 0.01, ["risico", "risk"]),
+            BaseTFIDF(nlp, "q_tfidf", 0.3, list_source_texts),
+            BaseTFIDF(nlp, "q_tfidf_pages", 0.3, list_source_texts, True),
+        ]
+        for component in list_components:
+            list_expected = [component.analyze(doc) for doc in docs]
+            list_docs = list(component.pipe(docs, batch_size=2))
+            assert [
+                doc._._dict_results[component.name] for doc in list_docs
+            ] == list_expected
+            assert any(result.bResult for result in list_expected)
@@ -0,0 +1,200 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from spacy.tokens import Doc
+import pynder.matchers.definitions  # registers pynder_question
+from pynder.matchers import get_question_annotations
+from pynder.utils import corpus_runner
+from pynder.utils.corpus_runner import (
+    analyze_shard,
+    build_pipeline,
+    get_doc_output,
+    get_paths_from_metadata,
+    init_worker,
+    run_corpus,
+)
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_QUESTIONS = ["q23", "q31"]
+
+DICT_CONTRACTS = {
+    "1001": [
+        ["de algemene inkoopvoorwaarden zijn van toepassing", "verder niets"],
+        ["geen match op deze pagina"],
+    ],
+    "1002": [
+        [
+            "de wijziging van de algemene inkoopvoorwaarde is niet toegestaan",
+            "x" * 100 + " opzegtermijn " + "y" * 100,
+        ],
+    ],
+}
+
+
+def write_corpus(folder):
+    """Function that writes the text files and page spans of DICT_CONTRACTS, returns the text and span folders."""
+    folder_text = os.path.join(folder, "text")
+    folder_span = os.path.join(folder, "span")
+    for contract_id, list_docs in DICT_CONTRACTS.items():
+        os.makedirs(os.path.join(folder_text, contract_id))
+        os.makedirs(os.path.join(folder_span, contract_id))
+        for i_doc, list_pages in enumerate(list_docs):
+            with open(
+                os.path.join(folder_text, contract_id, f"doc{i_doc}.txt"), "w"
+            ) as f:
+                f.write("\n".join(list_pages))
+            list_spans, i_start = [], 0
+            for page in list_pages:
+                # blank tokenizer: one token per word here
+                i_end = i_start + len(page.split())
+                list_spans.append({"start": i_start, "end": i_end, "label": "PAGES"})
+                i_start = i_end
+            with open(
+                os.path.join(folder_span, contract_id, f"doc{i_doc}.pickle"), "wb"
+            ) as f:
+                pickle.dump(list_spans, f)
+
+    with open(os.path.join(folder, "df_sql.csv"), "w") as f:
+        f.write("contract_id;file_uuid;language\n")
+        for contract_id, list_docs in DICT_CONTRACTS.items():
+            for i_doc in range(len(list_docs)):
+                f.write(f"{contract_id};doc{i_doc};nld\n")
+        f.write("1002;doc_english;eng\n")
+    return folder_text, folder_span
+
+
+class TestsCorpusRunner(unittest.TestCase):
+    def test_import_is_lazy(self):
+        # a fresh interpreter, the other tests already imported the question modules
+        code = (
+            "import sys, pynder.utils.corpus_runner; "
+            "assert 'pynder.matchers.questions_P' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_get_paths_from_metadata(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder_text, _ = write_corpus(folder)
+            list_paths = get_paths_from_metadata(
+                os.path.join(folder, "df_sql.csv"), folder_text
+            )
+            assert len(list_paths) == 3
+            assert all(os.path.isfile(path) for path in list_paths)
+            assert (
+                len(
+                    get_paths_from_metadata(
+                        os.path.join(folder, "df_sql.csv"), folder_text, None
+                    )
+                )
+                == 4
+            )
+
+    def test_workers_equal_single_process(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder_text, folder_span = write_corpus(folder)
+            list_paths = get_paths_from_metadata(
+                os.path.join(folder, "df_sql.csv"), folder_text
+            )
+            build_kwargs = {
+                "model": "blank:nl",
+                "folder_span": folder_span,
+                "list_questions": LIST_QUESTIONS,
+            }
+
+            nlp = build_pipeline(**build_kwargs)
+            list_expected = [get_doc_output(doc) for doc in nlp.pipe(list_paths)]
+            assert any(
+                result and result.bResult
+                for _, _, dict_results in list_expected
+                for result in dict_results.values()
+            )
+
+            list_output = list(
+                run_corpus(
+                    list_paths,
+                    build_kwargs=build_kwargs,
+                    i_workers=2,
+                    i_shard_size=1,
+                    bOrdered=True,
+                )
+            )
+            assert list_output == list_expected
+
+            # read ahead in the workers
+            list_output = list(
+                run_corpus(
+                    list_paths,
+                    build_kwargs={
+                        **build_kwargs,
+                        "tokenizer_kwargs": {"i_prefetch": 2},
+                    },
+                    i_workers=2,
+                    i_shard_size=3,
+                    bOrdered=True,
+                )
+            )
+            assert list_output == list_expected
+
+            # a missing file only loses its own doc
+            list_output = list(
+                run_corpus(
+                    list_paths + [os.path.join(folder_text, "1001", "missing.txt")],
+                    build_kwargs=build_kwargs,
+                    i_workers=2,
+                    i_shard_size=2,
+                )
+            )
+            assert sorted(list_output, key=lambda x: x[:2]) == sorted(
+                list_expected, key=lambda x: x[:2]
+            )
+
+    def test_annotations_before_loading(self):
+        assert get_question_annotations(LIST_QUESTIONS) == set()
+        assert get_question_annotations(["q23", "q27", "q28"]) == {"LEMMA"}
+
+        with tempfile.TemporaryDirectory() as folder:
+            _, folder_span = write_corpus(folder)
+            with mock.patch.object(
+                corpus_runner, "load_model", wraps=corpus_runner.load_model
+            ) as load_model:
+                nlp = build_pipeline(
+                    "blank:nl", folder_span, list_questions=["q23", "q27"]
+                )
+        load_model.assert_called_once_with("blank:nl", {"LEMMA"})
+        assert nlp.pipe_names == ["load_page_spans", "q23", "q27"]
+
+    def test_retry_forgets_answered_contracts(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder_text, folder_span = write_corpus(folder)
+            init_worker(
+                build_pipeline,
+                {"model": "blank:nl", "folder_span": folder_span, "list_questions": []},
+            )
+            corpus_runner._nlp.add_pipe(
+                "pynder_question",
+                name="aiv_per_contract",
+                config={
+                    "definition": {
+                        "type": "regex",
+                        "patterns": ["inkoopvoorwaarden"],
+                        "mode": "contract",
+                    }
+                },
+            )
+            path = os.path.join(folder_text, "1001", "doc0.txt")
+            path_missing = os.path.join(folder_text, "1001", "missing.txt")
+
+            # the doc answers contract 1001 before the missing file fails the shard
+            list_output = analyze_shard([path, path_missing], batch_size=1)
+        assert len(list_output) == 1
+        assert list_output[0][2]["aiv_per_contract"].bResult
@@ -0,0 +1,169 @@
+import os
+import pickle
+import random
+import tempfile
+
+import numpy as np
+import spacy
+from spacy.tokens import Doc
+from pynder.custom_pipeline_components import CustomTokenizerWrapper
+from pynder.utils.corpus_runner import build_pipeline, get_doc_output
+from pynder.utils.corpus_store import (
+    CorpusStore,
+    CorpusStoreWriter,
+    build_corpus_store,
+)
+from pynder.utils.text_parsing.text_parsers import (
+    get_spans_from_doc,
+    list_texts_to_nlp,
+)
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+DICT_DOCS = {
+    ("1001", "doc0"): [
+        "  de algemene inkoopvoorwaarden zijn van toepassing, wijziging alleen schriftelijk.\n",
+        "artikel 2: de opzegtermijn is één maand €\n",
+        "handtekening",
+    ],
+    ("1001", "doc1"): ["één pagina"],
+    ("1002", "doc0"): [],
+}
+
+
+def make_docs(nlp):
+    """Function that returns the text and spans of every doc in DICT_DOCS as extract_file makes them."""
+    dict_docs = {}
+    for key, list_pages in DICT_DOCS.items():
+        if list_pages:
+            doc = list_texts_to_nlp(nlp, list_pages)
+            dict_docs[key] = (doc.text, get_spans_from_doc(doc, "PAGES"))
+        else:
+            dict_docs[key] = ("", [])
+    return dict_docs
+
+
+class TestsCorpusStore(unittest.TestCase):
+    def test_write_read(self):
+        nlp = spacy.blank("nl")
+        dict_docs = make_docs(nlp)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "store")
+            with CorpusStoreWriter(path) as writer:
+                for (contract_id, doc_id), (text, spans) in dict_docs.items():
+                    writer.add(contract_id, doc_id, text, spans)
+
+            store = CorpusStore(path)
+            assert len(store) == 3
+            assert ("1001", "doc1") in store
+            assert ("1003", "doc0") not in store
+            for (contract_id, doc_id), (text, spans) in dict_docs.items():
+                assert store.get_text(contract_id, doc_id) == text
+                assert store.get_spans(contract_id, doc_id) == spans
+                doc = nlp(text)
+                for i_page, span in enumerate(spans):
+                    assert (
+                        store.get_page_text(contract_id, doc_id, i_page)
+                        == doc[span["start"] : span["end"]].text
+                    )
+            assert np.array_equal(
+                store.get_page_offsets("1001", "doc0"),
+                [[span["start"], span["end"]] for span in dict_docs["1001", "doc0"][1]],
+            )
+            with pytest.raises(KeyError):
+                store.get_text("1003", "doc0")
+            with pytest.raises(IndexError):
+                store.get_page_text("1001", "doc1", 1)
+
+    def test_key_lookup(self):
+        random.seed(0)
+        list_keys = [
+            (str(random.randint(1, 50)), f"doc{random.randint(0, 200)}")
+            for _ in range(500)
+        ] + [("1001", "doc1"), ("1001", "doc10"), ("één", "dossier-ü"), ("", "")]
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "store")
+            dict_texts = {}
+            with CorpusStoreWriter(path) as writer:
+                for i, (contract_id, doc_id) in enumerate(list_keys):
+                    # a doc that is added twice keeps the text of the last add
+                    dict_texts[contract_id, doc_id] = f"tekst {i}"
+                    writer.add(contract_id, doc_id, f"tekst {i}", [])
+            assert not os.path.exists(os.path.join(path, "index.json"))
+
+            store = CorpusStore(path)
+            assert len(store) == len(dict_texts)
+            for (contract_id, doc_id), text in dict_texts.items():
+                assert store.get_text(contract_id, doc_id) == text
+            for key in [
+                ("1001", "doc100"),
+                ("100", "doc1"),
+                ("één", "dossier"),
+                ("z", ""),
+            ]:
+                assert key not in store
+
+            # an empty store
+            CorpusStoreWriter(os.path.join(folder, "empty")).close()
+            store = CorpusStore(os.path.join(folder, "empty"))
+            assert len(store) == 0
+            assert ("1001", "doc0") not in store
+
+    def test_build_and_pipeline(self):
+        nlp = spacy.blank("nl")
+        dict_docs = make_docs(nlp)
+        with tempfile.TemporaryDirectory() as folder:
+            folder_text = os.path.join(folder, "text")
+            folder_span = os.path.join(folder, "span")
+            list_paths = []
+            for (contract_id, doc_id), (text, spans) in dict_docs.items():
+                if not text:
+                    continue
+                os.makedirs(os.path.join(folder_text, contract_id), exist_ok=True)
+                os.makedirs(os.path.join(folder_span, contract_id), exist_ok=True)
+                path = os.path.join(folder_text, contract_id, f"{doc_id}.txt")
+                with open(path, "w") as f:
+                    f.write(text)
+                # the pickles of before the corpus store have no character offsets
+                with open(
+                    os.path.join(folder_span, contract_id, f"{doc_id}.pickle"), "wb"
+                ) as f:
+                    pickle.dump(
+                        [
+                            {key: span[key] for key in ("start", "end", "label")}
+                            for span in spans
+                        ],
+                        f,
+                    )
+                list_paths.append(path)
+
+            path_store = os.path.join(folder, "store")
+            assert (
+                build_corpus_store(list_paths, folder_span, path_store, nlp.tokenizer)
+                == 2
+            )
+            store = CorpusStore.get(path_store)
+            assert store.get_spans("1001", "doc0") == dict_docs["1001", "doc0"][1]
+
+            dict_kwargs = {"model": "blank:nl", "list_questions": ["q23", "q31"]}
+            nlp_files = build_pipeline(folder_span=folder_span, **dict_kwargs)
+            nlp_store = build_pipeline(path_store=path_store, **dict_kwargs)
+            for path in list_paths:
+                assert get_doc_output(nlp_store(path)) == get_doc_output(
+                    nlp_files(path)
+                )
+            assert get_doc_output(nlp_store(list_paths[0]))[2]["q31"].bResult
+
+            # the texts only
+            nlp = spacy.blank("nl")
+            nlp.tokenizer = CustomTokenizerWrapper(
+                nlp.tokenizer, path_corpus=path_store, i_prefetch=2
+            )
+            assert [
+                doc.text for doc in nlp.pipe(nlp.tokenizer.prefetch(list_paths))
+            ] == [dict_docs[key][0] for key in [("1001", "doc0"), ("1001", "doc1")]]
@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+import spacy
+from pynder.custom_pipeline_components import CustomTokenizerWrapper
+from pynder.custom_pipeline_components.tokenizer import write_corpus_file
+
+import unittest
+import pytest
+from spacy.tokens import Doc
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+
+def write_texts(folder, i_docs=10):
+    list_paths = []
+    for i_doc in range(i_docs):
+        path = os.path.join(folder, "text", str(1000 + i_doc % 3), f"doc{i_doc}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"de tekst van document {i_doc}")
+        list_paths.append(path)
+    return list_paths
+
+
+def get_docs(tokenizer, list_paths):
+    nlp = spacy.blank("nl")
+    nlp.tokenizer = tokenizer(nlp.tokenizer)
+    return [
+        (doc.text, doc._.contract_id, doc._.doc_id)
+        for doc in nlp.pipe(nlp.tokenizer.prefetch(list_paths), batch_size=4)
+    ]
+
+
+class TestsTokenizerWrapper(unittest.TestCase):
+    def test_prefetch_and_corpus_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            list_paths = write_texts(folder)
+            list_expected = get_docs(CustomTokenizerWrapper, list_paths)
+            assert list_expected[4] == ("de tekst van document 4", "1001", "doc4")
+
+            # the same path twice reads it twice
+            list_paths_twice = list_paths + list_paths[:2]
+            list_expected_twice = list_expected + list_expected[:2]
+            assert (
+                get_docs(
+                    lambda t: CustomTokenizerWrapper(t, i_prefetch=3, i_threads=2),
+                    list_paths_twice,
+                )
+                == list_expected_twice
+            )
+
+            path_corpus = os.path.join(folder, "corpus.zip")
+            write_corpus_file(list_paths, path_corpus)
+            for i_prefetch in [0, 5]:
+                tokenizer = lambda t: CustomTokenizerWrapper(
+                    t, path_corpus=path_corpus, i_prefetch=i_prefetch
+                )
+                assert get_docs(tokenizer, list_paths_twice) == list_expected_twice
+
+    def test_prefetch_missing_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            list_paths = write_texts(folder, 3)
+            nlp = spacy.blank("nl")
+            nlp.tokenizer = CustomTokenizerWrapper(nlp.tokenizer, i_prefetch=2)
+            path_missing = os.path.join(folder, "text", "1000", "missing.txt")
+            with pytest.raises(FileNotFoundError):
+                list(nlp.pipe(nlp.tokenizer.prefetch([path_missing] + list_paths)))
+            # the texts read ahead are still used
+            assert nlp(list_paths[0]).text == "de tekst van document 0"
@@ -0,0 +1,64 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import (
+    BaseSpacyMatcher,
+    BaseNormalizedCounter,
+)
+from pynder.utils.page_bucketing import bucket_matches
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PAGES = [
+    "overeenkomst tussen partij a met dossiernummer 123 en de risico analyse",
+    "geen match op deze pagina behalve risico risico",
+    "het exit plan wordt opgesteld door de opdrachtnemer",
+    "en het exit  plan is klaar voor gebruik. Betaal termijn is dertig dagen",
+]
+
+
+class TestsDocLevelMatching(unittest.TestCase):
+    def test_bucket_matches(self):
+        list_buckets, set_touched = bucket_matches(
+            [(0, 2, "a"), (4, 6, "b"), (8, 12, "c"), (13, 14, "d")],
+            [0, 5, 11],
+            [4, 10, 15],
+        )
+        assert list_buckets == [["a"], [], ["d"]]
+        assert set_touched == {0, 1, 2}
+
+    def test_doc_level_equals_per_page(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        list_patterns = [
+            [{"LOWER": "betaal"}, {"LOWER": "termijn"}],
+            [{"LOWER": "exit"}],
+            [{"LOWER": "analyse"}, {"LOWER": "geen"}],  # crosses the page boundary
+        ]
+        per_page = BaseSpacyMatcher(nlp, "q27", list_patterns, bSharedEngine=False)
+        doc_level = BaseSpacyMatcher(
+            nlp, "q27_doc", list_patterns, bDocLevelMatching=True, bSharedEngine=False
+        )
+        assert per_page.analyze(doc) == doc_level.analyze(doc)
+
+        list_words = ["risico", "risk", "risico"]
+        per_page = BaseNormalizedCounter(
+            nlp, "q42", 0.001, list_words, bSharedEngine=False
+        )
+        doc_level = BaseNormalizedCounter(
+            nlp,
+            "q42_doc",
+            0.001,
+            list_words,
+            bDocLevelMatching=True,
+            bSharedEngine=False,
+        )
+        assert per_page.analyze(doc) == doc_level.analyze(doc)
+        assert doc_level.analyze(doc).tPage_nr == (0, 1)
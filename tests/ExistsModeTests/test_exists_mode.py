@@ -0,0 +1,122 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.enums import ResultMatch, first_match
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseTFIDF,
+    BaseSpacyMatcher,
+    BaseNormalizedCounter,
+)
+from pynder.matchers.engines import (
+    NormalizedCounterEngine,
+    RegexEngine,
+    SpacyMatcherEngine,
+)
+import regex as re
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PAGES = [
+    "geen enkel woord van belang",
+    "de boete is tien procent, een boete per dag",
+    "de boete wordt verdubbeld",
+]
+
+ENGINES = [RegexEngine, SpacyMatcherEngine, NormalizedCounterEngine]
+
+
+def make_components(nlp, str_suffix, **kwargs):
+    return [
+        BaseRegex(nlp, f"regex{str_suffix}", [r"(boete) (\w+)"], **kwargs),
+        BaseSpacyMatcher(nlp, f"matcher{str_suffix}", [[{"LOWER": "boete"}]], **kwargs),
+        BaseNormalizedCounter(nlp, f"counter{str_suffix}", 0.01, ["boete"], **kwargs),
+    ]
+
+
+class TestsExistsMode(unittest.TestCase):
+    def test_first_match(self):
+        result = ResultMatch(True, (("a", "b"), ("c",)), (1, 2), ("doc1", "doc1"))
+        assert first_match(result) == ResultMatch(True, (("a",),), (1,), ("doc1",))
+        assert first_match(ResultMatch(True, ("text",), (0,), ("doc1",))).tMatches == (
+            "text",
+        )
+        assert first_match(ResultMatch(False)) == ResultMatch(False)
+        assert first_match(0) == 0
+
+    def test_findall_exists(self):
+        text = "de boete is tien procent, een boete per dag"
+        for str_pattern in [r"boete", r"(boete) is", r"(boete) (\w+)", r"(x)?boete"]:
+            pattern = re.compile(str_pattern)
+            matches, _ = RegexEngine.findall("q", pattern, text, None, "doc1")
+            first, _ = RegexEngine.findall(
+                "q", pattern, text, None, "doc1", bExists=True
+            )
+            assert first == matches[:1]
+
+    def test_exists_equals_first_match(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bSharedEngine in [True, False]:
+            for bLoopOverSpans in [True, False]:
+                str_suffix = f"_{bSharedEngine}_{bLoopOverSpans}"
+                list_all = make_components(
+                    nlp,
+                    f"_all{str_suffix}",
+                    bSharedEngine=bSharedEngine,
+                    bLoopOverSpans=bLoopOverSpans,
+                )
+                list_exists = make_components(
+                    nlp,
+                    f"_exists{str_suffix}",
+                    bSharedEngine=bSharedEngine,
+                    bLoopOverSpans=bLoopOverSpans,
+                    bExists=True,
+                )
+                for component_all, component_exists in zip(list_all, list_exists):
+                    result = component_exists.analyze(doc)
+                    assert result.bResult
+                    assert result == first_match(component_all.analyze(doc))
+
+        tfidf = BaseTFIDF(nlp, "tfidf_exists", 0.1, ["boete"], True, bExists=True)
+        assert tfidf.analyze(doc).tPage_nr == (1,)
+        assert tfidf.pipe([doc]).__next__()._._dict_results[
+            "tfidf_exists"
+        ].tPage_nr == (1,)
+
+    def test_exists_per_contract(self):
+        nlp = spacy.blank("nl")
+        for bSharedEngine in [True, False]:
+            list_components = make_components(
+                nlp,
+                f"_contract_{bSharedEngine}",
+                bSharedEngine=bSharedEngine,
+                bExistsPerContract=True,
+            )
+            for bPipe in [False, True]:
+                list_docs = [
+                    make_doc(nlp, LIST_PAGES, "doc1", f"c1_{bPipe}"),
+                    make_doc(nlp, LIST_PAGES, "doc2", f"c1_{bPipe}"),
+                    make_doc(nlp, LIST_PAGES, "doc3", f"c2_{bPipe}"),
+                ]
+                for component in list_components:
+                    if bPipe:
+                        list_docs = list(component.pipe(list_docs))
+                    else:
+                        list_docs = [component(doc) for doc in list_docs]
+
+                for doc in list_docs:
+                    # the second doc of c1 is skipped by every question
+                    assert len(doc._._dict_results) == (
+                        0 if doc._.doc_id == "doc2" else len(list_components)
+                    )
+                    # nothing is left behind by the engines on skipped docs either
+                    for engine_class in ENGINES:
+                        assert engine_class.USER_DATA_KEY not in doc.user_data
@@ -0,0 +1,103 @@
+import importlib.util
+import os
+import tempfile
+
+import pandas as pd
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseSpacyMatcher,
+    BaseTFIDF,
+    BaseNormalizedCounter,
+)
+from pynder.utils.export import ResultExporter, export_results
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PAGES = [
+    "het risico van de levering ligt bij de leverancier",
+    "geen enkel woord van belang",
+    "het risico van de betaling ligt bij de klant, risico risico",
+]
+
+
+def make_docs(nlp, list_components, i_docs=2):
+    docs = [make_doc(nlp, LIST_PAGES, f"doc{i}", "c1") for i in range(i_docs)]
+    for doc in docs:
+        for component in list_components:
+            component(doc)
+    return docs
+
+
+class TestsExport(unittest.TestCase):
+    def setUp(self):
+        nlp = spacy.blank("nl")
+        list_components = [
+            BaseRegex(nlp, "q_regex", [r"risico van de (\w+)"]),
+            BaseRegex(nlp, "q_regex_groups", [r"(risico) van de (\w+)"], False),
+            BaseSpacyMatcher(nlp, "q_matcher", [[{"LOWER": "klant"}]]),
+            BaseTFIDF(nlp, "q_tfidf", 0.1, ["risico levering", "iets anders"]),
+            BaseNormalizedCounter(nlp, "q_counter", 0.04, ["risico"]),
+            BaseRegex(nlp, "q_none", [r"dossiernummer"]),
+        ]
+        self.docs = make_docs(nlp, list_components)
+
+    def test_to_frame(self):
+        exporter = ResultExporter()
+        for doc in self.docs:
+            exporter.add_doc(doc)
+        df = exporter.to_frame()
+        assert len(exporter) == 0
+
+        assert list(df.columns) == [
+            "question",
+            "contract_id",
+            "doc_id",
+            "page_nr",
+            "match",
+        ]
+        df_doc = df.loc[df["doc_id"] == "doc0"]
+        assert list(df_doc.loc[df_doc["question"] == "q_regex", "match"]) == [
+            "levering",
+            "betaling",
+        ]
+        assert list(df_doc.loc[df_doc["question"] == "q_regex", "page_nr"]) == [0, 2]
+        assert list(df_doc.loc[df_doc["question"] == "q_regex_groups", "match"]) == [
+            "risico | levering",
+            "risico | betaling",
+        ]
+        assert (
+            df_doc.loc[df_doc["question"] == "q_regex_groups", "page_nr"].isna().all()
+        )
+        assert list(df_doc.loc[df_doc["question"] == "q_matcher", "match"]) == ["klant"]
+        assert list(df_doc.loc[df_doc["question"] == "q_tfidf", "match"]) == [
+            "risico levering"
+        ]
+        assert list(df_doc.loc[df_doc["question"] == "q_counter", "page_nr"]) == [2]
+        assert "q_none" not in set(df["question"])
+        assert len(df) == 2 * len(df_doc)
+        assert set(df["contract_id"]) == {"c1"}
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("pyarrow") is None, reason="pyarrow not installed"
+    )
+    def test_export_results(self):
+        exporter = ResultExporter()
+        for doc in self.docs:
+            exporter.add_doc(doc)
+        df_expected = exporter.to_frame()
+
+        with tempfile.TemporaryDirectory() as folder:
+            list_paths = export_results(self.docs, folder, i_batch_docs=1)
+            assert len(list_paths) == 2
+            df = pd.read_parquet(folder)
+            assert len(df) == len(df_expected)
+            assert set(df["match"]) == set(df_expected["match"])
@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+import spacy
+from spacy.tokens import Doc
+from pynder.enums import ResultMatch
+import pynder.matchers
+from pynder.matchers import add_questions
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseSpacyMatcher,
+    BaseNormalizedCounter,
+)
+from pynder.matchers.questions_P import Question31
+from pynder.matchers.registry import QuestionRegistry
+from pynder.matchers.engines import (
+    NormalizedCounterEngine,
+    RegexEngine,
+    SpacyMatcherEngine,
+)
+from pynder.utils.gating import get_skipped_work, is_gate_closed, sort_by_gates
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+ENGINES = [RegexEngine, SpacyMatcherEngine, NormalizedCounterEngine]
+
+LIST_PAGES_OPEN = [
+    "op deze overeenkomst zijn de algemene inkoopvoorwaarden van toepassing",
+    "de boete is tien procent, een boete per dag",
+]
+LIST_PAGES_CLOSED = [
+    "geen enkel woord van belang",
+    "de boete is tien procent, een boete per dag",
+]
+
+
+def make_components(nlp, str_suffix, bSharedEngine, bGated):
+    gate = f"gate{str_suffix}"
+    list_gates = [gate] if bGated else None
+    return [
+        BaseRegex(nlp, gate, [r"algemene.{1,10}inkoopvoorwaarde"], bExists=True),
+        BaseRegex(
+            nlp,
+            f"regex{str_suffix}",
+            [r"boete"],
+            bSharedEngine=bSharedEngine,
+            list_gates=list_gates,
+        ),
+        BaseSpacyMatcher(
+            nlp,
+            f"matcher{str_suffix}",
+            [[{"LOWER": "boete"}]],
+            bSharedEngine=bSharedEngine,
+            list_gates=list_gates,
+        ),
+        BaseNormalizedCounter(
+            nlp,
+            f"counter{str_suffix}",
+            0.01,
+            ["boete"],
+            bSharedEngine=bSharedEngine,
+            # gated on a gated question
+            list_gates=[f"matcher{str_suffix}"] if bGated else None,
+        ),
+    ]
+
+
+def run(components, docs, bPipe):
+    for component in components:
+        if bPipe:
+            docs = list(component.pipe(docs))
+        else:
+            docs = [component(doc) for doc in docs]
+    return docs
+
+
+class TestsGating(unittest.TestCase):
+    def test_gate_closed(self):
+        assert not is_gate_closed(None)
+        assert not is_gate_closed(ResultMatch(True, ("a",), (0,), ("doc1",)))
+        assert is_gate_closed(ResultMatch(False))
+        assert is_gate_closed(0)
+
+    def test_sort_by_gates(self):
+        assert sort_by_gates({"gated": ["gate"], "q8": [], "gate": []}) == [
+            "gate",
+            "gated",
+            "q8",
+        ]
+        assert sort_by_gates({"a": ["b"], "b": ["c"], "c": ["x"]}) == ["c", "b", "a"]
+        with pytest.raises(ValueError):
+            sort_by_gates({"a": ["b"], "b": ["a"]})
+
+    def test_gated_components(self):
+        for bSharedEngine in [True, False]:
+            for bPipe in [False, True]:
+                # a fresh nlp object gives fresh engines, without the questions of the previous run
+                nlp = spacy.blank("nl")
+                str_suffix = f"_{bSharedEngine}_{bPipe}"
+                list_gated = make_components(nlp, str_suffix, bSharedEngine, True)
+                list_ungated = make_components(
+                    nlp, f"{str_suffix}_ungated", bSharedEngine, False
+                )
+                docs = [
+                    make_doc(nlp, LIST_PAGES_OPEN, "open", bPipeline=False),
+                    make_doc(nlp, LIST_PAGES_CLOSED, "closed", bPipeline=False),
+                ]
+                doc_open, doc_closed = run(list_gated + list_ungated, docs, bPipe)
+
+                for gated, ungated in zip(list_gated[1:], list_ungated[1:]):
+                    assert doc_open._._dict_results[gated.name] == (
+                        doc_open._._dict_results[ungated.name]
+                    )
+                    assert doc_open._._dict_results[gated.name].bResult
+                    assert doc_closed._._dict_results[gated.name] == ResultMatch(False)
+                    assert doc_closed._._dict_results[ungated.name].bResult
+                    assert gated.i_gated_docs == 1
+                    assert gated.i_gated_pages == 2
+
+                for doc in [doc_open, doc_closed]:
+                    for engine_class in ENGINES:
+                        assert engine_class.USER_DATA_KEY not in doc.user_data
+
+    def test_add_questions(self):
+        dict_questions = {
+            "gated": {"type": "regex", "patterns": ["boete"], "gates": ["gate"]},
+            "gate": {
+                "type": "regex",
+                "patterns": [r"algemene.{1,10}inkoopvoorwaarde"],
+                "mode": "exists",
+            },
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "questions_T.json"), "w") as f:
+                json.dump({"questions": dict_questions}, f)
+            registry = QuestionRegistry("pynder.matchers", folder)
+
+            nlp = spacy.blank("nl")
+            with mock.patch.object(pynder.matchers, "registry", registry):
+                add_questions(nlp, ["gated", "gate"])
+        assert nlp.pipe_names == ["gate", "gated"]
+
+        nlp(make_doc(nlp, LIST_PAGES_CLOSED, "closed", bPipeline=False))
+        doc = nlp(make_doc(nlp, LIST_PAGES_OPEN, "open", bPipeline=False))
+        assert doc._._dict_results["gate"].bResult
+        assert doc._._dict_results["gated"].bResult
+        assert get_skipped_work(nlp) == {
+            "gated": {"docs": 1, "pages": 2},
+            "total": {"docs": 1, "pages": 2},
+        }
+
+    def test_literal_prefilter_of_q31(self):
+        # the literals of the q31 patterns skip the pages q31 can not match on, so no separate gate is needed
+        nlp = spacy.blank("nl")
+        q31 = Question31(nlp, "q31")
+        assert q31.list_literals
+        unfiltered = BaseRegex(
+            nlp, "q31_unfiltered", [q31.pattern.pattern], list_literals=[]
+        )
+        list_pages = [
+            "versie januari 2020 van de algemene bepalingen en inkoopvoorwaarden",
+            "de wijziging van de algemene inkoopvoorwaarde is niet toegestaan",
+            "de algemene inkoopvoorwaarden zijn aangevuld, aanvulling volgt",
+            "versie maart 2021 van de algemene voorwaarden",
+            "geen enkel woord van belang",
+        ]
+        doc = make_doc(nlp, list_pages, bPipeline=False)
+        for component in [q31, unfiltered]:
+            doc = component(doc)
+        assert doc._._dict_results["q31"] == doc._._dict_results["q31_unfiltered"]
+        assert doc._._dict_results["q31"].tPage_nr == (0, 1, 2)
@@ -0,0 +1,75 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import BaseRegex
+from pynder.utils.literals import get_required_literals, LiteralScanner
+
+import regex as re
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PATTERNS = [
+    [r"tussen\ *(?s)(.*?dossiernummer\ *\d*)"],
+    [r".{10}exit.{1,5}plan.{10}", r"opzegtermijn\s\d+"],
+    [r"(?i)exit"],
+]
+
+LIST_PAGES = [
+    "overeenkomst tussen partij a met dossiernummer 123 en partij b",
+    "geen match op deze pagina, wel een exit",
+    "het exit plan wordt opgesteld door de opdrachtnemer, opzegtermijn 3 maanden",
+]
+
+
+class TestsLiteralPrefilter(unittest.TestCase):
+    def test_required_literals(self):
+        assert get_required_literals(re.compile(LIST_PATTERNS[0][0])) == [
+            "dossiernummer"
+        ]
+        assert get_required_literals(re.compile("|".join(LIST_PATTERNS[1]))) == [
+            "exit",
+            "opzegtermijn",
+        ]
+        assert get_required_literals(r"(ab)+c|x?y") == ["ab", "y"]
+
+        # case insensitive, fuzzy or optional: no literal every match needs
+        assert get_required_literals(re.compile(LIST_PATTERNS[2][0])) is None
+        assert get_required_literals(r"exit{e<=1}") is None
+        assert get_required_literals(r"(exit)?\d+") is None
+
+    def test_scanner(self):
+        text = "\n".join(LIST_PAGES)
+        list_page_starts = [0, len(LIST_PAGES[0]) + 1]
+        list_page_ends = [len(LIST_PAGES[0]), len(text)]
+        scanner = LiteralScanner(["exit", "exit plan", "b\ngeen"])
+        assert scanner.get_literals(text) == {"exit", "exit plan", "b\ngeen"}
+        assert scanner.get_literals_per_page(
+            text, list_page_starts, list_page_ends
+        ) == [set(), {"exit", "exit plan"}]
+
+    def test_prefilter_equals_full_scan(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bLoopOverSpans in [True, False]:
+            for bSharedEngine in [True, False]:
+                for i, patterns in enumerate(LIST_PATTERNS):
+                    name = f"q{i}_{bLoopOverSpans}_{bSharedEngine}"
+                    prefilter = BaseRegex(
+                        nlp, name, patterns, bLoopOverSpans, bSharedEngine
+                    )
+                    full_scan = BaseRegex(
+                        nlp,
+                        name + "_full",
+                        patterns,
+                        bLoopOverSpans,
+                        bSharedEngine,
+                        list_literals=[],
+                    )
+                    assert prefilter.analyze(doc) == full_scan.analyze(doc)
+                    assert prefilter.analyze(doc).bResult
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+
+import spacy
+from spacy.lang.nl import Dutch
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import BasePipelineComponent, BaseRegex
+from pynder.utils.metrics import Histogram, dump_metrics
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+
+@Dutch.factory("test_metrics_regex")
+class MetricsQuestion(BaseRegex):
+    def __init__(self, nlp, name):
+        super().__init__(nlp, name, [r"risico\s\w+"], False)
+
+
+@Dutch.factory("test_metrics_regex_pages")
+class MetricsPagesQuestion(BaseRegex):
+    def __init__(self, nlp, name):
+        super().__init__(nlp, name, [r"\w+\s+\w+"])
+
+
+class TestsMetrics(unittest.TestCase):
+    def tearDown(self):
+        BasePipelineComponent.disable_metrics()
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for value in [0.001] * 98 + [0.5, 2.0]:
+            histogram.add(value)
+        assert histogram.i_count == 100
+        assert histogram.get_quantile(0.5) == 2**10 / 1e6
+        assert histogram.get_quantile(0.99) == 2**19 / 1e6
+        assert Histogram().get_quantile(0.5) is None
+
+    def test_call_and_pipe(self):
+        nlp = spacy.blank("nl")
+        nlp.add_pipe("test_metrics_regex", name="q_risk")
+        list_texts = ["het risico ligt bij de leverancier", "geen match"]
+
+        nlp(list_texts[0])
+        assert dump_metrics(nlp) == {}  # metrics are off by default
+
+        BasePipelineComponent.enable_metrics()
+        for text in list_texts:
+            nlp(text)
+        list(nlp.pipe(list_texts * 2, batch_size=2))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "metrics.json")
+            dict_metrics = dump_metrics(nlp, path)
+            with open(path) as f:
+                assert json.load(f) == dict_metrics
+
+        assert dict_metrics["q_risk"]["docs"] == 6
+        assert dict_metrics["q_risk"]["pages"] == 6
+        assert dict_metrics["q_risk"]["docs_with_result"] == 3
+        assert dict_metrics["q_risk"]["matches"] == 3
+        assert dict_metrics["q_risk"]["seconds_per_doc"]["count"] == 6
+
+    def test_sampling(self):
+        nlp = spacy.blank("nl")
+        component = nlp.add_pipe("test_metrics_regex", name="q_risk")
+        BasePipelineComponent.enable_metrics(0.0)
+        nlp("het risico ligt bij de leverancier")
+        assert component.get_metrics().i_docs == 0
+
+    def test_engine_time_per_question(self):
+        nlp = spacy.blank("nl")
+        nlp.add_pipe("test_metrics_regex", name="q_risk")
+        nlp.add_pipe("test_metrics_regex_pages", name="q_pages")
+        BasePipelineComponent.enable_metrics()
+        doc = make_doc(
+            nlp,
+            ["het risico ligt bij de leverancier", "woord " * 20000, "geen boete"],
+            bPipeline=False,
+        )
+        for _, proc in nlp.pipeline:
+            doc = proc(doc)
+        dict_metrics = dump_metrics(nlp)
+
+        # q_risk runs first on the doc, but only gets the time of its own pattern
+        assert (
+            dict_metrics["q_risk"]["seconds_per_doc"]["mean"]
+            < dict_metrics["q_pages"]["seconds_per_doc"]["mean"]
+        )
+        assert dict_metrics["q_risk"]["pages"] == 1
+        assert dict_metrics["q_risk"]["seconds_per_page"]["count"] == 0
+        assert dict_metrics["q_pages"]["pages"] == 3
+        assert dict_metrics["q_pages"]["seconds_per_page"]["count"] == 3
+        assert dict_metrics["RegexEngine (shared)"]["docs"] == 1
+        assert dict_metrics["RegexEngine (shared)"]["docs_with_result"] == 0
@@ -0,0 +1,108 @@
+import os
+import pickle
+import tempfile
+
+import spacy
+from spacy.tokens import Doc
+from spacy.training import Example
+from pynder.matchers.base_class_matchers import BaseRegex, BaseSpacyMatcher
+from pynder.utils.corpus_runner import build_pipeline, get_doc_output
+from pynder.utils.model_loading import (
+    get_component_names,
+    get_excluded_components,
+    get_required_annotations,
+    load_model,
+    prune_pipeline,
+)
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+
+def save_model(folder):
+    """Function that saves a small model with a tagger and a ner, standing in for nl_core_news_lg."""
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("tagger")
+    nlp.add_pipe("ner")
+    doc = nlp.make_doc("de boete is hoog")
+    example = Example.from_dict(
+        doc,
+        {"tags": ["LID", "N", "WW", "ADJ"], "entities": ["O", "U-MISC", "O", "O"]},
+    )
+    nlp.initialize(lambda: [example])
+    path = os.path.join(folder, "model")
+    nlp.to_disk(path)
+    return path
+
+
+class TestsModelLoading(unittest.TestCase):
+    def test_required_annotations(self):
+        nlp = spacy.blank("nl")
+        nlp.add_pipe("q23")
+        assert get_required_annotations(nlp) == set()
+        nlp.add_pipe("q27")
+        assert get_required_annotations(nlp) == {"LEMMA"}
+
+        component = BaseSpacyMatcher(
+            nlp, "q_tag", [[{"tag": "N"}, {"LOWER": "is"}]], bSharedEngine=False
+        )
+        assert component.get_required_annotations() == {"TAG"}
+        assert BaseRegex(nlp, "q_regex", [r"boete"]).get_required_annotations() == set()
+
+    def test_load_model(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = save_model(folder)
+            assert get_component_names(path) == ["tagger", "ner"]
+            assert get_component_names("blank:nl") == []
+            assert get_excluded_components(path, {"TAG"}) == ["ner"]
+
+            assert load_model(path).pipe_names == ["tagger", "ner"]
+            assert load_model(path, set()).pipe_names == []
+            assert load_model(path, {"ENT_TYPE"}).pipe_names == ["ner"]
+
+    def test_build_pipeline(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = save_model(folder)
+            path_text = os.path.join(folder, "1001", "doc0.txt")
+            os.makedirs(os.path.dirname(path_text))
+            text = "x " * 60 + "de opzegtermijn is hoog" + " y" * 60
+            with open(path_text, "w") as f:
+                f.write(text)
+            folder_span = os.path.join(folder, "span")
+            os.makedirs(os.path.join(folder_span, "1001"))
+            with open(os.path.join(folder_span, "1001", "doc0.pickle"), "wb") as f:
+                pickle.dump(
+                    [{"start": 0, "end": len(text.split()), "label": "PAGES"}], f
+                )
+
+            # regex questions only: the tagger and the ner are never loaded
+            nlp = build_pipeline(path, folder_span, list_questions=["q23"])
+            assert nlp.pipe_names == ["load_page_spans", "q23"]
+            nlp_full = build_pipeline(
+                path, folder_span, list_questions=["q23"], bPruneModel=False
+            )
+            assert nlp_full.pipe_names == ["load_page_spans", "tagger", "ner", "q23"]
+            output = get_doc_output(nlp(path_text))
+            assert output[2]["q23"].bResult
+            assert output == get_doc_output(nlp_full(path_text))
+
+            # a LEMMA pattern needs the components that set the lemma
+            nlp = build_pipeline(path, folder_span, list_questions=["q23", "q27"])
+            assert nlp.pipe_names == ["load_page_spans", "tagger", "q23", "q27"]
+
+    def test_prune_pipeline(self):
+        with tempfile.TemporaryDirectory() as folder:
+            nlp = spacy.load(save_model(folder))
+            nlp.add_pipe("q23")
+            assert prune_pipeline(nlp) == ["tagger", "ner"]
+            assert nlp.pipe_names == ["q23"]
+            assert nlp("de opzegtermijn is hoog").has_annotation("TAG") is False
+
+            nlp = spacy.load(os.path.join(folder, "model"))
+            nlp.add_pipe("q27")
+            assert prune_pipeline(nlp) == ["ner"]
+            assert nlp.pipe_names == ["tagger", "q27"]
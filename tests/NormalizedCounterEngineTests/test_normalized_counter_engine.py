@@ -0,0 +1,54 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import BaseNormalizedCounter
+from pynder.utils.occurance import calc_term_counts
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_WORDS = [["risico"], ["risico", "risk", "risico"], ["aansprakelijkheid"]]
+
+LIST_PAGES = [
+    "het risico van de levering ligt bij de leverancier, risico risk",
+    "geen enkel woord van belang",
+    "aansprakelijkheid is beperkt tot het risico",
+]
+
+
+class TestsNormalizedCounterEngine(unittest.TestCase):
+    def test_term_counts(self):
+        dict_vocab, matrix_counts, arr_lengths = calc_term_counts(["a b a", "b c"])
+        assert matrix_counts[0, dict_vocab["a"]] == 2
+        assert matrix_counts[1, dict_vocab["a"]] == 0
+        assert matrix_counts[:, dict_vocab["b"]].sum() == 2
+        assert list(arr_lengths) == [5, 3]
+
+    def test_engine_equals_per_component(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bLoopOverSpans in [True, False]:
+            list_shared = [
+                BaseNormalizedCounter(
+                    nlp, f"q{i}_{bLoopOverSpans}", 0.01, words, bLoopOverSpans
+                )
+                for i, words in enumerate(LIST_WORDS)
+            ]
+            list_single = [
+                BaseNormalizedCounter(
+                    nlp, f"q{i}", 0.01, words, bLoopOverSpans, bSharedEngine=False
+                )
+                for i, words in enumerate(LIST_WORDS)
+            ]
+            for shared, single in zip(list_shared, list_single):
+                assert shared.analyze(doc) == single.analyze(doc)
+
+        assert BaseNormalizedCounter(nlp, "q_any", 0.01, LIST_WORDS[2]).analyze(
+            doc
+        ).tPage_nr == (2,)
@@ -0,0 +1,118 @@
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseSpacyMatcher,
+    BaseNormalizedCounter,
+)
+from pynder.matchers.definitions import compile_question, validate_definition
+from pynder.utils.page_scope import PageScope
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PAGES = [
+    "overeenkomst tussen partij a met dossiernummer 123",
+    "de boete is tien procent",
+    "geen enkel woord van belang",
+    "de boete wordt verdubbeld",
+    "boete en nog eens een boete",
+    "getekend door beide partijen",
+]
+
+
+def make_components(nlp, str_suffix, **kwargs):
+    return [
+        BaseRegex(nlp, f"regex{str_suffix}", [r"boete"], **kwargs),
+        BaseSpacyMatcher(nlp, f"matcher{str_suffix}", [[{"LOWER": "boete"}]], **kwargs),
+        BaseNormalizedCounter(nlp, f"counter{str_suffix}", 0.01, ["boete"], **kwargs),
+    ]
+
+
+class TestsPageScope(unittest.TestCase):
+    def test_page_numbers(self):
+        assert PageScope().get_page_numbers(4) == [0, 1, 2, 3]
+        assert PageScope(i_first_pages=3).get_page_numbers(6) == [0, 1, 2]
+        assert PageScope(i_first_pages=3).get_page_numbers(2) == [0, 1]
+        assert PageScope(i_last_pages=2).get_page_numbers(6) == [4, 5]
+        assert PageScope(i_first_pages=2, i_last_pages=2).get_page_numbers(3) == [
+            0,
+            1,
+            2,
+        ]
+        assert PageScope(i_first_pages=0).get_page_numbers(3) == []
+        assert PageScope(predicate=lambda i, i_pages: i % 2).get_page_numbers(5) == [
+            1,
+            3,
+        ]
+        assert PageScope.from_dict({"last": 1}).get_page_numbers(3) == [2]
+
+    def test_scope_equals_filtered_pages(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+        page_scope = PageScope(i_first_pages=2, i_last_pages=2)
+
+        for bSharedEngine in [True, False]:
+            list_all = make_components(
+                nlp, f"_all_{bSharedEngine}", bSharedEngine=bSharedEngine
+            )
+            list_scoped = make_components(
+                nlp,
+                f"_scoped_{bSharedEngine}",
+                bSharedEngine=bSharedEngine,
+                page_scope=page_scope,
+            )
+            for component_all, component_scoped in zip(list_all, list_scoped):
+                result_all = component_all.analyze(doc)
+                result_scoped = component_scoped.analyze(doc)
+                assert result_all.tPage_nr == (1, 3, 4)
+                assert result_scoped.tPage_nr == (1, 4)
+                assert result_scoped.tMatches == (
+                    result_all.tMatches[0],
+                    result_all.tMatches[2],
+                )
+
+    def test_doc_level_matching_with_scope(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+        matcher = BaseSpacyMatcher(
+            nlp,
+            "matcher_doc_level",
+            [[{"LOWER": "boete"}]],
+            bDocLevelMatching=True,
+            bSharedEngine=False,
+            page_scope=PageScope(i_last_pages=3),
+        )
+        assert matcher.analyze(doc).tPage_nr == (3, 4)
+        assert matcher.count_pages(doc) == 3
+
+    def test_empty_scope(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+        for component in make_components(
+            nlp, "_empty", page_scope=PageScope(i_first_pages=0)
+        ):
+            assert component.analyze(doc) == 0
+
+    def test_definition_scope(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+        definition = {"type": "regex", "patterns": ["boete"], "scope": {"last": 3}}
+        assert compile_question(nlp, "q_def_scope", definition).analyze(
+            doc
+        ).tPage_nr == (3, 4)
+
+        with pytest.raises(ValueError):
+            validate_definition(
+                "q_bad", {"type": "regex", "patterns": ["boete"], "scope": {"mid": 1}}
+            )
+        with pytest.raises(ValueError):
+            validate_definition(
+                "q_bad", {"type": "regex", "patterns": ["boete"], "scope": {"last": -1}}
+            )
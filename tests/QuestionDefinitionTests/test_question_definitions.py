@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import (
+    BaseRegex,
+    BaseSpacyMatcher,
+    BaseTFIDF,
+    BaseNormalizedCounter,
+)
+from pynder.matchers.definitions import (
+    compile_question,
+    load_definitions,
+    validate_definition,
+)
+from pynder.matchers.registry import QuestionRegistry
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+DICT_QUESTIONS = {
+    "def_regex": {"type": "regex", "patterns": [r"risico van de (\w+)"]},
+    "def_matcher": {"type": "matcher", "patterns": [[{"LOWER": "klant"}]]},
+    "def_tfidf": {
+        "type": "tfidf",
+        "source_texts": ["risico levering", "iets anders"],
+        "threshold": 0.1,
+        "scope": "doc",
+    },
+    "def_counter": {"type": "counter", "words": ["risico"], "threshold": 0.04},
+}
+
+LIST_PAGES = [
+    "het risico van de levering ligt bij de leverancier",
+    "het risico van de betaling ligt bij de klant, risico risico",
+]
+
+
+class TestsQuestionDefinitions(unittest.TestCase):
+    def test_registry_compiles_definitions(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "questions_T.json"), "w") as f:
+                json.dump({"questions": DICT_QUESTIONS}, f)
+
+            registry = QuestionRegistry("pynder.matchers", folder)
+            assert list(registry) == list(DICT_QUESTIONS)
+            assert registry["def_tfidf"] is BaseTFIDF
+            assert registry.get_module_attribute("__all_init_T_questions__") == list(
+                DICT_QUESTIONS
+            )
+
+            nlp = spacy.blank("nl")
+            for str_question in registry:
+                registry.add_pipe(nlp, str_question)
+            assert nlp.pipe_names == list(DICT_QUESTIONS)
+            assert nlp.config["components"]["def_regex"]["definition"] == (
+                DICT_QUESTIONS["def_regex"]
+            )
+
+        nlp_expected = spacy.blank("nl")
+        list_expected = [
+            BaseRegex(nlp_expected, "def_regex", [r"risico van de (\w+)"]),
+            BaseSpacyMatcher(nlp_expected, "def_matcher", [[{"LOWER": "klant"}]]),
+            BaseTFIDF(
+                nlp_expected, "def_tfidf", 0.1, ["risico levering", "iets anders"]
+            ),
+            BaseNormalizedCounter(nlp_expected, "def_counter", 0.04, ["risico"]),
+        ]
+
+        doc = nlp(make_doc(nlp, LIST_PAGES, bPipeline=False))
+        for component in list_expected:
+            assert doc._._dict_results[component.name] == component.analyze(doc)
+            assert doc._._dict_results[component.name].bResult
+
+    def test_vectorizer_is_shared(self):
+        nlp = spacy.blank("nl")
+        tfidf1 = compile_question(nlp, "t1", DICT_QUESTIONS["def_tfidf"])
+        tfidf2 = compile_question(nlp, "t2", DICT_QUESTIONS["def_tfidf"])
+        assert tfidf1.vectorizer is tfidf2.vectorizer
+        assert not tfidf1.bLoopOverSpans
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            validate_definition("q", {"type": "regexx", "patterns": ["a"]})
+        with pytest.raises(ValueError):
+            validate_definition("q", {"type": "regex", "pattern": ["a"]})
+        with pytest.raises(ValueError):
+            validate_definition("q", {"type": "counter", "words": ["a"]})
+        with pytest.raises(ValueError):
+            validate_definition("q", {"type": "regex", "patterns": ["a"], "scope": "x"})
+        with pytest.raises(ValueError):
+            validate_definition("q", {"type": "regex", "patterns": ["a"], "mode": "x"})
+
+    def test_mode(self):
+        nlp = spacy.blank("nl")
+        definition = {"type": "matcher", "patterns": [[{"LOWER": "a"}]]}
+        assert compile_question(nlp, "m1", {**definition, "mode": "exists"}).bExists
+        component = compile_question(nlp, "m2", {**definition, "mode": "contract"})
+        assert component.bExists and component.bExistsPerContract
+
+    def test_example_file(self):
+        folder = os.path.dirname(os.path.abspath(__file__))
+        dict_questions = load_definitions(
+            os.path.join(folder, "questions_example.json")
+        )
+        assert list(dict_questions) == ["q60", "q61", "q62", "q63", "q64"]
+
+        registry = QuestionRegistry("pynder.matchers", folder)
+        list_questions = registry.get_module_attribute("__all_init_example_questions__")
+        assert list_questions == list(dict_questions)
+        assert registry.get_gates("q64") == ["q63"]
+
+        nlp = spacy.blank("nl")
+        for str_question in list_questions:
+            registry.add_pipe(nlp, str_question)
+        doc = make_doc(
+            nlp,
+            [
+                "de boeteclausule geldt bij te late levering",
+                "de factuur termijn is dertig dagen",
+                "een boete en een schadevergoeding van 1000 euro",
+            ],
+            contract_id="c1",
+            bPipeline=False,
+        )
+        dict_results = nlp(doc)._._dict_results
+        assert set(dict_results) == set(list_questions)
+        assert dict_results["q60"].tPage_nr == (0,)
+        assert dict_results["q61"].tPage_nr == (1,)
+        assert dict_results["q63"].bResult
+        assert dict_results["q64"].tMatches == (("1000",),)
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers import registry as pynder_registry
+from pynder.matchers.registry import QuestionRegistry, get_entry_points
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+MODULE = """
+from spacy.language import Language
+from spacy.lang.nl import Dutch
+from pynder.matchers.base_class_matchers import BaseRegex
+
+__all_init_{module}_questions__ = ["{name}"]
+
+
+@Dutch.factory("{name}")
+class {class_name}(BaseRegex):
+    def __init__(self, nlp: Language, name: str):
+        super().__init__(nlp, name, [r"risico"])
+"""
+
+
+class TestsQuestionRegistry(unittest.TestCase):
+    def test_lazy_import(self):
+        with tempfile.TemporaryDirectory() as folder:
+            package = os.path.join(folder, "registry_test_questions")
+            os.makedirs(package)
+            open(os.path.join(package, "__init__.py"), "w").close()
+            for module, name in [("A", "test_reg_a"), ("B", "test_reg_b")]:
+                with open(os.path.join(package, f"questions_{module}.py"), "w") as f:
+                    f.write(
+                        MODULE.format(
+                            module=module, name=name, class_name=f"Question{module}"
+                        )
+                    )
+
+            sys.path.insert(0, folder)
+            try:
+                registry = QuestionRegistry("registry_test_questions", package)
+                assert list(registry) == ["test_reg_a", "test_reg_b"]
+                assert "registry_test_questions.questions_A" not in sys.modules
+
+                nlp = spacy.blank("nl")
+                registry.add_pipe(nlp, "test_reg_a")
+                assert nlp.pipe_names == ["test_reg_a"]
+                assert "registry_test_questions.questions_A" in sys.modules
+                assert "registry_test_questions.questions_B" not in sys.modules
+
+                assert registry["test_reg_b"].__name__ == "QuestionB"
+                assert registry.get_module_attribute("__all_init_B_questions__") == [
+                    "test_reg_b"
+                ]
+                with pytest.raises(AttributeError):
+                    registry.get_module_attribute("__all_init_C_questions__")
+            finally:
+                sys.path.remove(folder)
+
+    def test_pynder_questions(self):
+        assert pynder_registry["q8"].__name__ == "Question8"
+        assert set(pynder_registry) >= {"q8", "q27", "q41", "q51"}
+        assert "q8 = pynder.matchers.questions_P:Question8" in get_entry_points(
+            pynder_registry.folder
+        )
@@ -0,0 +1,70 @@
+import spacy
+from spacy.tokens import Doc
+import pynder.matchers.definitions  # registers pynder_question
+from pynder.matchers.base_class_matchers import BaseRegex
+from pynder.matchers.engines import RegexEngine
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+LIST_PATTERNS = [
+    [r"tussen\ *(?s)(.*?dossiernummer\ *\d*)"],
+    [
+        r"wie is de hoofddienstverlener\?(.*?)land",
+        r"dossiernummer\ *\d*\ *en(?s)(.*?dossiernummer\ *\d*)",
+    ],
+    [r".{10}exit.{1,5}plan.{10}"],
+]
+
+LIST_PAGES = [
+    "overeenkomst tussen partij a met dossiernummer 123 en partij b dossiernummer 456",
+    "geen match op deze pagina",
+    "het exit plan wordt opgesteld door de opdrachtnemer en het exit  plan is klaar voor gebruik",
+]
+
+
+class TestsRegexEngine(unittest.TestCase):
+    def test_engine_equals_per_component(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bLoopOverSpans in [True, False]:
+            list_shared = [
+                BaseRegex(nlp, f"q{i}_{bLoopOverSpans}", p, bLoopOverSpans)
+                for i, p in enumerate(LIST_PATTERNS)
+            ]
+            list_single = [
+                BaseRegex(nlp, f"q{i}", p, bLoopOverSpans, bSharedEngine=False)
+                for i, p in enumerate(LIST_PATTERNS)
+            ]
+            for shared, single in zip(list_shared, list_single):
+                assert shared.analyze(doc) == single.analyze(doc)
+
+        assert BaseRegex(nlp, "q_any", LIST_PATTERNS[2]).analyze(doc).bResult
+
+    def test_only_active_questions(self):
+        nlp = spacy.blank("nl")
+        for i, list_patterns in enumerate(LIST_PATTERNS):
+            nlp.add_pipe(
+                "pynder_question",
+                name=f"q{i}",
+                config={"definition": {"type": "regex", "patterns": list_patterns}},
+            )
+        nlp.disable_pipe("q2")
+        engine = RegexEngine.get_engine(nlp)
+        assert engine.get_inactive_names() == {"q2"}
+
+        doc = nlp(make_doc(nlp, LIST_PAGES, bPipeline=False))
+        assert set(doc._._dict_results) == {"q0", "q1"}
+        # the disabled question was not analyzed, so no result of it is left behind
+        assert RegexEngine.USER_DATA_KEY not in doc.user_data
+
+        # a component that is not in the pipeline still gets its result when it asks for it
+        assert BaseRegex(nlp, "q_alone", LIST_PATTERNS[2]).analyze(doc).bResult
+        assert RegexEngine.USER_DATA_KEY not in doc.user_data
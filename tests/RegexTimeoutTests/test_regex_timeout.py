@@ -0,0 +1,53 @@
+import spacy
+from spacy.lang.nl import Dutch
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import BaseRegex
+from pynder.enums import ResultMatch
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+PATTERN = r".{200}onbepaalde\s{1,10}tijd.{200}"
+
+# the first page backtracks for seconds on PATTERN, the second page matches right away
+LIST_PAGES = [
+    "onbepaalde " * 30000,
+    "a" * 200 + "onbepaalde tijd" + "b" * 200,
+]
+
+
+@Dutch.factory("test_q17_timeout")
+class TimeoutQuestion(BaseRegex):
+    def __init__(self, nlp, name):
+        super().__init__(nlp, name, [PATTERN], False, fTimeout=0.01)
+
+
+class TestsRegexTimeout(unittest.TestCase):
+    def test_timeout_per_page(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bSharedEngine in [True, False]:
+            component = BaseRegex(
+                nlp, f"q17_{bSharedEngine}", [PATTERN], True, bSharedEngine, 0.01
+            )
+            result = component.analyze(doc)
+            assert result.bResult
+            assert result.tPage_nr == (1,)
+            assert result.tTimeouts == (("doc1", 0),)
+            assert component.i_timeouts == 1
+
+    def test_timeout_counts(self):
+        nlp = spacy.blank("nl")
+        nlp.add_pipe("sentencizer")  # not a BaseRegex, so not reported
+        nlp.add_pipe("test_q17_timeout", name="q17")
+
+        doc = nlp("\n".join(LIST_PAGES))  # the pipeline keeps going after the timeout
+        assert doc._._dict_results["q17"] == ResultMatch(False, tTimeouts=(("", None),))
+        assert BaseRegex.get_timeout_counts(nlp) == {"q17": 1}
@@ -0,0 +1,149 @@
+import os
+import tempfile
+
+import spacy
+from spacy.tokens import Doc
+import pynder.custom_pipeline_components  # registers pynder_cache_reader/writer
+import pynder.matchers.definitions  # registers pynder_question
+from pynder.utils.export import match_to_str
+from pynder.enums import ResultMatch
+from pynder.utils.result_cache import ResultCache, get_definition_hashes
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+DICT_DEFINITIONS = {
+    "cache_regex": {"type": "regex", "patterns": [r"(boete) (\w+)"]},
+    "cache_matcher": {"type": "matcher", "patterns": [[{"LOWER": "boete"}]]},
+    "cache_counter": {"type": "counter", "words": ["boete"], "threshold": 0.01},
+}
+
+LIST_TEXTS = [
+    ["de boete is tien procent", "geen enkel woord van belang"],
+    ["niets", "een boete per dag, de boete wordt verdubbeld"],
+]
+
+
+def make_nlp(path, dict_definitions):
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("pynder_cache_reader", config={"path": path})
+    for name, definition in dict_definitions.items():
+        nlp.add_pipe("pynder_question", name=name, config={"definition": definition})
+    nlp.add_pipe("pynder_cache_writer", config={"path": path})
+    return nlp
+
+
+def run(nlp, list_texts, bPipe=False):
+    """Function that runs the pipeline and returns the results per doc, the names of the analyzed questions."""
+    docs = [
+        make_doc(nlp, pages, f"doc{i}", bPipeline=False)
+        for i, pages in enumerate(list_texts)
+    ]
+    list_analyzed = []
+
+    def make_spy(proc, analyze):
+        def spy(doc):
+            list_analyzed.append(proc.name)
+            return analyze(doc)
+
+        return spy
+
+    for name, proc in nlp.pipeline:
+        if hasattr(proc, "get_definition"):
+            proc.analyze = make_spy(proc, proc.analyze)
+    docs = list(nlp.pipe(docs)) if bPipe else [nlp(doc) for doc in docs]
+
+    list_results = [
+        {
+            name: (
+                result.tPage_nr,
+                [list(map(match_to_str, m)) for m in result.tMatches],
+            )
+            for name, result in doc._._dict_results.items()
+        }
+        for doc in docs
+    ]
+    return list_results, sorted(set(list_analyzed))
+
+
+class TestsResultCache(unittest.TestCase):
+    def test_rerun_only_changes(self):
+        for bPipe in [False, True]:
+            with tempfile.TemporaryDirectory() as folder:
+                path = os.path.join(folder, "results.sqlite")
+                list_first, list_analyzed = run(
+                    make_nlp(path, DICT_DEFINITIONS), LIST_TEXTS, bPipe
+                )
+                assert list_analyzed == sorted(DICT_DEFINITIONS)
+                assert len(ResultCache.get(path)) == 6
+                assert list_first[1]["cache_matcher"] == ((1,), [["boete", "boete"]])
+
+                # nothing changed: everything comes from the cache
+                list_results, list_analyzed = run(
+                    make_nlp(path, DICT_DEFINITIONS), LIST_TEXTS, bPipe
+                )
+                assert list_analyzed == []
+                assert list_results == list_first
+
+                # one changed definition: only that question is analyzed again
+                dict_changed = {
+                    **DICT_DEFINITIONS,
+                    "cache_regex": {"type": "regex", "patterns": [r"boete"]},
+                }
+                list_results, list_analyzed = run(
+                    make_nlp(path, dict_changed), LIST_TEXTS, bPipe
+                )
+                assert list_analyzed == ["cache_regex"]
+                assert list_results[0]["cache_regex"] == ((0,), [["boete"]])
+                assert (
+                    list_results[1]["cache_matcher"] == list_first[1]["cache_matcher"]
+                )
+
+                # one changed doc: only that doc is analyzed again
+                list_changed = [LIST_TEXTS[0], ["niets", "geen boete"]]
+                list_results, list_analyzed = run(
+                    make_nlp(path, dict_changed), list_changed, bPipe
+                )
+                assert list_analyzed == sorted(DICT_DEFINITIONS)
+                assert list_results[1]["cache_regex"] == ((1,), [["boete"]])
+                assert len(ResultCache.get(path)) == 9
+
+    def test_copied_doc_gets_own_doc_id(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "results.sqlite")
+            nlp = make_nlp(path, DICT_DEFINITIONS)
+            doc = nlp(make_doc(nlp, LIST_TEXTS[1], "doc1", bPipeline=False))
+            doc_copy = nlp(make_doc(nlp, LIST_TEXTS[1], "copy", bPipeline=False))
+            # the copy has the same content, so its results came from the cache
+            assert len(ResultCache.get(path)) == len(DICT_DEFINITIONS)
+
+            for name in DICT_DEFINITIONS:
+                result = doc._._dict_results[name]
+                result_copy = doc_copy._._dict_results[name]
+                assert result_copy.tPage_nr == result.tPage_nr == (1,)
+                assert result.tDocIds == ("doc1",)
+                assert result_copy.tDocIds == ("copy",)
+
+            blob = ResultCache.dump_result(ResultMatch(False, tTimeouts=(("doc1", 2),)))
+            assert ResultCache.load_result(blob, doc_copy) == ResultMatch(
+                False, tTimeouts=(("copy", 2),)
+            )
+
+    def test_model_in_definition_hash(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "results.sqlite")
+            dict_hashes = get_definition_hashes(make_nlp(path, DICT_DEFINITIONS))
+            nlp = make_nlp(path, DICT_DEFINITIONS)
+            nlp.add_pipe("sentencizer", first=True)
+            dict_hashes_model = get_definition_hashes(nlp)
+
+        # only the matcher works on the tokens of the model, the others on the text
+        assert dict_hashes_model["cache_matcher"] != dict_hashes["cache_matcher"]
+        assert dict_hashes_model["cache_regex"] == dict_hashes["cache_regex"]
+        assert dict_hashes_model["cache_counter"] == dict_hashes["cache_counter"]
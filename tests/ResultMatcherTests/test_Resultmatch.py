@@ -1,4 +1,4 @@
-from pynder.enums import ResultMatch
+from pynder.enums import ResultMatch, ResultMatchBuilder
 
 import unittest
 import pytest
@@ -35,3 +35,25 @@ class TestsPipelineInit(unittest.TestCase):
             tPage_nr=(1, 2, 3, 4),
             tDocIds=(101, 102, 104, 105),
         )
+
+    def test_ResultmatchBuilder1(self):
+        list_results = [
+            ResultMatch(True, tMatches=("test1",), tPage_nr=(1,), tDocIds=(101,)),
+            ResultMatch(False, tTimeouts=((101, 2),)),
+            ResultMatch(),
+            ResultMatch(True, tMatches=("test3",), tPage_nr=(3,), tDocIds=(101,)),
+        ]
+        assert ResultMatchBuilder.sum(list_results) == sum(list_results)
+        assert ResultMatchBuilder.sum([ResultMatch()]) == sum([ResultMatch()])
+        assert ResultMatchBuilder.sum([]) == sum([]) == 0
+
+    def test_ResultmatchBuilder2(self):
+        builder = ResultMatchBuilder()
+        builder.append("test1", 1, 101)
+        builder.add_empty()
+        builder.add(
+            ResultMatch(True, tMatches=("test2",), tPage_nr=(2,), tDocIds=(101,))
+        )
+        assert builder.build() == ResultMatch(
+            True, tMatches=("test1", "test2"), tPage_nr=(1, 2), tDocIds=(101, 101)
+        )
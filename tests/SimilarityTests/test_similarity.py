@@ -0,0 +1,53 @@
+from pynder.utils.similarity import Vectorizer
+
+import unittest
+import numpy as np
+import pytest
+
+LIST_SOURCE_TEXTS = [
+    "uittreksel handelsregister kamer van koophandel",
+    "algemene inkoopvoorwaarden van de opdrachtgever",
+    "verwerkersovereenkomst persoonsgegevens",
+]
+
+
+class TestsVectorizer(unittest.TestCase):
+    def test_fitted_similarity_score(self):
+        target_text = "dit is een uittreksel uit het handelsregister"
+
+        vectorizer = Vectorizer().fit(LIST_SOURCE_TEXTS)
+        score, best_match = vectorizer.get_fitted_similarity_score(target_text)
+        score_old, best_match_old = Vectorizer().get_similarity_score(
+            LIST_SOURCE_TEXTS, target_text
+        )
+
+        assert best_match == best_match_old == LIST_SOURCE_TEXTS[0]
+        assert np.isclose(score, score_old)
+
+    def test_fitted_similarity_score_oov_target(self):
+        # most words of these targets are not in the source texts, they still count in the norm of the target
+        list_targets = [
+            "uittreksel " + " ".join(f"woord{i}" for i in range(40)),
+            "algemene voorwaarden levering betaling factuur termijn opdrachtgever",
+            "persoonsgegevens verwerkersovereenkomst persoonsgegevens bijlage handtekening",
+            "",
+        ]
+
+        vectorizer = Vectorizer().fit(LIST_SOURCE_TEXTS)
+        arr_scores, list_best_matches = vectorizer.get_fitted_similarity_scores(
+            list_targets
+        )
+        for target_text, score, best_match in zip(
+            list_targets, arr_scores, list_best_matches
+        ):
+            score_old, best_match_old = Vectorizer().get_similarity_score(
+                LIST_SOURCE_TEXTS, target_text
+            )
+            assert np.isclose(score, score_old)
+            assert best_match == best_match_old
+        assert arr_scores[0] < 0.2
+
+    def test_fitted_similarity_score_no_overlap(self):
+        vectorizer = Vectorizer().fit(LIST_SOURCE_TEXTS)
+        score, _ = vectorizer.get_fitted_similarity_score("niets gemeen")
+        assert score == 0
@@ -0,0 +1,117 @@
+import random
+
+import spacy
+from spacy.tokens import Doc
+from pynder.matchers.base_class_matchers import BaseSpacyMatcher
+
+from conftest import make_doc
+
+import unittest
+import pytest
+
+Doc.set_extension("_dict_results", default={}, force=True)
+Doc.set_extension("doc_id", default="", force=True)
+Doc.set_extension("contract_id", default="", force=True)
+
+DICT_PATTERNS = {
+    "q27": [[{"LOWER": "betaal"}, {"LOWER": "termijn"}], [{"LOWER": "facturering"}]],
+    "q28": [[{"LOWER": "facturering"}], [{"LOWER": "betaling"}]],
+    "q_crossing": [[{"LOWER": "dagen"}, {"LOWER": "de"}]],
+}
+
+LIST_PAGES = [
+    "de betaal termijn is dertig dagen",
+    "de facturering en betaling gaan per maand",
+]
+
+
+class TestsSpacyMatcherEngine(unittest.TestCase):
+    def test_engine_equals_per_component(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+
+        for bLoopOverSpans in [True, False]:
+            for name, list_patterns in DICT_PATTERNS.items():
+                shared = BaseSpacyMatcher(
+                    nlp, f"{name}_{bLoopOverSpans}", list_patterns, bLoopOverSpans
+                )
+                single = BaseSpacyMatcher(
+                    nlp, name, list_patterns, bLoopOverSpans, bSharedEngine=False
+                )
+                assert shared.analyze(doc) == single.analyze(doc)
+
+    def test_engine_splits_matches_per_question(self):
+        nlp = spacy.blank("nl")
+        doc = make_doc(nlp, LIST_PAGES)
+        components = [
+            BaseSpacyMatcher(nlp, name, list_patterns)
+            for name, list_patterns in DICT_PATTERNS.items()
+        ]
+        dict_results = {
+            component.name: component.analyze(doc) for component in components
+        }
+
+        assert dict_results["q27"].tPage_nr == (0, 1)
+        assert [span.text for span in dict_results["q28"].tMatches[0]] == [
+            "facturering",
+            "betaling",
+        ]
+        assert not dict_results["q_crossing"].bResult
+        assert "pynder_matcher_engine" not in doc.user_data
+
+    def test_phrase_and_token_patterns_equal_per_component(self):
+        nlp = spacy.blank("nl")
+        list_words = "De Betaling van de factuur volgt na de betaal termijn van de betaling".split()
+        doc = Doc(nlp.vocab, words=list_words, lemmas=[w.lower() for w in list_words])
+        doc.spans["PAGES"] = [doc[:6], doc[6:]]
+        doc._._dict_results = {}
+        dict_patterns = {
+            # phrase patterns on LOWER, ORTH and LEMMA
+            "q_lower": [
+                [{"LOWER": "betaling"}],
+                [{"LOWER": "de"}, {"LOWER": "betaling"}],
+            ],
+            "q_orth": [[{"TEXT": "Betaling"}], [{"ORTH": "factuur"}]],
+            "q_lemma": [[{"LEMMA": "betaal"}, {"LEMMA": "termijn"}], [{"LEMMA": "de"}]],
+            # a value the Matcher never matches on LOWER, so left to the Matcher
+            "q_upper": [[{"LOWER": "Betaling"}]],
+            # operators and sets of values go to the Matcher
+            "q_operator": [[{"LOWER": "de"}, {"IS_ALPHA": True, "OP": "+"}]],
+            "q_mixed": [[{"LOWER": "factuur"}], [{"LOWER": {"IN": ["de", "van"]}}]],
+        }
+        engine = None
+        for bLoopOverSpans in [True, False]:
+            for name, list_patterns in dict_patterns.items():
+                shared = BaseSpacyMatcher(
+                    nlp, f"{name}_{bLoopOverSpans}", list_patterns, bLoopOverSpans
+                )
+                single = BaseSpacyMatcher(
+                    nlp, name, list_patterns, bLoopOverSpans, bSharedEngine=False
+                )
+                engine = shared.engine
+                assert shared.analyze(doc) == single.analyze(doc), name
+
+        assert engine.dict_phrases["q_lemma_True"] is not None
+        assert engine.dict_phrases["q_upper_True"] is None
+        assert engine.dict_phrases["q_operator_True"] is None
+
+    def test_random_phrase_patterns_equal_per_component(self):
+        random.seed(0)
+        list_vocabulary = ["de", "betaal", "termijn", "factuur", "Factuur", "van"]
+        nlp = spacy.blank("nl")
+        list_pages = [
+            " ".join(random.choice(list_vocabulary) for _ in range(30))
+            for _ in range(3)
+        ]
+        doc = make_doc(nlp, list_pages, bPipeline=False)
+        for i in range(50):
+            list_patterns = [
+                [
+                    {random.choice(["LOWER", "ORTH"]): random.choice(list_vocabulary)}
+                    for _ in range(random.randint(1, 3))
+                ]
+                for _ in range(random.randint(1, 3))
+            ]
+            shared = BaseSpacyMatcher(nlp, f"q{i}", list_patterns)
+            single = BaseSpacyMatcher(nlp, f"q{i}", list_patterns, bSharedEngine=False)
+            assert shared.analyze(doc) == single.analyze(doc), list_patterns
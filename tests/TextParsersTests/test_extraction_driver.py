@@ -0,0 +1,157 @@
+import csv
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+
+import fitz
+import spacy
+from pynder.utils.text_parsing import text_parsers
+from pynder.utils.text_parsing.extraction_driver import (
+    I_MAX_STARTUP_DEATHS,
+    ExtractionDriver,
+    extract_corpus,
+    read_status,
+)
+
+import unittest
+import pytest
+
+LIST_PAGES = [
+    "De algemene inkoopvoorwaarden van de opdrachtgever zijn van toepassing op deze overeenkomst.",
+    "De opzegtermijn van deze overeenkomst is drie maanden na de datum van ondertekening.",
+]
+
+
+def write_files(folder):
+    """Function that writes two pdfs, a file that can not be extracted and the manifest, returns the manifest path."""
+    path_model = os.path.join(folder, "model")
+    spacy.blank("nl").to_disk(path_model)
+
+    list_rows = []
+    for i_file in range(2):
+        path = os.path.join(folder, "raw", f"contract{i_file}.pdf")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        document = fitz.open()
+        for text in LIST_PAGES:
+            document.new_page().insert_text((72, 72), text)
+        document.save(path)
+        list_rows.append((path, f"uuid{i_file}", "1001"))
+    path = os.path.join(folder, "raw", "notes.xyz")
+    with open(path, "w") as f:
+        f.write("geen document")
+    list_rows.append((path, "uuid2", "1002"))
+
+    path_manifest = os.path.join(folder, "manifest.csv")
+    with open(path_manifest, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["path", "uuid", "contract_id"])
+        writer.writerows(list_rows)
+    return path_manifest, {"nld": path_model, "eng": path_model}
+
+
+class TestsExtractionDriver(unittest.TestCase):
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs a named pipe")
+    def test_extract_and_resume(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path_manifest, dict_models = write_files(folder)
+            output_basepath = os.path.join(folder, "output")
+            path_status = os.path.join(output_basepath, "extraction_status.csv")
+
+            # reading from a pipe without writer hangs, like a file that gets stuck in OCR
+            path_hang = os.path.join(folder, "hang.txt")
+            os.mkfifo(path_hang)
+            dict_counts = ExtractionDriver(
+                output_basepath, path_status, 2, 1.0, dict_models
+            ).run([(path_hang, "uuid0", "1001")])
+            assert dict_counts == {"skipped": 0, "timeout": 1}
+            assert read_status(path_status)["1001", "uuid0"]["status"] == "timeout"
+
+            # the timed out file is skipped, unless failed files are retried
+            dict_counts = extract_corpus(
+                path_manifest, output_basepath, i_workers=2, dict_models=dict_models
+            )
+            assert dict_counts == {"skipped": 1, "ok": 1, "error": 1}
+            dict_counts = extract_corpus(
+                path_manifest,
+                output_basepath,
+                i_workers=2,
+                bRetryFailed=True,
+                dict_models=dict_models,
+            )
+            assert dict_counts == {"skipped": 1, "ok": 1, "error": 1}
+            assert extract_corpus(
+                path_manifest, output_basepath, dict_models=dict_models
+            ) == {"skipped": 3}
+
+            dict_status = read_status(path_status)
+            assert dict_status["1001", "uuid0"]["status"] == "ok"
+            assert dict_status["1001", "uuid0"]["lang"] == "nld"
+            assert dict_status["1001", "uuid0"]["scan"] == "0"
+            assert dict_status["1002", "uuid2"]["status"] == "error"
+            assert dict_status["1002", "uuid2"]["error"]
+            with open(os.path.join(output_basepath, "text", "1001", "uuid1.txt")) as f:
+                assert LIST_PAGES[1] in f.read()
+            assert os.path.isfile(
+                os.path.join(output_basepath, "span", "1001", "uuid1.pickle")
+            )
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs a named pipe")
+    def test_killed_worker_leaves_others(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path_manifest, dict_models = write_files(folder)
+            output_basepath = os.path.join(folder, "output")
+            path_status = os.path.join(output_basepath, "extraction_status.csv")
+            path_hang = os.path.join(folder, "hang.txt")
+            os.mkfifo(path_hang)
+            path_pdf = os.path.join(folder, "raw", "contract0.pdf")
+
+            # one worker hangs and is killed, the other keeps delivering its results
+            dict_counts = ExtractionDriver(
+                output_basepath, path_status, 2, 2.0, dict_models
+            ).run(
+                [
+                    (path_hang, "uuid9", "1003"),
+                    (path_pdf, "uuid0", "1001"),
+                    (path_pdf, "uuid1", "1001"),
+                ]
+            )
+            assert dict_counts == {"skipped": 0, "timeout": 1, "ok": 2}
+
+            list_files = [
+                file_name
+                for _, _, list_names in os.walk(output_basepath)
+                for file_name in list_names
+            ]
+            assert sorted(list_files) == [
+                "extraction_status.csv",
+                "uuid0.pickle",
+                "uuid0.txt",
+                "uuid1.pickle",
+                "uuid1.txt",
+            ]
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="the workers need the patched model loading",
+    )
+    def test_worker_dies_at_startup(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path_manifest, dict_models = write_files(folder)
+            output_basepath = os.path.join(folder, "output")
+            path_status = os.path.join(output_basepath, "extraction_status.csv")
+            driver = ExtractionDriver(
+                output_basepath, path_status, 2, 60, dict_models, "fork"
+            )
+
+            # e.g. out of memory while loading the model: the workers die before they take a file
+            with mock.patch.object(
+                text_parsers, "get_tokenizer_model", side_effect=lambda _: os._exit(1)
+            ):
+                dict_counts = driver.run(
+                    [(os.path.join(folder, "raw", "contract0.pdf"), "uuid0", "1001")]
+                )
+            assert dict_counts == {"skipped": 0, "crashed": 1}
+            assert driver.dict_startup_deaths == {0: I_MAX_STARTUP_DEATHS}
+            dict_status = read_status(path_status)
+            assert dict_status["1001", "uuid0"]["error"] == "no worker could be started"
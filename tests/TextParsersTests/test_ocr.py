@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+
+import fitz
+from pynder.utils.text_parsing.ocr import OcrCache, get_page_hash, ocr_pages
+from pynder.utils.text_parsing.text_parsers import pages_to_spans
+
+import unittest
+import pytest
+
+
+def add_scan(fitz_doc, text):
+    """Function that adds a page with only an image of the text, like a scanned page."""
+    source = fitz.open()
+    source.new_page().insert_text((72, 72), text, fontsize=20)
+    pixmap = source[0].get_pixmap(dpi=100)
+    page = fitz_doc.new_page()
+    page.insert_image(page.rect, pixmap=pixmap)
+
+
+def add_text(fitz_doc, text):
+    fitz_doc.new_page().insert_text((72, 72), text)
+
+
+def make_contract():
+    """Function that returns a pdf: a text page, a scanned appendix and a page with one text block."""
+    fitz_doc = fitz.open()
+    add_text(fitz_doc, "Overeenkomst tussen partijen")
+    add_scan(fitz_doc, "Algemene inkoopvoorwaarden")
+    add_text(fitz_doc, "Handtekening")
+    return fitz_doc
+
+
+class TestsOcr(unittest.TestCase):
+    def test_page_hash(self):
+        contract, other = make_contract(), fitz.open()
+        add_scan(other, "Algemene inkoopvoorwaarden")
+        add_scan(other, "Een andere bijlage")
+        # the same scan in another pdf, at another position
+        assert get_page_hash(contract[1], "nld") == get_page_hash(other[0], "nld")
+        assert get_page_hash(contract[1], "nld") != get_page_hash(other[1], "nld")
+        assert get_page_hash(contract[1], "nld") != get_page_hash(contract[1], "eng")
+        hash_upright = get_page_hash(other[0], "nld")
+        other[0].set_rotation(180)
+        assert get_page_hash(other[0], "nld") != hash_upright
+
+    def test_pages_from_cache(self):
+        contract = make_contract()
+        with tempfile.TemporaryDirectory() as folder:
+            path_cache = os.path.join(folder, "ocr.sqlite")
+            cache = OcrCache.get(path_cache)
+            # OCR'd before, in another contract
+            cache.put_blocks(
+                {
+                    get_page_hash(contract[1], "nld"): [
+                        (0, 0, 1, 1, "Algemene inkoopvoorwaarden\n", 0, 0)
+                    ],
+                    get_page_hash(contract[2], "nld"): [
+                        (0, 0, 1, 1, "Handtekening (OCR)\n", 0, 0)
+                    ],
+                }
+            )
+            page_spans, _, text, scan = pages_to_spans(
+                contract, "nld", path_ocr_cache=path_cache
+            )
+            assert scan
+            # the first page has text, the last page has too few text blocks after a scan
+            assert [span["text"].strip() for span in page_spans] == [
+                "Overeenkomst tussen partijen",
+                "Algemene inkoopvoorwaarden",
+                "Handtekening (OCR)",
+            ]
+            assert len(cache) == 2
+            assert ocr_pages(contract, [], "nld", path_cache=path_cache) == {}
+
+    def test_pages_without_scan(self):
+        fitz_doc = fitz.open()
+        add_text(fitz_doc, "Overeenkomst tussen partijen")
+        add_text(fitz_doc, "Handtekening")
+        page_spans, _, text, scan = pages_to_spans(fitz_doc, "nld")
+        assert not scan
+        assert len(page_spans) == 2
+
+    @pytest.mark.skipif(shutil.which("tesseract") is None, reason="needs tesseract")
+    def test_parallel_ocr(self):
+        fitz_doc = fitz.open()
+        for i_page in range(4):
+            add_scan(fitz_doc, f"Bijlage {i_page}")
+        with tempfile.TemporaryDirectory() as folder:
+            path_cache = os.path.join(folder, "ocr.sqlite")
+            dict_serial = ocr_pages(fitz_doc, [0, 1, 2, 3], "nld")
+            dict_parallel = ocr_pages(
+                fitz_doc, [0, 1, 2, 3], "nld", i_workers=2, path_cache=path_cache
+            )
+            assert dict_parallel == dict_serial
+            assert len(OcrCache.get(path_cache)) == 4
+            assert (
+                ocr_pages(fitz_doc, [0, 1, 2, 3], "nld", path_cache=path_cache)
+                == dict_serial
+            )
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import fitz
+import spacy
+from pynder.utils.text_parsing import text_parsers
+from pynder.utils.text_parsing.text_parsers import extract_pdf, get_tokenizer_model
+
+import unittest
+import pytest
+
+LIST_PAGES = [
+    "De algemene inkoopvoorwaarden van de opdrachtgever zijn van toepassing op deze overeenkomst.",
+    "De opzegtermijn van deze overeenkomst is drie maanden na de datum van ondertekening.",
+]
+
+
+def save_model(folder):
+    """Function that saves a model with a component, standing in for nl_core_news_lg."""
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("sentencizer")
+    path = os.path.join(folder, "model")
+    nlp.to_disk(path)
+    return path
+
+
+class TestsTextParsers(unittest.TestCase):
+    def test_extract_pdf(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path_model = save_model(folder)
+            path_pdf = os.path.join(folder, "contract.pdf")
+            document = fitz.open()
+            for text in LIST_PAGES:
+                document.new_page().insert_text((72, 72), text)
+            document.save(path_pdf)
+
+            with patch.dict(text_parsers.models, {"nld": path_model}), patch.dict(
+                text_parsers._dict_tokenizer_models, clear=True
+            ):
+                nlp = get_tokenizer_model("nld")
+                # loaded once, without its components
+                assert get_tokenizer_model("nld") is nlp
+                assert nlp.pipe_names == []
+
+                text, spans, lang, scan = extract_pdf(path_pdf)
+                assert lang == "nld" and not scan
+                assert len(spans) == 2
+                doc = nlp(text)
+                for span, page in zip(spans, LIST_PAGES):
+                    assert doc[span["start"] : span["end"]].text.strip() == page
+                    assert text[span["start_char"] : span["end_char"]].strip() == page
+                assert list(text_parsers._dict_tokenizer_models) == [path_model]
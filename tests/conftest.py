@@ -0,0 +1,3 @@
+# custom code
+# the tests import it with: from conftest import make_doc
+from pynder.utils.page_docs import make_doc  # noqa: F401